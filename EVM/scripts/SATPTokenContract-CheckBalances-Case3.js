@@ -4,9 +4,11 @@ const { config } = require("hardhat");
 // Replace with your values
 const SATP_TOKEN_BYTECODE = require("../artifacts/contracts/SATPTokenContract.sol/SATPTokenContract.json")["bytecode"];
 const SATP_TOKEN_ABI = require("../artifacts/contracts/SATPTokenContract.sol/SATPTokenContract.json")["abi"];
+// Shift of the node ports when a case runs next to others (see gateway/run-cases.py)
+const PORT_OFFSET = parseInt(process.env.PORT_OFFSET || "0", 10);
 
 async function main(port) {
-  const provider = new ethers.JsonRpcProvider(`http://0.0.0.0:${port}`);
+  const provider = new ethers.JsonRpcProvider(`http://0.0.0.0:${port + PORT_OFFSET}`);
   
   let BRIDGE_ADDRESS;
   let START_ADDRESS_INDEX;
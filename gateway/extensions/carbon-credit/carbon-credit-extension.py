@@ -1,10 +1,23 @@
-import requests
 from web3 import Web3
 from eth_utils import to_wei
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.cache import ResponseCache
+from hermes.rpc import BALANCE_OF_SELECTOR, GET_RETIRED_AMOUNT_SELECTOR, JsonRpcClient, JsonRpcError, decode_uint, encode_call
 
 PROVIDER_CONTAINER_URL = "http://polygon-fork:8545"
 PROVIDER_URL = "http://localhost:8545"
 USER = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"
+# Toucan retirement certificate NFT contract
+NFT_CONTRACT_ADDRESS = "0x5e377f16e4ec6001652befd737341a28889af002"
+
+# The TCO2 listing changes slowly, so it is cached between runs
+TCO2_CACHE_FILE = "tco2-cache.json"
 
 wallet_object = {
     # Hardhat default account 0 for testing purposes
@@ -14,11 +27,28 @@ wallet_object = {
 }
 
 def get_available_tco2s(params):
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-carbon-credit/get-available-tco2s"
-    headers = {"Content-Type": "application/json"}
-    resp = requests.post(url, json=params, headers=headers)
-    resp.raise_for_status()
-    return resp.json()
+    return get_client(4010).get_available_tco2s(params)
+
+
+def get_available_tco2s_cached(params, refresh=False):
+    """
+    Returns the get-available-tco2s listing from the local cache, fetching
+    it only if it is missing or expired (or refresh is set). A listing past
+    its TTL is still returned immediately while a fresh one is fetched in the
+    background.
+
+    Args:
+        params (dict): The marketplace, network and orderBy of the listing.
+        refresh (bool): Ignore the cache and fetch a new listing.
+
+    Returns:
+        dict: The JSON response from the endpoint.
+    """
+    cache = ResponseCache(TCO2_CACHE_FILE)
+    age = cache.age(params)
+    if age is not None and not refresh:
+        print(f"Using TCO2 listing cached {age:.0f}s ago (run with --refresh to fetch it again)")
+    return cache.get(params, get_available_tco2s, refresh=refresh)
 
 def get_token_address_by_symbol(network, symbol):
     mapping = {
@@ -29,25 +59,85 @@ def get_token_address_by_symbol(network, symbol):
 
 
 def specific_buy_request(params):
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-carbon-credit/specific-buy"
-    headers = {"Content-Type": "application/json"}
-    resp = requests.post(url, json=params, headers=headers)
-    resp.raise_for_status()
-    return resp.json()
+    return get_client(4010).specific_buy(params)
 
 
 def retire_request(params):
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-carbon-credit/retire"
-    headers = {"Content-Type": "application/json"}
-    resp = requests.post(url, json=params, headers=headers)
-    resp.raise_for_status()
-    return resp.json()
-
+    return get_client(4010).retire(params)
+
+
+def scan_liquidity(tco2_list, holder, rpc_url=PROVIDER_URL):
+    """
+    Queries balanceOf(holder) of every TCO2 in the list, in JSON-RPC batches
+    instead of one eth_call per token.
+
+    Args:
+        tco2_list (list): The TCO2 entries returned by get-available-tco2s.
+        holder (str): The address whose balance is checked (the NCT pool).
+        rpc_url (str): The JSON-RPC endpoint of the Polygon fork.
+
+    Returns:
+        list: One row per TCO2 with an address, in listing order: the entry,
+        its balance (None if the call failed) and the error, if any.
+    """
+    entries = [t for t in tco2_list if isinstance(t, dict) and t.get("address")]
+    with JsonRpcClient(rpc_url) as rpc:
+        results = rpc.eth_call_batch((t["address"], encode_call(BALANCE_OF_SELECTOR, holder)) for t in entries)
+
+    table = []
+    for t, result in zip(entries, results):
+        if isinstance(result, JsonRpcError):
+            table.append({"tco2": t, "balance": None, "error": str(result)})
+        else:
+            table.append({"tco2": t, "balance": decode_uint(result), "error": None})
+    return table
+
+
+def verify_retirements(cert_ids, expected_amount, rpc_url=PROVIDER_URL):
+    """
+    Reads getRetiredAmount of every retirement certificate in JSON-RPC
+    batches and compares it with the expected amount.
+
+    Args:
+        cert_ids (list): The retirement certificate IDs.
+        expected_amount (int): The amount each certificate should record.
+        rpc_url (str): The JSON-RPC endpoint of the Polygon fork.
+
+    Returns:
+        tuple: (retired_amounts, mismatches). retired_amounts maps each
+        certificate ID to its on-chain amount (None if the call failed);
+        mismatches lists {"certificateId", "expected", "actual", "error"}
+        for every certificate that does not match.
+    """
+    cert_ids = [int(cid) for cid in cert_ids]
+    with JsonRpcClient(rpc_url) as rpc:
+        results = rpc.eth_call_batch(
+            (NFT_CONTRACT_ADDRESS, encode_call(GET_RETIRED_AMOUNT_SELECTOR, cid)) for cid in cert_ids
+        )
 
+    retired_amounts = {}
+    mismatches = []
+    for cid, result in zip(cert_ids, results):
+        if isinstance(result, JsonRpcError):
+            retired_amounts[cid] = None
+            mismatches.append({"certificateId": cid, "expected": expected_amount, "actual": None, "error": str(result)})
+            continue
+        retired_amounts[cid] = decode_uint(result)
+        if retired_amounts[cid] != expected_amount:
+            mismatches.append({"certificateId": cid, "expected": expected_amount, "actual": retired_amounts[cid], "error": None})
+    return retired_amounts, mismatches
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Buys and retires TCO2 carbon credits through the gateway.")
+    parser.add_argument("--refresh", action="store_true",
+                        help=f"ignore the cached TCO2 listing ({TCO2_CACHE_FILE}) and fetch it again")
+    args = parser.parse_args()
+
     print("Requesting TCO2s ordered by supply...")
-    tco2s_response = get_available_tco2s({"marketplace": "Toucan", "network": "Polygon", "orderBy": "supply"})
+    tco2s_response = get_available_tco2s_cached(
+        {"marketplace": "Toucan", "network": "Polygon", "orderBy": "supply"},
+        refresh=args.refresh,
+    )
 
     tco2_list = tco2s_response.get("tco2List")
     total_count = tco2s_response.get("totalCount")
@@ -61,42 +151,20 @@ if __name__ == "__main__":
     # Required amount: 400 NCT
     required = to_wei(400, "ether")
 
-    selected_tco2s = []
-
-    ERC20_ABI = [
-        {
-            "constant": True,
-            "inputs": [{"name": "_owner", "type": "address"}],
-            "name": "balanceOf",
-            "outputs": [{"name": "balance", "type": "uint256"}],
-            "type": "function",
-        }
-    ]
-
     # Check if each TCO2 has at least 'required' balance in NCT contract, otherwise the test will fail
-    provider = Web3(Web3.HTTPProvider(PROVIDER_URL))
-
     nct_address = get_token_address_by_symbol("polygon", "NCT")
     if not nct_address:
         raise Exception("NCT token address for polygon not found; update get_token_address_by_symbol mapping.")
     nct_address = Web3.to_checksum_address(nct_address)
 
-    for t in tco2_list:
-        try:
-            if not isinstance(t, dict):
-                continue
-            t_addr = t.get("address")
-            if not t_addr:
-                continue
-            t_addr = Web3.to_checksum_address(t_addr)
-            tco2_contract = provider.eth.contract(address=t_addr, abi=ERC20_ABI)
-            bal = tco2_contract.functions.balanceOf(nct_address).call()
-            if bal >= required:
-                selected_tco2s.append(t)
-                if len(selected_tco2s) >= 3:
-                    break
-        except Exception as err:
-            print(f"Failed to query balance for {t.get('address') if isinstance(t, dict) else t}: {err}")
+    liquidity = scan_liquidity(tco2_list, nct_address)
+    for row in liquidity:
+        if row["error"] is not None:
+            print(f"Failed to query balance for {row['tco2']['address']}: {row['error']}")
+
+    liquid = [row for row in liquidity if row["balance"] is not None and row["balance"] >= required]
+    print(f"{len(liquid)} of {len(liquidity)} TCO2s have at least {required} in the NCT pool")
+    selected_tco2s = [row["tco2"] for row in liquid[:3]]
 
     if len(selected_tco2s) < 3:
         raise Exception(f"Not enough TCO2s with sufficient liquidity found. Found only {len(selected_tco2s)}")
@@ -176,35 +244,16 @@ if __name__ == "__main__":
         print(f"Retirement certificate {cid} created.")
 
     print("Verifying retirement certificate amounts on-chain...")
-    NFT_CONTRACT_ADDRESS = Web3.to_checksum_address("0x5e377f16e4ec6001652befd737341a28889af002")
-    NFT_ABI = [
-        {
-            "inputs": [{"internalType": "uint256", "name": "_id", "type": "uint256"}],
-            "name": "getRetiredAmount",
-            "outputs": [{"internalType": "uint256", "name": "", "type": "uint256"}],
-            "stateMutability": "view",
-            "type": "function",
-        }
-    ]
-
-    nft_contract = provider.eth.contract(address=NFT_CONTRACT_ADDRESS, abi=NFT_ABI)
-
-    retired_amounts = {}
-
-    for cid in cert_ids:
-        cid_int = int(cid)
-
-        try:
-            onchain_retired = nft_contract.functions.getRetiredAmount(cid_int).call()
-        except Exception as err:
-            raise Exception(f"Failed to query getRetiredAmount for certificate id {cid_int}: {err}")
+    retired_amounts, mismatches = verify_retirements(cert_ids, retired_amount)
 
-        retired_amounts[cid_int] = int(onchain_retired)
-        print(f"Certificate {cid_int} retired amount on-chain: {onchain_retired}")
+    for cid, onchain_retired in retired_amounts.items():
+        print(f"Certificate {cid} retired amount on-chain: {onchain_retired}")
 
-        if int(onchain_retired) != retired_amount:
-            raise Exception(
-                f"Retired amount mismatch for certificate {cid_int}: expected {retired_amount}, got {onchain_retired}"
-            )
+    if mismatches:
+        print("Mismatched retirement certificates:")
+        for m in mismatches:
+            detail = m["error"] if m["error"] else f"expected {m['expected']}, got {m['actual']}"
+            print(f"- {m['certificateId']}: {detail}")
+        raise Exception(f"{len(mismatches)} of {len(retired_amounts)} retirement certificates do not match")
 
     print("All retirement certificate amounts verified and match expected retired amounts.")
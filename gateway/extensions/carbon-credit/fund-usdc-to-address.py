@@ -1,32 +1,49 @@
+import argparse
+import os
+import sys
+
 from web3 import Web3
 from web3.middleware import ExtraDataToPOAMiddleware
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.rpc import BALANCE_OF_SELECTOR, JsonRpcClient, JsonRpcError, decode_uint, encode_call
+from hermes.transactions import TX_SUCCESS, TransactionPipeline, erc20_transfer
+
+PROVIDER_URL = "http://localhost:8545"
+
+parser = argparse.ArgumentParser(description="Funds test addresses with USDC from an impersonated whale.")
+parser.add_argument("recipients", nargs="*", default=["0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"],
+                    help="addresses to fund (default: the carbon credit test account)")
+parser.add_argument("--amount", type=int, default=1_000_000, help="USDC sent to each address")
+parser.add_argument("--timeout", type=float, default=120, help="seconds to wait for all receipts")
+args = parser.parse_args()
+
 # connect to your local Hardhat fork
-provider = Web3(Web3.HTTPProvider("http://localhost:8545"))
+provider = Web3(Web3.HTTPProvider(PROVIDER_URL))
 provider.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
 assert provider.is_connected(), "Hardhat fork not running!"
+rpc = JsonRpcClient(PROVIDER_URL)
 
 # USDC token address on Polygon mainnet
 USDC_ADDRESS = provider.to_checksum_address("0x3c499c542cEF5E3811e1192ce70d8cC03d5c3359")
-# your test address that needs USDC
-RECIPIENT = provider.to_checksum_address("0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266")
+# your test addresses that need USDC
+RECIPIENTS = [provider.to_checksum_address(r) for r in args.recipients]
 # a real USDC holder address (you can find on polygonscan)
 WHALE = provider.to_checksum_address("0xD36ec33c8bed5a9F7B6630855f1533455b98a418")
 
-ERC20_ABI = [
-    {"constant": False, "inputs": [
-        {"name": "_to", "type": "address"},
-        {"name": "_value", "type": "uint256"},
-    ], "name": "transfer", "outputs": [{"name": "", "type": "bool"}], "type": "function"},
-    {"constant": True, "inputs": [{"name": "_owner", "type": "address"}], "name": "balanceOf",
-     "outputs": [{"name": "balance", "type": "uint256"}], "type": "function"},
-]
 
-usdc = provider.eth.contract(address=USDC_ADDRESS, abi=ERC20_ABI)
+def usdc_balances(addresses):
+    # One batched eth_call for every address
+    results = rpc.eth_call_batch((USDC_ADDRESS, encode_call(BALANCE_OF_SELECTOR, a)) for a in addresses)
+    # A call the node rejected comes back as its JsonRpcError
+    return {a: f"unreadable ({r})" if isinstance(r, JsonRpcError) else decode_uint(r) / 10**6
+            for a, r in zip(addresses, results)}
+
 
-print("🔍 Checking recipient balance...")
-initial_balance = usdc.functions.balanceOf(RECIPIENT).call()
-print(f"💰 Initial RECIPIENT ({RECIPIENT}) USDC Balance:", initial_balance / 10**6)
+print("🔍 Checking recipient balances...")
+for recipient, balance in usdc_balances(RECIPIENTS).items():
+    print(f"💰 Initial RECIPIENT ({recipient}) USDC Balance:", balance)
 
 # Impersonate whale
 provider.provider.make_request("hardhat_impersonateAccount", [WHALE])
@@ -35,26 +52,26 @@ provider.provider.make_request("hardhat_impersonateAccount", [WHALE])
 one_matic_hex = hex(Web3.to_wei(1, "ether"))
 provider.provider.make_request("hardhat_setBalance", [WHALE, one_matic_hex])
 
-provider.eth.default_account = WHALE
+# Transfer the USDC (decimals = 6) to every recipient back to back, then collect the receipts
+amount = args.amount * 10**6
+pipeline = TransactionPipeline(rpc, WHALE, gas_price=Web3.to_wei("30", "gwei"))
+pipeline.send_all(erc20_transfer(USDC_ADDRESS, recipient, amount) for recipient in RECIPIENTS)
+transactions = pipeline.wait_all(timeout=args.timeout)
 
-# Transfer 1,000,000 USDC (decimals = 6)
-amount = 1_000_000 * 10**6
-tx = usdc.functions.transfer(RECIPIENT, amount).build_transaction({
-    "from": WHALE,
-    "gas": 200000,
-    "gasPrice": Web3.to_wei("30", "gwei"),
-    "nonce": provider.eth.get_transaction_count(WHALE),
-})
+for recipient, tx in zip(RECIPIENTS, transactions):
+    tx_hash = tx["receipt"]["transactionHash"] if tx["receipt"] else (tx["hashes"][-1] if tx["hashes"] else None)
+    if tx["status"] == TX_SUCCESS:
+        print(f"✅ Tx Hash (USDC transfer to {recipient}):", tx_hash)
+    else:
+        print(f"❌ USDC transfer to {recipient} {tx['status']}:", tx["error"] or tx_hash)
 
-# Send transaction (i.e., whale to recipient transfer USDC)
-tx_hash = provider.eth.send_transaction(tx)
-receipt = provider.eth.wait_for_transaction_receipt(tx_hash)
-print("✅ Tx Hash (USDC transfer):", receipt.transactionHash.hex())
-
-# Verify balance of recipient
-print("🔍 Verifying recipient balance...")
-balance = usdc.functions.balanceOf(RECIPIENT).call()
-print(f"💰 Recipient ({RECIPIENT}) USDC Balance:", balance / 10**6)
+# Verify balance of recipients
+print("🔍 Verifying recipient balances...")
+for recipient, balance in usdc_balances(RECIPIENTS).items():
+    print(f"💰 Recipient ({recipient}) USDC Balance:", balance)
 
 # Stop impersonation
 provider.provider.make_request("hardhat_stopImpersonatingAccount", [WHALE])
+
+if any(tx["status"] != TX_SUCCESS for tx in transactions):
+    sys.exit(1)
@@ -0,0 +1,48 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hermes.topology import DEFAULT_IMAGE, DEFAULT_PORT_STEP, TOPOLOGIES, build_topology, write_topology
+
+GATEWAY_DIR = os.path.dirname(os.path.abspath(__file__))
+# ERC-20 (case 1) and ERC-721 (case 2) ontologies, so both asset types can be transferred
+ONTOLOGIES_DIRS = [os.path.join(GATEWAY_DIR, "satp", case, "ontologies") for case in ("case_1", "case_2")]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Generate the gateway configs and docker-compose file of N SATP gateways "
+                    "bridging M EVM networks, connected in a mesh, ring or hub.")
+    parser.add_argument("topology", choices=TOPOLOGIES)
+    parser.add_argument("-n", "--gateways", type=int, required=True, help="number of gateways")
+    parser.add_argument("-m", "--networks", type=int, default=2, help="number of EVM networks (Hardhat nodes from 8545)")
+    parser.add_argument("--networks-per-gateway", type=int, default=1,
+                        help="networks each gateway bridges, starting at network <gateway index> mod M")
+    parser.add_argument("--port-step", type=int, default=DEFAULT_PORT_STEP,
+                        help="host port gap between consecutive gateways (gateway 1: 3010/3011/4010)")
+    parser.add_argument("--seed", help="derive the gateway keys from this seed instead of random keys")
+    parser.add_argument("--image", default=DEFAULT_IMAGE, help="gateway docker image")
+    parser.add_argument("--log-level", default="TRACE", help="gateway log level (INFO for performance runs)")
+    parser.add_argument("-o", "--output", help="output folder (default: satp/generated/<topology>-<N>gw-<M>net)")
+    args = parser.parse_args()
+
+    try:
+        spec = build_topology(args.topology, args.gateways, args.networks, args.networks_per_gateway,
+                              args.port_step, args.seed)
+    except ValueError as e:
+        print("Error:", e)
+        sys.exit(1)
+
+    out_dir = args.output or os.path.join(GATEWAY_DIR, "satp", "generated",
+                                          f"{args.topology}-{args.gateways}gw-{args.networks}net")
+    write_topology(spec, out_dir, ONTOLOGIES_DIRS, args.image, args.log_level)
+
+    print(f"Generated {args.topology} topology in {out_dir}")
+    for gateway in spec["gateways"]:
+        networks = ", ".join(spec["networks"][j]["id"] for j in gateway["networks"])
+        peers = ", ".join(str(j + 1) for j in gateway["counterparties"])
+        print(f"  gateway {gateway['index'] + 1}: OAPI port {gateway['ports']['oapi']}, networks [{networks}], "
+              f"counterparties [{peers}]")
+    case = os.path.relpath(out_dir, GATEWAY_DIR)
+    print(f"Start it with: python3 start-environment.py {out_dir if case.startswith('..') else case}")
@@ -0,0 +1,20 @@
+"""
+Shared helpers for the SATP Hermes gateway demo scripts.
+
+The case scripts live in folders named after the case (e.g. oracle/case_1)
+and add the gateway/ directory to sys.path before importing this package.
+"""
+
+from hermes.client import (
+    CARBON_CREDIT_API,
+    SATP_HERMES_API,
+    GatewayClient,
+    get_client,
+)
+
+__all__ = [
+    "CARBON_CREDIT_API",
+    "SATP_HERMES_API",
+    "GatewayClient",
+    "get_client",
+]
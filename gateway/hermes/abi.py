@@ -0,0 +1,132 @@
+from eth_abi import encode
+from eth_abi.abi import default_codec
+from eth_abi.exceptions import EncodingError, EncodingTypeError
+from eth_abi.grammar import TupleType, parse
+from eth_utils import keccak
+
+
+def split_signature(signature):
+    """
+    Splits a function or event signature into its name and parameter types.
+
+    Args:
+        signature (str): e.g. "transferFrom(address,address,uint256)".
+
+    Returns:
+        tuple: (name, [types]), tuple types kept whole, e.g. "(address,uint256)[]".
+    """
+    signature = signature.replace(" ", "")
+    if "(" not in signature or not signature.endswith(")"):
+        raise ValueError(f"not a signature: {signature}")
+    name, params = signature[:-1].split("(", 1)
+    types, depth, current = [], 0, ""
+    for char in params:
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        if depth < 0:
+            raise ValueError(f"unbalanced parentheses: {signature}")
+        if char == "," and depth == 0:
+            types.append(current)
+            current = ""
+        else:
+            current += char
+    if depth != 0:
+        raise ValueError(f"unbalanced parentheses: {signature}")
+    if current:
+        types.append(current)
+    return name, types
+
+
+def function_selector(signature):
+    """
+    Returns the 0x-prefixed 4-byte selector of a canonical function signature.
+
+    The signature is hashed as is (spaces removed), so it works for any
+    parameter type, tuples included.
+    """
+    return "0x" + keccak(text=signature.replace(" ", ""))[:4].hex()
+
+
+def event_topic(signature):
+    """
+    Returns the 0x-prefixed topic (full Keccak-256 hash) of a canonical event signature.
+    """
+    return "0x" + keccak(text=signature.replace(" ", "")).hex()
+
+
+def _int_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        return int(value, 16) if value.lower().startswith("0x") else int(value)
+    if isinstance(value, int):
+        return value
+    raise TypeError(f"expected an integer, got {type(value).__name__}")
+
+
+def _bytes_value(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value)
+    if isinstance(value, str) and value.lower().startswith("0x"):
+        return bytes.fromhex(value[2:])
+    raise TypeError(f"expected bytes or a 0x-prefixed hex string, got {value!r}")
+
+
+def _normalize(abi_type, value):
+    # eth_abi only takes ints and bytes; requests carry decimal or hex strings
+    if abi_type.is_array or isinstance(abi_type, TupleType):
+        if not isinstance(value, (list, tuple)):
+            raise TypeError(f"expected a list for {abi_type.to_type_str()}, got {type(value).__name__}")
+        if abi_type.is_array:
+            return [_normalize(abi_type.item_type, v) for v in value]
+        if len(value) != len(abi_type.components):
+            raise ValueError(f"expected {len(abi_type.components)} fields for {abi_type.to_type_str()}, "
+                             f"got {len(value)}")
+        return tuple(_normalize(c, v) for c, v in zip(abi_type.components, value))
+    if abi_type.base in ("uint", "int"):
+        return _int_value(value)
+    if abi_type.base == "bytes":
+        return _bytes_value(value)
+    return value
+
+
+def arguments_encoder(types):
+    """
+    Checks and parses the ABI types of a parameter list once, so encoding
+    many calls does not parse them again. The encoding itself is done by
+    eth_abi.
+
+    Args:
+        types (list): The ABI types, e.g. ["address", "uint256"].
+
+    Returns:
+        callable: Maps a list of values to their encoding (bytes). It raises
+        TypeError or ValueError when a value does not match its type.
+    """
+    types = list(types)
+    unsupported = [t for t in types if not default_codec.is_encodable_type(t)]
+    if unsupported:
+        raise ValueError(f"unsupported ABI type: {', '.join(unsupported)}")
+    parsed = [parse(t) for t in types]
+
+    def encode_arguments(values):
+        values = list(values)
+        if len(values) != len(types):
+            raise ValueError(f"expected {len(types)} arguments ({','.join(types)}), got {len(values)}")
+        values = [_normalize(t, v) for t, v in zip(parsed, values)]
+        try:
+            return encode(types, values)
+        except EncodingTypeError as e:
+            raise TypeError(str(e)) from e
+        except EncodingError as e:
+            raise ValueError(str(e)) from e
+    return encode_arguments
+
+
+def encode_arguments(types, values):
+    """
+    ABI-encodes values as the parameters of a call.
+
+    Returns:
+        bytes: The encoded arguments, without a selector.
+    """
+    return arguments_encoder(types)(values)
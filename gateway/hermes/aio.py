@@ -0,0 +1,327 @@
+import asyncio
+
+import aiohttp
+
+from hermes.client import CARBON_CREDIT_API, DEFAULT_HOST, DEFAULT_PORT, SATP_HERMES_API, env_port_offset
+
+# Maximum number of requests a client keeps in flight at the same time.
+DEFAULT_MAX_CONCURRENCY = 100
+# Default per-call timeout in seconds. Oracle UPDATE tasks wait for the
+# transaction to be mined, so this is intentionally generous.
+DEFAULT_TIMEOUT = 60.0
+# Default of the per-call timeout arguments: use the client timeout. It tells
+# "not given" apart from None, which turns the timeout off for one call.
+CLIENT_TIMEOUT = object()
+
+
+class AsyncGatewayClient:
+    """
+    asyncio client for the OAPI endpoints exposed by a single SATP Hermes gateway.
+
+    Requests are bounded by a semaphore, so callers can schedule thousands of
+    calls and only max_concurrency of them will be in flight at once. The
+    timeout of each call starts once it acquires a slot, so time spent queued
+    behind other calls does not count against it.
+
+    Args:
+        port (int): The OAPI port of the gateway (e.g. 4010 or 4110).
+        host (str): The host where the gateway is reachable.
+        max_concurrency (int): Maximum number of requests in flight.
+        timeout (float): Default timeout in seconds for every call, None to wait forever.
+        port_offset (int): Added to port, the PORT_OFFSET environment variable by default.
+    """
+
+    def __init__(self, port=DEFAULT_PORT, host=DEFAULT_HOST,
+                 max_concurrency=DEFAULT_MAX_CONCURRENCY, timeout=DEFAULT_TIMEOUT, port_offset=None):
+        self.port = port + (env_port_offset() if port_offset is None else port_offset)
+        self.host = host
+        self.base_url = f"http://{host}:{self.port}"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def _get_semaphore(self):
+        # Created lazily so it binds to the loop that runs the calls (Python < 3.10).
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    def _get_session(self):
+        # The session must be created inside the running event loop.
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, limit_per_host=self.max_concurrency)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers={"Content-Type": "application/json"},
+            )
+        return self._session
+
+    async def close(self):
+        """
+        Closes the underlying session and every pooled connection.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(self, method, path, api=SATP_HERMES_API, timeout=CLIENT_TIMEOUT, **kwargs):
+        """
+        Sends a request to the gateway and returns the decoded JSON body.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The endpoint path, relative to the plugin API prefix.
+            api (str): The plugin API prefix.
+            timeout (float): Timeout in seconds for this call, defaults to the
+                client timeout. None waits forever.
+            **kwargs: Extra arguments forwarded to aiohttp (json, params...).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+
+        Raises:
+            aiohttp.ClientResponseError: If the gateway answers with an error status.
+            asyncio.TimeoutError: If the call does not complete in time.
+        """
+        if timeout is CLIENT_TIMEOUT:
+            timeout = self.timeout
+        async with self._get_semaphore():
+            session = self._get_session()
+            client_timeout = aiohttp.ClientTimeout(total=timeout)
+            url = f"{self.base_url}{api}{path}"
+            async with session.request(method, url, timeout=client_timeout, **kwargs) as response:
+                response.raise_for_status()
+                return await response.json(content_type=None)
+
+    # Oracle endpoints
+
+    async def oracle_execute(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the oracle/execute endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/oracle/execute", json=params, timeout=timeout)
+
+    async def oracle_register(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the oracle/register endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/oracle/register", json=params, timeout=timeout)
+
+    async def oracle_unregister(self, task_id, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the oracle/unregister endpoint for the given task.
+
+        Args:
+            task_id (str): The task ID to unregister.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/oracle/unregister", params={"taskID": task_id}, timeout=timeout)
+
+    async def oracle_status(self, task_id, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the oracle/status endpoint for the given task.
+
+        Args:
+            task_id (str): The task ID to check.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("GET", "/oracle/status", params={"taskID": task_id}, timeout=timeout)
+
+    # SATP endpoints
+
+    async def transact(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the transact endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/transact", json=params, timeout=timeout)
+
+    async def session_status(self, session_id, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the status endpoint for the given SATP session.
+
+        Args:
+            session_id (str): The session ID to check.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("GET", "/status", params={"SessionID": session_id}, timeout=timeout)
+
+    async def session_ids(self, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the get-sessions-ids endpoint.
+
+        Args:
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("GET", "/get-sessions-ids", timeout=timeout)
+
+    async def audit(self, start_timestamp, end_timestamp, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the audit endpoint for the given time range.
+
+        Args:
+            start_timestamp (int): Start of the range, in milliseconds.
+            end_timestamp (int): End of the range, in milliseconds.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        params = {
+            "startTimestamp": start_timestamp,
+            "endTimestamp": end_timestamp,
+        }
+        return await self.request("GET", "/audit", params=params, timeout=timeout)
+
+    async def integrations(self, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the integrations endpoint.
+
+        Args:
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("GET", "/integrations", timeout=timeout)
+
+    async def approve_address(self, network_id, ledger_type, token_type, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the approve-address endpoint for the given network and token type.
+
+        Args:
+            network_id (str): The network identifier (e.g. EthereumLedgerTestNetwork1).
+            ledger_type (str): The ledger type (e.g. ETHEREUM).
+            token_type (str): The token type (e.g. NONSTANDARD_FUNGIBLE).
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        params = {
+            "networkId.id": network_id,
+            "networkId.ledgerType": ledger_type,
+            "tokenType": token_type,
+        }
+        return await self.request("GET", "/approve-address", params=params, timeout=timeout)
+
+    async def healthcheck(self, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the healthcheck endpoint.
+
+        Args:
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("GET", "/healthcheck", timeout=timeout)
+
+    # Carbon credit extension endpoints
+
+    async def get_available_tco2s(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the carbon credit get-available-tco2s endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/get-available-tco2s", api=CARBON_CREDIT_API, json=params, timeout=timeout)
+
+    async def specific_buy(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the carbon credit specific-buy endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/specific-buy", api=CARBON_CREDIT_API, json=params, timeout=timeout)
+
+    async def retire(self, params, timeout=CLIENT_TIMEOUT):
+        """
+        Calls the carbon credit retire endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+            timeout (float): Timeout in seconds for this call (None: no timeout).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return await self.request("POST", "/retire", api=CARBON_CREDIT_API, json=params, timeout=timeout)
+
+
+async def gather_bounded(aws, fail_fast=False):
+    """
+    Runs the given awaitables concurrently and returns their results in order.
+
+    The concurrency itself is bounded by the clients the awaitables use. When
+    fail_fast is set, the first failure cancels every call still pending and
+    is raised; otherwise failures are returned in place of the result.
+
+    Args:
+        aws (iterable): The awaitables to run.
+        fail_fast (bool): Whether to cancel the remaining calls on the first failure.
+
+    Returns:
+        list: The result (or exception) of each awaitable.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not fail_fast:
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        return await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+        # Let the cancelled calls release their semaphore slots and connections.
+        await asyncio.gather(*tasks, return_exceptions=True)
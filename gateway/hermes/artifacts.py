@@ -0,0 +1,185 @@
+import json
+import os
+import threading
+
+EVM_ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "EVM", "artifacts", "contracts")
+ORACLE_TEST_CONTRACT_ARTIFACT = os.path.normpath(
+    os.path.join(EVM_ARTIFACTS_DIR, "OracleTestContract.sol", "OracleTestContract.json")
+)
+
+
+def contract_artifact(contract_name):
+    """
+    Returns the path of the Hardhat artifact of a contract of EVM/contracts,
+    e.g. SATPTokenContract.
+    """
+    return os.path.normpath(os.path.join(EVM_ARTIFACTS_DIR, f"{contract_name}.sol", f"{contract_name}.json"))
+
+
+def fragment_signature(fragment):
+    """
+    Returns the canonical signature of an ABI fragment, e.g.
+    "UpdatedData(bytes32,string,uint256)".
+
+    Args:
+        fragment (dict): A function or event entry of an ABI.
+
+    Returns:
+        str: The name followed by the comma-separated input types.
+    """
+    types = ",".join(_canonical_type(i) for i in fragment.get("inputs", []))
+    return f"{fragment.get('name', '')}({types})"
+
+
+def _canonical_type(param):
+    # Tuples are written as (type1,type2,...) followed by any array suffix
+    param_type = param["type"]
+    if param_type.startswith("tuple"):
+        inner = ",".join(_canonical_type(c) for c in param.get("components", []))
+        return f"({inner}){param_type[len('tuple'):]}"
+    return param_type
+
+
+def select_fragments(abi, name, fragment_type=None):
+    """
+    Returns the ABI entries of a method or event.
+
+    Args:
+        abi (list): The ABI entries to pick from.
+        name (str): A bare name ("setData") or a full signature
+            ("UpdatedData(bytes32,string,uint256)") to pick one overload.
+        fragment_type (str): Restrict to "function" or "event".
+
+    Returns:
+        list: The matching ABI entries (empty if none match).
+    """
+    bare_name = name.split("(", 1)[0]
+    fragments = [f for f in abi if f.get("name") == bare_name
+                 and (fragment_type is None or f.get("type") == fragment_type)]
+    if "(" in name:
+        signature = name.replace(" ", "")
+        fragments = [f for f in fragments if fragment_signature(f) == signature]
+    return fragments
+
+
+class _Entry:
+    def __init__(self, stamp, artifact):
+        self.stamp = stamp
+        self.artifact = artifact
+        self.by_name = {}
+        for fragment in artifact.get("abi", []):
+            if "name" in fragment:
+                self.by_name.setdefault(fragment["name"], []).append(fragment)
+
+
+class ArtifactCache:
+    """
+    Parses Hardhat artifacts once and keeps them in memory until the file
+    changes on disk (its mtime or size differ from the cached copy).
+
+    The returned artifacts are shared between callers and must not be mutated.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, file_path):
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry.stamp == stamp:
+                return entry
+
+        with open(path, "r") as file:
+            entry = _Entry(stamp, json.load(file))
+
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def load(self, file_path):
+        """
+        Returns the parsed artifact, reading the file only if it changed.
+
+        Args:
+            file_path (str): The path to the Hardhat artifact JSON file.
+
+        Returns:
+            dict: The artifact (contractName, abi, bytecode...).
+        """
+        return self._entry(file_path).artifact
+
+    def abi(self, file_path):
+        """
+        Returns the full ABI of the artifact.
+
+        Args:
+            file_path (str): The path to the Hardhat artifact JSON file.
+
+        Returns:
+            list: The ABI entries.
+        """
+        return self._entry(file_path).artifact["abi"]
+
+    def abi_fragments(self, file_path, name, fragment_type=None):
+        """
+        Returns only the ABI entries of the given method or event.
+
+        Args:
+            file_path (str): The path to the Hardhat artifact JSON file.
+            name (str): A bare name ("setData") or a full signature
+                ("UpdatedData(bytes32,string,uint256)") to pick one overload.
+            fragment_type (str): Restrict to "function" or "event".
+
+        Returns:
+            list: The matching ABI entries (empty if none match).
+        """
+        entry = self._entry(file_path)
+        return select_fragments(entry.by_name.get(name.split("(", 1)[0], []), name, fragment_type)
+
+    def invalidate(self, file_path=None):
+        """
+        Drops one artifact from the cache, or all of them.
+
+        Args:
+            file_path (str): The artifact to drop, None to clear the cache.
+        """
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+
+
+_default_cache = ArtifactCache()
+
+
+def load_artifact(file_path=ORACLE_TEST_CONTRACT_ARTIFACT):
+    """
+    Returns the parsed artifact from the shared cache.
+
+    Args:
+        file_path (str): The path to the Hardhat artifact JSON file.
+
+    Returns:
+        dict: The artifact (contractName, abi, bytecode...).
+    """
+    return _default_cache.load(file_path)
+
+
+def abi_fragments(name, file_path=ORACLE_TEST_CONTRACT_ARTIFACT, fragment_type=None):
+    """
+    Returns the ABI entries of the given method or event from the shared cache.
+
+    Args:
+        name (str): A bare name or a full signature.
+        file_path (str): The path to the Hardhat artifact JSON file.
+        fragment_type (str): Restrict to "function" or "event".
+
+    Returns:
+        list: The matching ABI entries.
+    """
+    return _default_cache.abi_fragments(file_path, name, fragment_type)
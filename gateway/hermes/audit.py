@@ -0,0 +1,254 @@
+import asyncio
+import hashlib
+import json
+import os
+
+from hermes.aio import gather_bounded
+
+# Size of the most recent audit window, in milliseconds.
+DEFAULT_WINDOW_MS = 60 * 60 * 1000
+# Each older window is this many times larger than the next one, so an
+# open-ended range (startTimestamp=0) only needs a few dozen requests while
+# recent history, where most sessions are, is split finely. Use 1 for
+# fixed-size windows.
+DEFAULT_WINDOW_GROWTH = 1.25
+# Number of windows fetched concurrently.
+DEFAULT_AUDIT_CONCURRENCY = 4
+# An incremental audit starts this long before the previous endTimestamp, so
+# sessions that were still being logged at that point are fetched again and
+# exported with their final state (unless they did not change since).
+DEFAULT_CHECKPOINT_OVERLAP_MS = 5 * 60 * 1000
+
+
+def time_windows(start, end, window_ms=DEFAULT_WINDOW_MS, growth=DEFAULT_WINDOW_GROWTH):
+    """
+    Splits [start, end] into contiguous, non-overlapping windows, newest first.
+
+    Both bounds of a window are inclusive, so each window ends one
+    millisecond before the next one starts.
+
+    Args:
+        start (int): Start of the range, in milliseconds.
+        end (int): End of the range, in milliseconds.
+        window_ms (int): Size of the most recent window.
+        growth (float): Size ratio between a window and the next (more recent) one.
+
+    Yields:
+        tuple: (window_start, window_end) in milliseconds.
+    """
+    size = float(window_ms)
+    window_end = end
+    while window_end >= start:
+        window_start = max(start, window_end - int(size) + 1)
+        yield window_start, window_end
+        window_end = window_start - 1
+        size *= growth
+
+
+def decode_session(session):
+    """
+    The audit endpoint returns each session as a JSON string, decode it.
+    """
+    return json.loads(session) if isinstance(session, str) else session
+
+
+def session_key(session):
+    """
+    Returns the identifier used to de-duplicate a decoded audit session: its
+    id, or a hash of its content when it has none.
+    """
+    if isinstance(session, dict):
+        for field in ("id", "sessionID", "sessionId"):
+            if session.get(field):
+                return str(session[field])
+    return session_digest(session)
+
+
+def session_digest(session):
+    """
+    Returns a hash of the content of a decoded audit session, used to tell
+    whether a session fetched again changed since it was exported.
+    """
+    return hashlib.sha256(json.dumps(session, sort_keys=True).encode()).hexdigest()
+
+
+def load_checkpoint(file_path, gateway):
+    """
+    Returns the checkpoint stored for a gateway by save_checkpoint.
+
+    Args:
+        file_path (str): The checkpoints JSON file.
+        gateway (str): The gateway the checkpoint belongs to (e.g. "localhost:4010").
+
+    Returns:
+        dict: endTimestamp and recentSessions ({session_key: session_digest}),
+        or None if there is no checkpoint.
+    """
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r") as f:
+        checkpoint = json.load(f).get(gateway)
+    if checkpoint is not None and isinstance(checkpoint.get("recentSessions"), list):
+        # Checkpoints written before the digests were stored: export those sessions again
+        checkpoint["recentSessions"] = {key: None for key in checkpoint["recentSessions"]}
+    return checkpoint
+
+
+def save_checkpoint(file_path, gateway, end_timestamp, recent_sessions):
+    """
+    Stores the end of the last successful export of a gateway, leaving the
+    checkpoints of the other gateways untouched. The file is replaced
+    atomically, so an interrupted run keeps the previous checkpoint.
+
+    Args:
+        file_path (str): The checkpoints JSON file.
+        gateway (str): The gateway the checkpoint belongs to (e.g. "localhost:4010").
+        end_timestamp (int): The endTimestamp of the exported range, in milliseconds.
+        recent_sessions (dict): {session_key: session_digest} of the sessions
+            exported close to end_timestamp. The next run skips them if it
+            fetches them again unchanged.
+    """
+    checkpoints = {}
+    if os.path.exists(file_path):
+        with open(file_path, "r") as f:
+            checkpoints = json.load(f)
+    checkpoints[gateway] = {
+        "endTimestamp": end_timestamp,
+        "recentSessions": dict(sorted(recent_sessions.items())),
+    }
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(checkpoints, f, indent=2)
+    os.replace(tmp_path, file_path)
+
+
+async def fetch_windows_newest_first(client, windows, concurrency, handle):
+    """
+    Fetches the audit of each window, concurrency of them at a time, and
+    hands the decoded sessions to handle(window_start, window_end, sessions)
+    in window order, i.e. newest first.
+
+    A worker that finished an older window waits until the newer ones are
+    handled, so each worker holds at most one window in memory while the
+    windows are still fetched concurrently.
+
+    Args:
+        client (AsyncGatewayClient): The gateway to audit.
+        windows (iterable): The (window_start, window_end) pairs, newest first.
+        concurrency (int): Number of windows fetched at the same time.
+        handle (callable): Called with each window and its sessions.
+    """
+    pending = enumerate(windows)
+    handled = [0]
+    turn = asyncio.Condition()
+
+    async def worker():
+        for index, (window_start, window_end) in pending:
+            response = await client.audit(window_start, window_end)
+            sessions = [decode_session(s) for s in response.get("sessions", [])]
+            async with turn:
+                await turn.wait_for(lambda: handled[0] == index)
+                handle(window_start, window_end, sessions)
+                handled[0] += 1
+                turn.notify_all()
+
+    # The workers share the windows generator, which is safe because they all
+    # run on the same event loop and never await inside next(). A failed
+    # window stops the others, since the result would otherwise have a gap.
+    await gather_bounded((worker() for _ in range(concurrency)), fail_fast=True)
+
+
+class WindowDeduplicator:
+    """
+    Recognizes the sessions a window repeats from the window handled just
+    before it (the next more recent one, see fetch_windows_newest_first).
+
+    A session spanning several windows is returned by each of them in turn,
+    so comparing with the previous window is enough to keep only its most
+    recent copy. Only the keys of the current and previous windows are kept,
+    so memory does not grow with the number of sessions.
+    """
+
+    def __init__(self):
+        self._previous = set()
+        self._current = set()
+
+    def repeated(self, session):
+        """
+        Records a session of the current window and returns whether the
+        previous window already returned it.
+        """
+        key = session_key(session)
+        self._current.add(key)
+        return key in self._previous
+
+    def next_window(self):
+        """
+        Moves on to the next window, forgetting the keys of the previous one.
+        """
+        self._previous, self._current = self._current, set()
+
+
+async def stream_audit(client, out_file, start, end, window_ms=DEFAULT_WINDOW_MS,
+                       growth=DEFAULT_WINDOW_GROWTH, concurrency=DEFAULT_AUDIT_CONCURRENCY,
+                       on_window=None, previous=None):
+    """
+    Fetches the audit of [start, end] window by window and writes every
+    session to out_file as one JSON document per line.
+
+    Windows are fetched concurrently but written newest first (see
+    fetch_windows_newest_first), and each of the concurrency workers holds
+    at most one window in memory, so memory stays bounded no matter how many
+    sessions the range contains.
+
+    A session can be returned by more than one window; the copies after the
+    first are skipped (see WindowDeduplicator). Since the newest window is
+    written first, a session spanning several windows is exported from the
+    most recent one, with its latest state.
+
+    An incremental audit fetches again the sessions near the end of the
+    previous run. When previous is given, a session is only skipped if its
+    session_digest is the one stored there, so a session that was still
+    being logged is exported again with its final state.
+
+    Args:
+        client (AsyncGatewayClient): The gateway to audit.
+        out_file (file): A text file open for writing.
+        start (int): Start of the range, in milliseconds.
+        end (int): End of the range, in milliseconds.
+        window_ms (int): Size of the most recent window.
+        growth (float): Size ratio between a window and the next (more recent) one.
+        concurrency (int): Number of windows fetched at the same time.
+        on_window (callable): Called with (window_start, window_end, sessions)
+            after a window is written, e.g. to report progress. sessions
+            includes the duplicates that were skipped.
+        previous (dict): {session_key: session_digest} of the sessions
+            exported by the previous run.
+
+    Returns:
+        dict: The number of windows, sessions exported and duplicates skipped
+        (including the unchanged sessions of the previous run).
+    """
+    stats = {"windows": 0, "sessions": 0, "duplicates": 0}
+    repeats = WindowDeduplicator()
+
+    def write_window(window_start, window_end, sessions):
+        for session in sessions:
+            if repeats.repeated(session):
+                stats["duplicates"] += 1
+                continue
+            key = session_key(session)
+            if previous and key in previous and previous[key] == session_digest(session):
+                stats["duplicates"] += 1
+                continue
+            out_file.write(json.dumps(session))
+            out_file.write("\n")
+            stats["sessions"] += 1
+        repeats.next_window()
+        stats["windows"] += 1
+        if on_window is not None:
+            on_window(window_start, window_end, sessions)
+
+    await fetch_windows_newest_first(client, time_windows(start, end, window_ms, growth), concurrency, write_window)
+    out_file.flush()
+    return stats
@@ -0,0 +1,120 @@
+import time
+
+from hermes.aio import CLIENT_TIMEOUT, gather_bounded
+from hermes.oracle import OPERATION_SUCCESS, operation_state
+from hermes.preflight import PreflightError
+
+# Number of UPDATE requests kept in flight by submit_updates.
+DEFAULT_WINDOW = 32
+# Status reported for an operation whose request did not complete.
+STATE_ERROR = "ERROR"
+# Status reported for a request the validator rejected without sending it.
+STATE_REJECTED = "REJECTED"
+
+
+def _result(index, response, latency, error=None):
+    return {
+        "index": index,
+        "taskID": response.get("taskID") if isinstance(response, dict) else None,
+        "status": STATE_ERROR if error is not None else (operation_state(response) or STATE_ERROR),
+        "latency": latency,
+        "error": error,
+    }
+
+
+def _rejection(index, request, validator):
+    if validator is None:
+        return None
+    try:
+        validator.validate(request)
+    except PreflightError as e:
+        return dict(_result(index, None, 0.0, error=str(e)), status=STATE_REJECTED)
+    return None
+
+
+async def submit_updates(client, requests, window=DEFAULT_WINDOW, timeout=CLIENT_TIMEOUT, on_result=None,
+                         validator=None):
+    """
+    Pipelines oracle UPDATE requests to the execute endpoint, keeping window
+    of them in flight, and returns the outcome of each one.
+
+    requests is consumed lazily, so it can be a generator of any size. A
+    failed request is reported in its result and does not stop the others.
+    With a validator (hermes.preflight.RequestValidator), invalid requests
+    are reported as REJECTED without taking a slot of the window.
+
+    Args:
+        client (AsyncGatewayClient): The gateway to send the requests to.
+        requests (iterable): The execute payloads (see hermes.oracle.build_update).
+        window (int): Maximum number of requests in flight.
+        timeout (float): Timeout in seconds of each request, defaults to the
+            client timeout. None waits forever.
+        on_result (callable): Called with each result as soon as it is known.
+        validator (RequestValidator): Checks each request before it is sent.
+
+    Returns:
+        list: One dict per request, in submission order, with index, taskID,
+        status (the operation status, ERROR or REJECTED), latency in seconds
+        and error.
+    """
+    pending = enumerate(requests)
+    results = []
+
+    async def worker():
+        for index, request in pending:
+            rejected = _rejection(index, request, validator)
+            if rejected is not None:
+                results.append(rejected)
+                if on_result is not None:
+                    on_result(rejected)
+                continue
+            start = time.perf_counter()
+            try:
+                response = await client.oracle_execute(request, timeout=timeout)
+                result = _result(index, response, time.perf_counter() - start)
+            except Exception as e:
+                result = _result(index, None, time.perf_counter() - start, error=str(e) or type(e).__name__)
+            results.append(result)
+            if on_result is not None:
+                on_result(result)
+
+    await gather_bounded((worker() for _ in range(window)), fail_fast=True)
+    results.sort(key=lambda r: r["index"])
+    return results
+
+
+def submit_updates_serial(client, requests, on_result=None, validator=None):
+    """
+    Sends oracle UPDATE requests one after the other through the synchronous
+    client. This is the path the case scripts use, kept as the baseline of
+    the bulk benchmark.
+
+    Args:
+        client (GatewayClient): The gateway to send the requests to.
+        requests (iterable): The execute payloads.
+        on_result (callable): Called with each result as soon as it is known.
+        validator (RequestValidator): Checks each request before it is sent.
+
+    Returns:
+        list: One dict per request, as returned by submit_updates.
+    """
+    results = []
+    for index, request in enumerate(requests):
+        result = _rejection(index, request, validator)
+        start = time.perf_counter()
+        try:
+            if result is None:
+                result = _result(index, client.oracle_execute(request), time.perf_counter() - start)
+        except Exception as e:
+            result = _result(index, None, time.perf_counter() - start, error=str(e) or type(e).__name__)
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+    return results
+
+
+def count_succeeded(results):
+    """
+    Returns how many results have a SUCCESS operation status.
+    """
+    return sum(1 for r in results if r["status"] == OPERATION_SUCCESS)
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Seconds a cached response is served without asking the gateway again.
+DEFAULT_TTL = 60 * 60
+# Seconds after the TTL during which the stale response is still served
+# immediately while a fresh one is fetched in the background.
+DEFAULT_STALE_TTL = 24 * 60 * 60
+
+
+def cache_key(params):
+    """
+    Returns the key of a request, independent of the order of its fields.
+    """
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Persistent cache of gateway responses keyed on the request params, with
+    a TTL and stale-while-revalidate.
+
+    - Younger than ttl: the cached response is returned.
+    - Younger than ttl + stale_ttl: the cached response is returned right
+      away and a background thread fetches a fresh one for the next run.
+    - Older, missing, or refresh=True: the response is fetched and stored.
+
+    The background fetch runs in a non-daemon thread, so a short script
+    still waits for it to be saved before exiting.
+
+    Args:
+        file_path (str): The JSON file backing the cache.
+        ttl (float): Seconds a response is fresh.
+        stale_ttl (float): Seconds a response may be served stale after the TTL.
+    """
+
+    def __init__(self, file_path, ttl=DEFAULT_TTL, stale_ttl=DEFAULT_STALE_TTL):
+        self.file_path = file_path
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._lock = threading.Lock()
+        self._revalidating = set()
+        self._entries = {}
+        if os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                self._entries = json.load(f)
+
+    def _store(self, key, params, response):
+        with self._lock:
+            self._entries[key] = {"params": params, "fetchedAt": time.time(), "response": response}
+            tmp_path = f"{self.file_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.file_path)
+
+    def _revalidate(self, key, params, fetch):
+        try:
+            self._store(key, params, fetch(params))
+        except Exception:
+            # Keep serving the stale response; the next call will retry
+            pass
+        finally:
+            with self._lock:
+                self._revalidating.discard(key)
+
+    def age(self, params):
+        """
+        Returns how many seconds ago the response of params was fetched, or None.
+        """
+        entry = self._entries.get(cache_key(params))
+        return None if entry is None else time.time() - entry["fetchedAt"]
+
+    def get(self, params, fetch, refresh=False):
+        """
+        Returns the response of params, from the cache when possible.
+
+        Args:
+            params (dict): The request params, used as the cache key.
+            fetch (callable): Sends the request, given params, and returns the response.
+            refresh (bool): Ignore the cached response and fetch a new one.
+
+        Returns:
+            The (possibly cached) response.
+        """
+        key = cache_key(params)
+        entry = self._entries.get(key)
+        age = None if entry is None else time.time() - entry["fetchedAt"]
+
+        if refresh or age is None or age >= self.ttl + self.stale_ttl:
+            response = fetch(params)
+            self._store(key, params, response)
+            return response
+
+        if age >= self.ttl:
+            with self._lock:
+                start = key not in self._revalidating
+                self._revalidating.add(key)
+            if start:
+                threading.Thread(target=self._revalidate, args=(key, params, fetch)).start()
+
+        return entry["response"]
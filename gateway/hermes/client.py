@@ -0,0 +1,305 @@
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+
+SATP_HERMES_API = "/api/v1/@hyperledger/cactus-plugin-satp-hermes"
+CARBON_CREDIT_API = "/api/v1/@hyperledger/cactus-plugin-carbon-credit"
+
+DEFAULT_HOST = "localhost"
+DEFAULT_PORT = 4010
+# Environment variable holding the offset added to every gateway port, set
+# when a case runs on shifted ports next to other cases (see run-cases.py).
+PORT_OFFSET_ENV = "PORT_OFFSET"
+
+# Number of distinct hosts kept in the pool and number of keep-alive
+# connections kept per host. Raise pool_maxsize when driving many threads
+# against the same gateway, otherwise urllib3 discards the extra connections.
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 32
+
+
+def env_port_offset():
+    """
+    Returns the port offset of the current case run (0 unless PORT_OFFSET is set).
+    """
+    return int(os.environ.get(PORT_OFFSET_ENV) or 0)
+
+
+def gateway_label(client):
+    """
+    Returns the "host:port" name a gateway is stored under in sweep results,
+    audit checkpoints and the session index. The port is the one the client
+    really uses, PORT_OFFSET included.
+
+    Args:
+        client (GatewayClient or AsyncGatewayClient): The client of the gateway.
+    """
+    return f"{client.host}:{client.port}"
+
+
+class GatewayClient:
+    """
+    Client for the OAPI endpoints exposed by a single SATP Hermes gateway.
+
+    All calls share one requests.Session, so the TCP connection to the
+    gateway is reused between calls instead of being opened for every request.
+
+    Args:
+        port (int): The OAPI port of the gateway (e.g. 4010 or 4110).
+        host (str): The host where the gateway is reachable.
+        pool_connections (int): Number of connection pools to cache.
+        pool_maxsize (int): Maximum number of connections kept per pool.
+        timeout (float): Default timeout in seconds for every call, None to wait forever.
+        port_offset (int): Added to port, the PORT_OFFSET environment variable by default.
+    """
+
+    def __init__(self, port=DEFAULT_PORT, host=DEFAULT_HOST,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, timeout=None, port_offset=None):
+        self.port = port + (env_port_offset() if port_offset is None else port_offset)
+        self.host = host
+        self.base_url = f"http://{host}:{self.port}"
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        self.session.headers.update({"Content-Type": "application/json"})
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes every pooled connection held by this client.
+        """
+        self.session.close()
+
+    def request(self, method, path, api=SATP_HERMES_API, **kwargs):
+        """
+        Sends a request to the gateway and returns the decoded JSON body.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The endpoint path, relative to the plugin API prefix.
+            api (str): The plugin API prefix.
+            **kwargs: Extra arguments forwarded to requests (json, params, timeout...).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{api}{path}", **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    # Oracle endpoints
+
+    def oracle_execute(self, params):
+        """
+        Calls the oracle/execute endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/oracle/execute", json=params)
+
+    def oracle_register(self, params):
+        """
+        Calls the oracle/register endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/oracle/register", json=params)
+
+    def oracle_unregister(self, task_id):
+        """
+        Calls the oracle/unregister endpoint for the given task.
+
+        Args:
+            task_id (str): The task ID to unregister.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/oracle/unregister", params={"taskID": task_id})
+
+    def oracle_status(self, task_id):
+        """
+        Calls the oracle/status endpoint for the given task.
+
+        Args:
+            task_id (str): The task ID to check.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("GET", "/oracle/status", params={"taskID": task_id})
+
+    # SATP endpoints
+
+    def transact(self, params):
+        """
+        Calls the transact endpoint with the given params as JSON body.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/transact", json=params)
+
+    def session_status(self, session_id):
+        """
+        Calls the status endpoint for the given SATP session.
+
+        Args:
+            session_id (str): The session ID to check.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("GET", "/status", params={"SessionID": session_id})
+
+    def session_ids(self):
+        """
+        Calls the get-sessions-ids endpoint.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("GET", "/get-sessions-ids")
+
+    def audit(self, start_timestamp, end_timestamp):
+        """
+        Calls the audit endpoint for the given time range.
+
+        Args:
+            start_timestamp (int): Start of the range, in milliseconds.
+            end_timestamp (int): End of the range, in milliseconds.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        params = {
+            "startTimestamp": start_timestamp,
+            "endTimestamp": end_timestamp,
+        }
+        return self.request("GET", "/audit", params=params)
+
+    def integrations(self):
+        """
+        Calls the integrations endpoint.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("GET", "/integrations")
+
+    def approve_address(self, network_id, ledger_type, token_type):
+        """
+        Calls the approve-address endpoint for the given network and token type.
+
+        Args:
+            network_id (str): The network identifier (e.g. EthereumLedgerTestNetwork1).
+            ledger_type (str): The ledger type (e.g. ETHEREUM).
+            token_type (str): The token type (e.g. NONSTANDARD_FUNGIBLE).
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        params = {
+            "networkId.id": network_id,
+            "networkId.ledgerType": ledger_type,
+            "tokenType": token_type,
+        }
+        return self.request("GET", "/approve-address", params=params)
+
+    def healthcheck(self):
+        """
+        Calls the healthcheck endpoint.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("GET", "/healthcheck")
+
+    # Carbon credit extension endpoints
+
+    def get_available_tco2s(self, params):
+        """
+        Calls the carbon credit get-available-tco2s endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/get-available-tco2s", api=CARBON_CREDIT_API, json=params)
+
+    def specific_buy(self, params):
+        """
+        Calls the carbon credit specific-buy endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/specific-buy", api=CARBON_CREDIT_API, json=params)
+
+    def retire(self, params):
+        """
+        Calls the carbon credit retire endpoint.
+
+        Args:
+            params (dict): The JSON payload to send.
+
+        Returns:
+            dict: The JSON response from the endpoint.
+        """
+        return self.request("POST", "/retire", api=CARBON_CREDIT_API, json=params)
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(port=DEFAULT_PORT, host=DEFAULT_HOST, **options):
+    """
+    Returns the shared client for the gateway at host:port, creating it on first use.
+
+    Scripts should use this instead of building their own GatewayClient so
+    that every call to the same gateway goes through one connection pool.
+
+    Args:
+        port (int): The OAPI port of the gateway.
+        host (str): The host where the gateway is reachable.
+        **options: Extra GatewayClient arguments, only used when the client is created.
+
+    Returns:
+        GatewayClient: The shared client.
+    """
+    key = (host, port)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = GatewayClient(port=port, host=host, **options)
+            _clients[key] = client
+        return client
@@ -0,0 +1,165 @@
+import json
+import os
+
+from hermes.aio import gather_bounded
+from hermes.oracle import TASK_ACTIVE, operation_timestamp, task_state
+from hermes.stats import summarize
+
+
+def interval_drifts(operations, interval_ms):
+    """
+    Returns how late (positive) or early (negative) each operation of a
+    polling task ran, compared with the configured interval.
+
+    Args:
+        operations (list): The task's "operations" list.
+        interval_ms (float): The configured pollingInterval, in milliseconds.
+
+    Returns:
+        list: actual interval - interval_ms for every pair of consecutive
+        operations, in milliseconds.
+    """
+    timestamps = sorted(t for t in (operation_timestamp(op) for op in operations) if t is not None)
+    return [later - earlier - interval_ms for earlier, later in zip(timestamps, timestamps[1:])]
+
+
+class PollingFleet:
+    """
+    Registers and tracks many POLLING oracle tasks on one gateway.
+
+    Each task is identified by a caller-chosen key. reconcile() registers the
+    keys of the desired set that have no active task and unregisters the
+    tasks whose key is no longer desired, so the fleet can be grown, shrunk or
+    torn down (reconcile({})) across runs. The key -> task mapping is kept in
+    state_file when one is given.
+
+    Calls are sent concurrently; their parallelism is bounded by the
+    max_concurrency of the client.
+
+    Args:
+        client (AsyncGatewayClient): The gateway hosting the tasks.
+        state_file (str): The JSON file keeping the tracked tasks, None to keep them in memory.
+    """
+
+    def __init__(self, client, state_file=None):
+        self.client = client
+        self.state_file = state_file
+        # key -> {"taskID": ..., "pollingInterval": ...}
+        self.tasks = {}
+        if state_file is not None and os.path.exists(state_file):
+            with open(state_file, "r") as f:
+                self.tasks = json.load(f)
+
+    def save(self):
+        """
+        Writes the tracked tasks to the state file, if there is one.
+        """
+        if self.state_file is None:
+            return
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.tasks, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    async def statuses(self, keys=None):
+        """
+        Fetches the status of the tracked tasks.
+
+        Args:
+            keys (iterable): The keys to check, all tracked keys by default.
+
+        Returns:
+            dict: key -> status response, or the exception raised by the call.
+        """
+        keys = list(self.tasks if keys is None else keys)
+        responses = await gather_bounded(self.client.oracle_status(self.tasks[key]["taskID"]) for key in keys)
+        return dict(zip(keys, responses))
+
+    async def active_keys(self):
+        """
+        Returns the keys whose task the gateway reports as ACTIVE.
+        """
+        statuses = await self.statuses()
+        return {key for key, status in statuses.items() if task_state(status) == TASK_ACTIVE}
+
+    async def reconcile(self, desired):
+        """
+        Brings the gateway in line with the desired set of polling tasks.
+
+        Args:
+            desired (dict): key -> oracle/register request of every task that should run.
+
+        Returns:
+            dict: The keys registered, unregistered and kept, the keys whose
+            status could not be fetched (left untouched), and the keys whose
+            register or unregister call failed.
+        """
+        statuses = await self.statuses()
+        active = {key for key, status in statuses.items() if task_state(status) == TASK_ACTIVE}
+        # A task whose status could not be fetched may still be running, so it
+        # is neither registered again nor forgotten
+        unknown = {key for key, status in statuses.items() if isinstance(status, Exception)}
+        # Tasks that stopped on their own are no longer worth tracking
+        for key in set(self.tasks) - active - unknown:
+            del self.tasks[key]
+
+        to_register = [key for key in desired if key not in active and key not in unknown]
+        to_unregister = [key for key in active if key not in desired]
+        outcome = {
+            "registered": [],
+            "unregistered": [],
+            "kept": sorted(active & set(desired)),
+            "unknown": sorted(unknown),
+            "failed": [],
+        }
+
+        responses = await gather_bounded(self.client.oracle_unregister(self.tasks[key]["taskID"]) for key in to_unregister)
+        for key, response in zip(to_unregister, responses):
+            if isinstance(response, Exception):
+                outcome["failed"].append(key)
+            else:
+                del self.tasks[key]
+                outcome["unregistered"].append(key)
+
+        responses = await gather_bounded(self.client.oracle_register(desired[key]) for key in to_register)
+        for key, response in zip(to_register, responses):
+            if isinstance(response, Exception) or "taskID" not in response:
+                outcome["failed"].append(key)
+            else:
+                self.tasks[key] = {"taskID": response["taskID"], "pollingInterval": desired[key].get("pollingInterval")}
+                outcome["registered"].append(key)
+
+        self.save()
+        return outcome
+
+    async def drift(self):
+        """
+        Measures the scheduling drift of every tracked task: the actual time
+        between consecutive operations minus the configured pollingInterval.
+
+        Returns:
+            dict: Summary of the drifts (in milliseconds) over all tasks, the
+            worst median drift of a single task and the number of tasks that
+            have not run two operations yet.
+        """
+        statuses = await self.statuses()
+        drifts = []
+        task_medians = []
+        unmeasured = 0
+        for key, status in statuses.items():
+            interval = self.tasks[key].get("pollingInterval")
+            if isinstance(status, Exception) or not interval:
+                unmeasured += 1
+                continue
+            task_drifts = interval_drifts(status.get("operations") or [], interval)
+            if not task_drifts:
+                unmeasured += 1
+                continue
+            drifts.extend(task_drifts)
+            task_medians.append(summarize(task_drifts)["p50"])
+        return {
+            "tasks": len(statuses),
+            "unmeasured": unmeasured,
+            "driftMs": summarize(drifts),
+            "worstTaskMedianDriftMs": max(task_medians) if task_medians else None,
+        }
@@ -0,0 +1,423 @@
+import json
+import re
+import sqlite3
+import time
+from datetime import datetime
+
+from hermes.audit import (
+    DEFAULT_AUDIT_CONCURRENCY, DEFAULT_CHECKPOINT_OVERLAP_MS, DEFAULT_WINDOW_GROWTH, DEFAULT_WINDOW_MS,
+    WindowDeduplicator, fetch_windows_newest_first, session_key, time_windows,
+)
+from hermes.client import gateway_label
+from hermes.satp import is_session_terminal, session_state
+from hermes.sweep import fetch_session_ids, sweep_sessions
+
+# SATP stages whose start time gets its own column.
+STAGES = (0, 1, 2, 3)
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT NOT NULL,
+    gateway TEXT NOT NULL,
+    status TEXT,
+    substatus TEXT,
+    stage TEXT,
+    step TEXT,
+    source_network TEXT,
+    destination_network TEXT,
+    asset_id TEXT,
+    contract_address TEXT,
+    token_type TEXT,
+    amount TEXT,
+    owner TEXT,
+    started_at INTEGER,
+    {"".join(f"stage{n}_at INTEGER, " for n in STAGES)}
+    completed_at INTEGER,
+    updated_at INTEGER NOT NULL,
+    status_response TEXT,
+    PRIMARY KEY (session_id, gateway)
+);
+CREATE INDEX IF NOT EXISTS sessions_status_source ON sessions (status, source_network, started_at);
+CREATE INDEX IF NOT EXISTS sessions_status_destination ON sessions (status, destination_network, started_at);
+CREATE INDEX IF NOT EXISTS sessions_source ON sessions (source_network, started_at);
+CREATE INDEX IF NOT EXISTS sessions_destination ON sessions (destination_network, started_at);
+CREATE INDEX IF NOT EXISTS sessions_started ON sessions (started_at);
+CREATE INDEX IF NOT EXISTS sessions_owner ON sessions (owner, started_at);
+CREATE TABLE IF NOT EXISTS audit_checkpoints (
+    gateway TEXT PRIMARY KEY,
+    end_timestamp INTEGER NOT NULL
+);
+"""
+
+# Columns filled from a status or audit response, in insert order.
+COLUMNS = [
+    "status", "substatus", "stage", "step", "source_network", "destination_network", "asset_id",
+    "contract_address", "token_type", "amount", "owner", "started_at",
+    *(f"stage{n}_at" for n in STAGES), "completed_at", "status_response",
+]
+
+_STAGE_KEY = re.compile(r"^stage_?(\d)$", re.IGNORECASE)
+
+
+def to_millis(value):
+    """
+    Converts a gateway timestamp (milliseconds, seconds, numeric string or
+    ISO 8601 date) to milliseconds since the epoch, or None.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            try:
+                return int(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() * 1000)
+            except ValueError:
+                return None
+    if isinstance(value, (int, float)):
+        # Values before 2001-09 in milliseconds are taken as seconds
+        return int(value if value >= 1e12 else value * 1000)
+    return None
+
+
+def _get(data, *paths):
+    """
+    Returns the first non-empty value found at one of the key paths of data.
+    """
+    for path in paths:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _network_id(value):
+    if isinstance(value, dict):
+        return _get(value, ("id",), ("dltSubnetworkID",), ("networkId", "id"), ("networkId",))
+    return value
+
+
+def _timestamps(value):
+    """
+    Returns every timestamp found in a (nested) timestamps object, in milliseconds.
+    """
+    if isinstance(value, dict):
+        return [t for v in value.values() for t in _timestamps(v)]
+    if isinstance(value, list):
+        return [t for v in value for t in _timestamps(v)]
+    millis = to_millis(value)
+    return [] if millis is None else [millis]
+
+
+def _stage_times(session):
+    """
+    Returns {stage: first timestamp of the stage} from the processed and
+    received timestamps of an audit session.
+    """
+    times = {}
+    for field in ("processedTimestamps", "receivedTimestamps", "processed_timestamps", "received_timestamps"):
+        for key, value in (session.get(field) or {}).items():
+            match = _STAGE_KEY.match(key)
+            stamps = _timestamps(value)
+            if match and stamps:
+                stage = int(match.group(1))
+                times[stage] = min(stamps + ([times[stage]] if stage in times else []))
+    return times
+
+
+def status_row(status):
+    """
+    Maps a SATP status response to index columns.
+    """
+    return {
+        "status": session_state(status) or None,
+        "substatus": _get(status, ("substatus",)),
+        "stage": _get(status, ("stage",)),
+        "step": _get(status, ("step",)),
+        "source_network": _network_id(_get(status, ("originNetwork",), ("originChain",))),
+        "destination_network": _network_id(_get(status, ("destinationNetwork",), ("destinationChain",))),
+        "started_at": to_millis(_get(status, ("startTime",))),
+        "completed_at": to_millis(_get(status, ("completionTime",), ("endTime",))),
+        "status_response": json.dumps(status),
+    }
+
+
+def audit_row(session):
+    """
+    Maps a decoded audit session to index columns.
+    """
+    sender = _get(session, ("senderAsset",), ("sender_asset",)) or {}
+    receiver = _get(session, ("receiverAsset",), ("receiver_asset",)) or {}
+    stages = _stage_times(session)
+    row = {
+        "source_network": _network_id(_get(sender, ("networkId",)))
+        or _network_id(_get(session, ("senderGatewayNetworkId",), ("sender_gateway_network_id",))),
+        "destination_network": _network_id(_get(receiver, ("networkId",)))
+        or _network_id(_get(session, ("recipientGatewayNetworkId",), ("recipient_gateway_network_id",))),
+        "asset_id": _get(sender, ("tokenId",), ("id",), ("token_id",))
+        or _get(session, ("digitalAssetId",), ("digital_asset_id",)),
+        "contract_address": _get(sender, ("contractAddress",), ("contract_address",)),
+        "token_type": _get(sender, ("tokenType",), ("token_type",)),
+        "amount": _get(sender, ("amount",)),
+        "owner": _get(sender, ("owner",)),
+        "started_at": min(stages.values()) if stages else None,
+    }
+    for stage, started in stages.items():
+        if stage in STAGES:
+            row[f"stage{stage}_at"] = started
+    stamps = _timestamps({k: v for k, v in session.items() if "imestamp" in k})
+    if stamps:
+        row["completed_at"] = max(stamps)
+    if row["amount"] is not None:
+        row["amount"] = str(row["amount"])
+    return row
+
+
+def _merge(column):
+    """
+    Returns the SQL assignment of a column on upsert: the earliest start, the
+    latest completion, and otherwise the new value unless it is null.
+    """
+    if column in ("started_at", "completed_at"):
+        pick = "MIN" if column == "started_at" else "MAX"
+        return f"{column} = COALESCE({pick}(excluded.{column}, {column}), excluded.{column}, {column})"
+    return f"{column} = COALESCE(excluded.{column}, {column})"
+
+
+class SessionIndex:
+    """
+    Local SQLite index of SATP sessions, one row per session and gateway,
+    filled incrementally from the status and audit endpoints.
+
+    Status responses set the status, stage and networks of a session; audit
+    sessions add the asset, amount, owner and stage timestamps. A column is
+    only overwritten by a non-null value, so both sources complement each
+    other; started_at keeps the earliest value and completed_at the latest.
+
+    SessionIndex has the get/put interface of SessionStatusCache, so
+    sweep_sessions reuses the terminal statuses it holds instead of querying
+    the gateways again.
+
+    Args:
+        file_path (str): The SQLite database, created if missing (":memory:" for a throwaway index).
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.connection = sqlite3.connect(file_path)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self):
+        """
+        Commits and closes the database.
+        """
+        self.connection.commit()
+        self.connection.close()
+
+    def upsert(self, session_id, gateway, row):
+        """
+        Inserts or updates the row of a session on a gateway, keeping the
+        stored value of every column row leaves empty.
+        """
+        values = [row.get(column) for column in COLUMNS]
+        self.connection.execute(
+            f"INSERT INTO sessions (session_id, gateway, {', '.join(COLUMNS)}, updated_at) "
+            f"VALUES (?, ?, {', '.join('?' for _ in COLUMNS)}, ?) "
+            f"ON CONFLICT (session_id, gateway) DO UPDATE SET "
+            f"{', '.join(_merge(c) for c in COLUMNS)}, updated_at = excluded.updated_at",
+            [session_id, gateway, *values, int(time.time() * 1000)],
+        )
+
+    def get(self, session_id, gateway):
+        """
+        Returns the indexed status of a session on a gateway if it is terminal, or None.
+        """
+        row = self.connection.execute(
+            "SELECT status_response FROM sessions WHERE session_id = ? AND gateway = ?", (session_id, gateway)
+        ).fetchone()
+        if row is None or row["status_response"] is None:
+            return None
+        status = json.loads(row["status_response"])
+        return status if is_session_terminal(status) else None
+
+    def put(self, session_id, gateway, status):
+        """
+        Indexes a status response.
+
+        Returns:
+            bool: Whether the status is terminal (and will not be fetched again).
+        """
+        self.upsert(session_id, gateway, status_row(status))
+        return is_session_terminal(status)
+
+    def put_audit(self, gateway, session):
+        """
+        Indexes a decoded audit session.
+        """
+        self.upsert(session_key(session), gateway, audit_row(session))
+
+    def save(self):
+        """
+        Commits the pending changes.
+        """
+        self.connection.commit()
+
+    def audit_checkpoint(self, gateway):
+        """
+        Returns the end of the last indexed audit range of a gateway, or None.
+        """
+        row = self.connection.execute(
+            "SELECT end_timestamp FROM audit_checkpoints WHERE gateway = ?", (gateway,)
+        ).fetchone()
+        return None if row is None else row["end_timestamp"]
+
+    def query(self, status=None, source_network=None, destination_network=None, owner=None, gateway=None,
+              since=None, until=None, limit=None):
+        """
+        Returns the indexed sessions matching every given filter, newest first.
+
+        Args:
+            status (str or iterable): Status, or statuses, of the sessions (e.g. FAILED).
+            source_network (str): Network the assets leave.
+            destination_network (str): Network the assets are sent to.
+            owner (str): Owner of the transferred asset.
+            gateway (str): Only the rows of this gateway ("host:port").
+            since (int): Earliest start time, in milliseconds.
+            until (int): Latest start time, in milliseconds.
+            limit (int): Maximum number of sessions.
+
+        Returns:
+            list: One dict per session and gateway.
+        """
+        clauses, params = [], []
+        if status is not None:
+            statuses = [status] if isinstance(status, str) else list(status)
+            clauses.append(f"status IN ({', '.join('?' for _ in statuses)})")
+            params.extend(s.upper() for s in statuses)
+        for column, value in (("source_network", source_network), ("destination_network", destination_network),
+                              ("owner", owner), ("gateway", gateway)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("started_at <= ?")
+            params.append(until)
+        sql = "SELECT * FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY started_at DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        rows = self.connection.execute(sql, params).fetchall()
+        return [{k: row[k] for k in row.keys() if k != "status_response"} for row in rows]
+
+    def count_states(self):
+        """
+        Counts the indexed sessions in each state, per gateway.
+
+        Returns:
+            dict: {gateway: {state: count}}, states sorted by name.
+        """
+        counts = {}
+        for row in self.connection.execute(
+            "SELECT gateway, COALESCE(status, 'UNKNOWN') AS state, COUNT(*) AS n FROM sessions "
+            "GROUP BY gateway, state ORDER BY gateway, state"
+        ):
+            counts.setdefault(row["gateway"], {})[row["state"]] = row["n"]
+        return counts
+
+    async def sync_statuses(self, clients, session_ids=None):
+        """
+        Indexes the status of every session known by the gateways (or of the
+        given ones). Sessions already indexed in a terminal state are not
+        queried again.
+
+        Args:
+            clients (list): The AsyncGatewayClient of each gateway.
+            session_ids (iterable): The sessions to index, None for every session.
+
+        Returns:
+            int: The number of status calls made.
+        """
+        if session_ids is None:
+            session_ids = await fetch_session_ids(clients)
+        session_ids = list(session_ids)
+        known = sum(1 for s in session_ids for c in clients if self.get(s, gateway_label(c)) is not None)
+        await sweep_sessions(clients, session_ids, self)
+        self.save()
+        return len(session_ids) * len(clients) - known
+
+    async def sync_audit(self, client, end=None, window_ms=DEFAULT_WINDOW_MS, growth=DEFAULT_WINDOW_GROWTH,
+                         concurrency=DEFAULT_AUDIT_CONCURRENCY, overlap_ms=DEFAULT_CHECKPOINT_OVERLAP_MS,
+                         full=False):
+        """
+        Indexes the audit of a gateway since its last checkpoint (minus
+        overlap_ms), in time windows like stream_audit, and moves the
+        checkpoint to end once the whole range is indexed.
+
+        Windows are indexed newest first and a session is only indexed from
+        the first window that returns it, so a session spanning several
+        windows keeps its latest state instead of the partial copy of an
+        older window.
+
+        Args:
+            client (AsyncGatewayClient): The gateway to audit.
+            end (int): End of the range, in milliseconds (default: now).
+            window_ms (int): Size of the most recent window.
+            growth (float): Size ratio between a window and the next (more recent) one.
+            concurrency (int): Number of windows fetched at the same time.
+            overlap_ms (int): How far before the checkpoint the range starts.
+            full (bool): Ignore the checkpoint and index the whole history.
+
+        Returns:
+            dict: The range start, and the number of windows and sessions indexed.
+        """
+        gateway = gateway_label(client)
+        end = int(time.time() * 1000) if end is None else end
+        checkpoint = None if full else self.audit_checkpoint(gateway)
+        start = 0 if checkpoint is None else max(0, checkpoint - overlap_ms)
+        stats = {"start": start, "windows": 0, "sessions": 0}
+        # The upsert keeps the last non-null value of each column, so an older
+        # window's partial copy of a session must not be written over the newer one
+        repeats = WindowDeduplicator()
+
+        def index_window(window_start, window_end, sessions):
+            for session in sessions:
+                if repeats.repeated(session):
+                    continue
+                self.put_audit(gateway, session)
+                stats["sessions"] += 1
+            repeats.next_window()
+            stats["windows"] += 1
+
+        # A failed window stops the sync before the checkpoint moves, so the
+        # next run fetches the range again
+        await fetch_windows_newest_first(client, time_windows(start, end, window_ms, growth), concurrency,
+                                         index_window)
+        self.connection.execute(
+            "INSERT INTO audit_checkpoints (gateway, end_timestamp) VALUES (?, ?) "
+            "ON CONFLICT (gateway) DO UPDATE SET end_timestamp = excluded.end_timestamp",
+            (gateway, end),
+        )
+        self.save()
+        return stats
+
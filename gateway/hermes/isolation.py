@@ -0,0 +1,129 @@
+import glob
+import os
+import re
+import shutil
+import subprocess
+
+from hermes.orchestrator import case_gateway_ports, case_node_ports, compose_file
+
+# Gap between the port offsets of two cases running side by side. It is larger
+# than the span of the ports a case uses (3010 to 8547), so the shifted ranges
+# of two runs never overlap.
+DEFAULT_OFFSET_STEP = 6000
+
+# Highest TCP port; an offset must keep every port of a case at or below it.
+MAX_PORT = 65535
+
+# Files and folders produced by a run, not copied into an isolated copy of a case.
+_RUN_OUTPUTS = ("outputs", "audits", "__pycache__", "satp-hermes-gateway", "*.log", "*-cache.json")
+
+# Host side of the "- 3010:3010/tcp" entries of a docker-compose file.
+_COMPOSE_PORT_PATTERN = re.compile(r"^(\s*-\s*\"?)(\d+)(:\d+)", re.MULTILINE)
+_CONTAINER_NAME_PATTERN = re.compile(r"^(\s*container_name:\s*\"?)([\w.-]+)", re.MULTILINE)
+_NODE_PORT_PATTERN = re.compile(r"(host\.docker\.internal:)(\d+)")
+
+
+def case_suffix(offset):
+    """
+    Returns the suffix of the folder and docker-compose project of a case run.
+    """
+    return f"-offset{offset}"
+
+
+def case_host_ports(case_dir):
+    """
+    Returns every host port render_case shifts: those the docker-compose file
+    of a case publishes and those its gateway configs point to.
+    """
+    with open(compose_file(case_dir), "r") as f:
+        ports = {int(m.group(2)) for m in _COMPOSE_PORT_PATTERN.finditer(f.read())}
+    config_dir = os.path.join(case_dir, "config")
+    for name in os.listdir(config_dir):
+        with open(os.path.join(config_dir, name), "r") as f:
+            ports.update(int(m.group(2)) for m in _NODE_PORT_PATTERN.finditer(f.read()))
+    return sorted(ports)
+
+
+def check_offset(case_dir, offset):
+    """
+    Raises ValueError if shifting the ports of a case by offset would push
+    any of them past MAX_PORT.
+    """
+    too_high = [p for p in case_host_ports(case_dir) if p + offset > MAX_PORT]
+    if too_high:
+        raise ValueError(f"offset {offset} moves port {max(too_high)} of {case_dir} to "
+                         f"{max(too_high) + offset}, past {MAX_PORT}")
+
+
+def rendered_cases(gateway_dir):
+    """
+    Returns the isolated copies of the cases rendered under gateway_dir.
+    """
+    return sorted(d for d in glob.glob(os.path.join(gateway_dir, "*", "case_*-offset*")) if os.path.isdir(d))
+
+
+def render_case(case_dir, offset):
+    """
+    Copies a case next to itself with every host port shifted by offset: the
+    ports the docker-compose file publishes, the EVM nodes the gateway configs
+    point to, and any container name. The copy is named after the case with
+    case_suffix(offset), so docker-compose gives it its own project, network
+    and containers, and the scripts in it still find the hermes package.
+
+    Args:
+        case_dir (str): The case folder (e.g. gateway/satp/case_1).
+        offset (int): Added to every host port.
+
+    Returns:
+        str: The folder of the copy.
+
+    Raises:
+        ValueError: If a shifted port would be past MAX_PORT.
+    """
+    case_dir = os.path.normpath(case_dir)
+    check_offset(case_dir, offset)
+    run_dir = case_dir + case_suffix(offset)
+    if os.path.exists(run_dir):
+        shutil.rmtree(run_dir)
+    shutil.copytree(case_dir, run_dir, ignore=shutil.ignore_patterns(*_RUN_OUTPUTS))
+
+    compose_path = compose_file(run_dir)
+    with open(compose_path, "r") as f:
+        compose = f.read()
+    compose = _COMPOSE_PORT_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}{m.group(3)}", compose)
+    compose = _CONTAINER_NAME_PATTERN.sub(lambda m: f"{m.group(1)}{m.group(2)}{case_suffix(offset)}", compose)
+    with open(compose_path, "w") as f:
+        f.write(compose)
+
+    config_dir = os.path.join(run_dir, "config")
+    for name in os.listdir(config_dir):
+        config_file = os.path.join(config_dir, name)
+        with open(config_file, "r") as f:
+            config = f.read()
+        config = _NODE_PORT_PATTERN.sub(lambda m: f"{m.group(1)}{int(m.group(2)) + offset}", config)
+        with open(config_file, "w") as f:
+            f.write(config)
+
+    return run_dir
+
+
+def case_endpoints(run_dir):
+    """
+    Returns the endpoints of a (rendered) case: its EVM node URLs and gateway OAPI URLs.
+    """
+    return {
+        "nodes": [f"http://localhost:{port}" for port in case_node_ports(run_dir)],
+        "gateways": [f"http://localhost:{port}" for port in case_gateway_ports(run_dir)],
+    }
+
+
+def stop_case(run_dir):
+    """
+    Stops the gateways of a (rendered) case and the Hardhat nodes on its ports,
+    leaving the containers and nodes of other cases running.
+    """
+    subprocess.run(["docker", "compose", "down", "-v"], cwd=run_dir, check=False)
+    for port in case_node_ports(run_dir):
+        pids = subprocess.run(["lsof", "-ti", f"tcp:{port}", "-sTCP:LISTEN"], capture_output=True, text=True).stdout.split()
+        if pids:
+            subprocess.run(["kill", "-9", *pids], check=False)
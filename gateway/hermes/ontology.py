@@ -0,0 +1,237 @@
+import glob
+import json
+import os
+import threading
+
+from hermes.abi import arguments_encoder, function_selector, split_signature
+from hermes.artifacts import contract_artifact, fragment_signature, load_artifact
+
+# Ontology actions that only run when a session is rolled back. A problem
+# there is reported without blocking the transfer (unless strict checking is
+# asked for); lock, mint, assign, burn and checkPermission run in every
+# successful transfer.
+ROLLBACK_ACTIONS = ("unlock",)
+
+
+class OntologyError(Exception):
+    """
+    Raised when an ontology does not match the contract it is used with.
+
+    Attributes:
+        problems (list): {"action", "signature", "message"} of every mismatch.
+    """
+
+    def __init__(self, problems):
+        super().__init__("; ".join(format_problem(p) for p in problems))
+        self.problems = problems
+
+
+def format_problem(problem):
+    """
+    Returns the one-line description of an ontology problem.
+    """
+    return f"{problem['action']}: {problem['signature']}: {problem['message']}"
+
+
+class CompiledFunction:
+    """
+    One function of an ontology action, with its selector and argument
+    encoder computed once.
+
+    Args:
+        action (str): The ontology action (lock, unlock, mint...).
+        entry (dict): The functionSignature, variables and available fields.
+    """
+
+    def __init__(self, action, entry):
+        self.action = action
+        self.signature = entry["functionSignature"].replace(" ", "")
+        self.variables = list(entry.get("variables", []))
+        self.available = entry.get("available", True)
+        self.name, self.types = split_signature(self.signature)
+        self.selector = function_selector(self.signature)
+        if len(self.variables) != len(self.types):
+            raise ValueError(f"{len(self.variables)} variables ({', '.join(self.variables)}) "
+                             f"for {len(self.types)} parameters")
+        self._encode = arguments_encoder(self.types)
+
+    def encode(self, values):
+        """
+        Builds the calldata of the function.
+
+        Args:
+            values (dict or list): The value of each variable, by name
+                (e.g. {"owner": ..., "bridge": ..., "amount": ...}) or in order.
+
+        Returns:
+            str: The 0x-prefixed calldata.
+        """
+        if isinstance(values, dict):
+            missing = [v for v in self.variables if v not in values]
+            if missing:
+                raise ValueError(f"{self.signature} needs {', '.join(missing)}")
+            values = [values[v] for v in self.variables]
+        return self.selector + self._encode(values).hex()
+
+
+class CompiledOntology:
+    """
+    An SATP ontology file with the selectors and argument encoders of its
+    functions precomputed, checked against the ABI of a contract before any
+    transfer instead of failing mid-session.
+
+    Entries that cannot be compiled (malformed signature, unsupported type,
+    variables that do not match the parameters) are kept in problems.
+
+    Args:
+        ontology (dict): The parsed ontology file.
+    """
+
+    def __init__(self, ontology):
+        self.id = ontology.get("id")
+        self.name = ontology.get("name")
+        self.functions = {}
+        self.problems = []
+        for action, entries in ontology.get("ontology", {}).items():
+            self.functions[action] = []
+            for entry in entries:
+                try:
+                    self.functions[action].append(CompiledFunction(action, entry))
+                except (KeyError, ValueError) as e:
+                    self.problems.append({"action": action, "signature": entry.get("functionSignature"),
+                                          "message": str(e)})
+
+    def selectors(self):
+        """
+        Returns {action: [selector of each function]}.
+        """
+        return {action: [f.selector for f in functions] for action, functions in self.functions.items()}
+
+    def encode(self, action, values):
+        """
+        Builds the calldata of every available function of an action, in order.
+
+        Args:
+            action (str): The ontology action, e.g. lock.
+            values (dict): The value of each variable of the action.
+
+        Returns:
+            list: The 0x-prefixed calldata of each function.
+        """
+        if action not in self.functions:
+            raise KeyError(f"{self.id} has no {action} action")
+        return [f.encode(values) for f in self.functions[action] if f.available]
+
+    def check_abi(self, abi, contract_name="the contract"):
+        """
+        Compares the ontology with a contract ABI.
+
+        Returns:
+            list: The compile problems, plus one problem per available
+            function the ABI does not have.
+        """
+        abi_selectors = {
+            function_selector(fragment_signature(f)) for f in abi if f.get("type") == "function"
+        }
+        problems = list(self.problems)
+        for functions in self.functions.values():
+            for function in functions:
+                if function.available and function.selector not in abi_selectors:
+                    problems.append({"action": function.action, "signature": function.signature,
+                                     "message": f"not a function of {contract_name} (selector {function.selector})"})
+        return problems
+
+    def check(self, abi, contract_name="the contract", strict=False):
+        """
+        Raises OntologyError if a function a transfer runs does not match the
+        ABI (any function when strict is set).
+
+        Returns:
+            list: The remaining problems, i.e. those of the rollback actions.
+        """
+        problems = self.check_abi(abi, contract_name)
+        blocking = [p for p in problems if strict or p["action"] not in ROLLBACK_ACTIONS]
+        if blocking:
+            raise OntologyError(blocking)
+        return problems
+
+
+class _OntologyCache:
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_path):
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == stamp:
+                return entry[1]
+
+        with open(path, "r") as f:
+            compiled = CompiledOntology(json.load(f))
+
+        with self._lock:
+            self._entries[path] = (stamp, compiled)
+        return compiled
+
+
+_default_cache = _OntologyCache()
+
+
+def load_ontology(file_path):
+    """
+    Returns the compiled ontology of a file, compiling it only once (and
+    again if the file changes on disk).
+    """
+    return _default_cache.load(file_path)
+
+
+def find_ontology(ontologies_dir, reference_id):
+    """
+    Returns the compiled ontology with the given id (the referenceId of an
+    asset, e.g. SATP-ERC20-ETHEREUM) from a folder of ontology files.
+    """
+    for file_path in sorted(glob.glob(os.path.join(ontologies_dir, "*.json"))):
+        ontology = load_ontology(file_path)
+        if ontology.id == reference_id:
+            return ontology
+    raise OntologyError([{"action": "-", "signature": reference_id,
+                          "message": f"no ontology with this id in {ontologies_dir}"}])
+
+
+def check_transfer(request, ontologies_dir, artifact_of=contract_artifact, strict=False):
+    """
+    Checks the ontology of both assets of a transact request against the
+    ABI of their contracts, before the request is sent.
+
+    Contracts without a compiled artifact are skipped and reported in the
+    returned warnings.
+
+    Args:
+        request (dict): The transact request.
+        ontologies_dir (str): The ontologies folder of the gateways.
+        artifact_of (callable): Maps a contractName to its artifact file.
+        strict (bool): Also fail on problems of the rollback actions.
+
+    Returns:
+        list: The warnings (one line each).
+    """
+    warnings = []
+    checked = set()
+    for side in ("sourceAsset", "receiverAsset"):
+        asset = request[side]
+        key = (asset["referenceId"], asset["contractName"])
+        if key in checked:
+            continue
+        checked.add(key)
+        ontology = find_ontology(ontologies_dir, asset["referenceId"])
+        artifact = artifact_of(asset["contractName"])
+        if not os.path.exists(artifact):
+            warnings.append(f"{asset['contractName']} is not compiled ({artifact}), {ontology.id} not checked")
+            continue
+        problems = ontology.check(load_artifact(artifact)["abi"], asset["contractName"], strict)
+        warnings.extend(f"{ontology.id} {format_problem(p)}" for p in problems)
+    return warnings
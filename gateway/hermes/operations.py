@@ -0,0 +1,86 @@
+import collections
+
+from hermes.oracle import operation_timestamp
+
+# Number of recent operations an OperationWatcher keeps by default.
+DEFAULT_HISTORY = 100
+
+
+class OperationWatcher:
+    """
+    Follows the "operations" list of a long-running (POLLING or
+    EVENT_LISTENING) oracle task and only surfaces the operations it has not
+    seen yet.
+
+    The watcher remembers how many operations it has seen and the timestamp of
+    the latest one, so each check only processes the new tail of the list
+    instead of comparing the whole history. The response body is still
+    parsed in full, since the status endpoint always returns every
+    operation. If the list ever shrinks (e.g. the gateway restarted or
+    trimmed it), new operations are recognized by their timestamp instead.
+    Only the last history operations are kept in memory.
+
+    The position can be restored from a previous watcher with
+    OperationWatcher(client, task_id, **old_watcher.position()).
+
+    Args:
+        client (GatewayClient): The gateway running the task, used by poll().
+        task_id (str): The task to follow.
+        history (int): Number of recent operations kept in self.recent.
+        last_index (int): Number of operations already seen.
+        last_timestamp (float): Timestamp of the latest operation already seen, in milliseconds.
+    """
+
+    def __init__(self, client, task_id, history=DEFAULT_HISTORY, last_index=0, last_timestamp=None):
+        self.client = client
+        self.task_id = task_id
+        self.last_index = last_index
+        self.last_timestamp = last_timestamp
+        self.seen = last_index
+        self.recent = collections.deque(maxlen=history)
+
+    def position(self):
+        """
+        Returns what the watcher has seen so far, to resume it later.
+
+        Returns:
+            dict: last_index and last_timestamp.
+        """
+        return {"last_index": self.last_index, "last_timestamp": self.last_timestamp}
+
+    def update(self, task_response):
+        """
+        Records a status response of the task and returns its new operations.
+
+        Args:
+            task_response (dict): The JSON response from the status endpoint.
+
+        Returns:
+            list: The operations added since the previous update, oldest first.
+        """
+        operations = task_response.get("operations") or []
+        if len(operations) >= self.last_index:
+            new = operations[self.last_index:]
+        else:
+            new = [
+                op for op in operations
+                if self.last_timestamp is None or (operation_timestamp(op) or 0) > self.last_timestamp
+            ]
+
+        self.last_index = len(operations)
+        for op in new:
+            timestamp = operation_timestamp(op)
+            if timestamp is not None and (self.last_timestamp is None or timestamp > self.last_timestamp):
+                self.last_timestamp = timestamp
+        self.seen += len(new)
+        self.recent.extend(new)
+        return new
+
+    def poll(self):
+        """
+        Fetches the task status and returns its new operations.
+
+        Returns:
+            list: The operations added since the previous check, oldest first.
+        """
+        return self.update(self.client.oracle_status(self.task_id))
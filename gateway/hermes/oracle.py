@@ -0,0 +1,189 @@
+import datetime
+import json
+
+from hermes.artifacts import select_fragments
+
+# Values of the "status" field of an oracle task. Tasks run through the
+# execute endpoint become INACTIVE once their operation finished; registered
+# (POLLING / EVENT_LISTENING) tasks stay ACTIVE until they are unregistered.
+TASK_ACTIVE = "ACTIVE"
+TASK_INACTIVE = "INACTIVE"
+
+# Values of the "status" field of each entry in a task's "operations" list.
+OPERATION_SUCCESS = "SUCCESS"
+OPERATION_FAILED = "FAILED"
+
+
+def task_state(task_response):
+    """
+    Extracts the normalized task status from an oracle execute/status response.
+
+    Args:
+        task_response (dict): The JSON response from the endpoint.
+
+    Returns:
+        str: The upper-cased status, or an empty string if missing.
+    """
+    if not isinstance(task_response, dict):
+        return ""
+    return str(task_response.get("status") or "").upper()
+
+
+def is_task_terminal(task_response):
+    """
+    Tells whether an oracle task will not run any further operations.
+
+    Args:
+        task_response (dict): The JSON response from the execute or status endpoint.
+
+    Returns:
+        bool: True if the task is INACTIVE.
+    """
+    return task_state(task_response) == TASK_INACTIVE
+
+
+def operation_state(task_response, index=-1):
+    """
+    Extracts the normalized status of one operation of an oracle task.
+
+    Args:
+        task_response (dict): The JSON response from the execute or status endpoint.
+        index (int): Position of the operation, the latest one by default.
+
+    Returns:
+        str: The upper-cased status, or an empty string if there is no such operation.
+    """
+    if not isinstance(task_response, dict):
+        return ""
+    operations = task_response.get("operations") or []
+    try:
+        return str(operations[index].get("status") or "").upper()
+    except IndexError:
+        return ""
+
+
+def operation_timestamp(operation):
+    """
+    Returns the time an oracle operation ran, in milliseconds.
+
+    Args:
+        operation (dict): An entry of a task's "operations" list.
+
+    Returns:
+        float: The timestamp, or None if the operation has none (or one
+        that is neither a number nor an ISO 8601 date).
+    """
+    value = operation.get("timestamp") if isinstance(operation, dict) else None
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    # ISO 8601, e.g. "2025-01-01T00:00:00.000Z"
+    try:
+        parsed = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp() * 1000
+
+
+def build_update(network_id, contract_name, method_name, params, **contract):
+    """
+    Builds an oracle/execute request for an UPDATE task.
+
+    Args:
+        network_id (dict): The destination network (id and ledgerType).
+        contract_name (str): The contract (or chaincode) name.
+        method_name (str): The method to invoke.
+        params (list): The method arguments.
+        **contract: Extra destinationContract fields (contractAddress, contractAbi...).
+
+    Returns:
+        dict: The JSON payload to send to the execute endpoint.
+    """
+    return {
+        "destinationNetworkId": network_id,
+        "destinationContract": dict(
+            contract, contractName=contract_name, methodName=method_name, params=list(params)
+        ),
+        "taskType": "UPDATE",
+    }
+
+
+def minimize_contract(contract, event_signature=None):
+    """
+    Returns a copy of a sourceContract/destinationContract entry that only
+    carries what the gateway needs to call an already deployed contract.
+
+    The bytecode is dropped and the ABI is reduced to the entry of methodName
+    and, if given, the event matching event_signature. If either of them has
+    no entry in the ABI, the full ABI is kept rather than sending an empty
+    one. Entries without a contractAddress (i.e. contracts still to be
+    deployed) are returned as is.
+
+    Args:
+        contract (dict): The contract entry of an oracle request.
+        event_signature (str): The listened event, e.g. "UpdatedData(bytes32,string,uint256)".
+
+    Returns:
+        dict: The trimmed contract entry.
+    """
+    if not contract.get("contractAddress"):
+        return contract
+
+    minimal = {k: v for k, v in contract.items() if k != "contractBytecode"}
+    abi = contract.get("contractAbi")
+    if abi:
+        fragments = []
+        wanted = []
+        if contract.get("methodName"):
+            wanted.append((contract["methodName"], "function"))
+        if event_signature:
+            wanted.append((event_signature, "event"))
+        for name, fragment_type in wanted:
+            matches = select_fragments(abi, name, fragment_type)
+            if not matches:
+                # Keep the full ABI, so the gateway reports the unknown name itself
+                return minimal
+            fragments += matches
+        minimal["contractAbi"] = fragments
+    return minimal
+
+
+def payload_size(request):
+    """
+    Returns the size in bytes of a request body, serialized the same way
+    requests serializes the json= argument.
+
+    Args:
+        request (dict): The JSON payload.
+
+    Returns:
+        int: The number of bytes sent on the wire.
+    """
+    return len(json.dumps(request).encode("utf-8"))
+
+
+def minimize_request(request):
+    """
+    Trims the contract entries of an oracle execute/register request.
+
+    The source contract keeps the listened event (listeningOptions.eventSignature)
+    and the method it reads, the destination contract keeps the method it calls.
+
+    Args:
+        request (dict): The full oracle request.
+
+    Returns:
+        tuple: The trimmed request and the number of bytes saved.
+    """
+    event_signature = (request.get("listeningOptions") or {}).get("eventSignature")
+    minimal = dict(request)
+    if "sourceContract" in request:
+        minimal["sourceContract"] = minimize_contract(request["sourceContract"], event_signature)
+    if "destinationContract" in request:
+        minimal["destinationContract"] = minimize_contract(request["destinationContract"])
+    return minimal, payload_size(request) - payload_size(minimal)
@@ -0,0 +1,208 @@
+import glob
+import os
+import re
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from hermes.client import GatewayClient
+from hermes.rpc import JsonRpcClient
+from hermes.wait import wait_until
+
+# Seconds to wait for one component to become ready.
+DEFAULT_READY_TIMEOUT = 120
+# Seconds before a single readiness probe is abandoned.
+PROBE_TIMEOUT = 2
+# Backoff of the readiness probes: start fast, never sleep more than a second.
+PROBE_BACKOFF = {"initial_delay": 0.1, "max_delay": 1.0}
+
+# Names docker compose looks for, in its order of preference.
+COMPOSE_FILE_NAMES = ("docker-compose.yaml", "docker-compose.yml")
+# EVM nodes the gateways reach through host.docker.internal:<port> in their config.
+# Only the rpcApi*Host entries count, so the Fabric peers of a connection
+# profile are not mistaken for Hardhat nodes.
+_NODE_PORT_PATTERN = re.compile(r"\"rpcApi\w*Host\"\s*:\s*\"\w+://host\.docker\.internal:(\d+)")
+# Host side of the "- 4010:4010/tcp # OAPI_PORT" entries of a docker-compose
+# file, quoted or not.
+_OAPI_PORT_PATTERN = re.compile(r"-\s*\"?(\d+):\d+(?:/tcp)?\"?\s*#\s*OAPI_PORT")
+
+
+def evm_node_ready(url):
+    """
+    Returns the chain ID of the node at url; raises while it does not answer.
+    """
+    with JsonRpcClient(url, timeout=PROBE_TIMEOUT) as rpc:
+        return int(rpc.call("eth_chainId"), 16)
+
+
+def gateway_ready(port, host="localhost"):
+    """
+    Returns the integrations of the gateway at host:port; raises while it does not answer.
+    The port is used as is, even during a run with a PORT_OFFSET.
+    """
+    with GatewayClient(port, host, timeout=PROBE_TIMEOUT, port_offset=0) as client:
+        return client.integrations()
+
+
+class Component:
+    """
+    One piece of a case environment: how to start it and how to tell it is up.
+
+    Args:
+        name (str): Name shown in the progress output.
+        probe (callable): Returns once the component serves requests, raises otherwise.
+        start (callable): Starts the component, None if it is started elsewhere.
+        depends_on (tuple): Names of the components that must be ready before starting it.
+        timeout (float): Seconds to wait for the component to become ready.
+    """
+
+    def __init__(self, name, probe, start=None, depends_on=(), timeout=DEFAULT_READY_TIMEOUT):
+        self.name = name
+        self.probe = probe
+        self.start = start
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+
+    def is_ready(self):
+        try:
+            self.probe()
+            return True
+        except Exception:
+            return False
+
+
+def _wait_ready(component):
+    wait_until(component.probe, lambda _: True, component.timeout,
+               description=f"{component.name} ready", **PROBE_BACKOFF)
+
+
+def bring_up(components, on_ready=None):
+    """
+    Starts the components in parallel, each one as soon as the components it
+    depends on answer their readiness probe, and returns when all are ready.
+
+    A component that already answers its probe is not started again, so a
+    half-started environment can be resumed.
+
+    Args:
+        components (list): The Component objects.
+        on_ready (callable): Called with (name, seconds since the start) as each one is ready.
+
+    Returns:
+        dict: Name to seconds elapsed until the component was ready.
+
+    Raises:
+        WaitTimeout: If a component is not ready in time.
+        subprocess.CalledProcessError: If a component fails to start.
+        ValueError: If a dependency is not one of the components.
+    """
+    names = {c.name for c in components}
+    for component in components:
+        missing = set(component.depends_on) - names
+        if missing:
+            raise ValueError(f"{component.name} depends on unknown components: {sorted(missing)}")
+
+    ready = {c.name: threading.Event() for c in components}
+    failed = threading.Event()
+    ready_at = {}
+    t0 = time.monotonic()
+
+    def run(component):
+        for dependency in component.depends_on:
+            while not ready[dependency].wait(0.1):
+                if failed.is_set():
+                    return
+        try:
+            if component.start is not None and not component.is_ready():
+                component.start()
+            _wait_ready(component)
+        except Exception:
+            failed.set()
+            raise
+        ready_at[component.name] = time.monotonic() - t0
+        ready[component.name].set()
+        if on_ready:
+            on_ready(component.name, ready_at[component.name])
+
+    with ThreadPoolExecutor(max_workers=len(components) or 1) as executor:
+        futures = [executor.submit(run, c) for c in components]
+    for future in futures:
+        future.result()
+    return ready_at
+
+
+def hardhat_node(evm_dir, port):
+    """
+    Returns the Component of a Hardhat node listening on port, started in the
+    background from evm_dir (it keeps running after the orchestrator exits).
+    """
+    def start():
+        subprocess.Popen(["npx", "hardhat", "node", "--hostname", "0.0.0.0", "--port", str(port)],
+                         cwd=evm_dir, start_new_session=True)
+
+    url = f"http://localhost:{port}"
+    return Component(f"hardhat:{port}", lambda: evm_node_ready(url), start)
+
+
+def case_node_ports(case_dir):
+    """
+    Returns the ports of the EVM nodes referenced by the gateway config files of a case.
+    """
+    ports = set()
+    for config_file in glob.glob(os.path.join(case_dir, "config", "*.json")):
+        with open(config_file, "r") as f:
+            ports.update(int(p) for p in _NODE_PORT_PATTERN.findall(f.read()))
+    return sorted(ports)
+
+
+def compose_file(case_dir):
+    """
+    Returns the docker-compose file of a case, named docker-compose.yaml or
+    docker-compose.yml.
+    """
+    for name in COMPOSE_FILE_NAMES:
+        path = os.path.join(case_dir, name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"no {' or '.join(COMPOSE_FILE_NAMES)} in {case_dir}")
+
+
+def case_gateway_ports(case_dir):
+    """
+    Returns the host OAPI ports published by the docker-compose file of a case.
+    """
+    with open(compose_file(case_dir), "r") as f:
+        return [int(p) for p in _OAPI_PORT_PATTERN.findall(f.read())]
+
+
+def case_components(case_dir, evm_dir, gateways_wait_for_nodes=True):
+    """
+    Builds the components of a case: its Hardhat nodes and its docker-compose gateways.
+
+    Args:
+        case_dir (str): The case folder (with config/ and a docker-compose file).
+        evm_dir (str): The EVM folder the Hardhat nodes are started from.
+        gateways_wait_for_nodes (bool): Start the gateways only once the nodes
+            are up (the SATP gateways connect to their bridges on startup).
+
+    Returns:
+        list: The Component objects, for bring_up().
+    """
+    nodes = [hardhat_node(evm_dir, port) for port in case_node_ports(case_dir)]
+    compose_up = threading.Lock()
+    started = []
+
+    def start_compose():
+        # Every gateway of the file is started by the same command, run it once
+        with compose_up:
+            if not started:
+                subprocess.run(["docker", "compose", "up", "-d"], cwd=case_dir, check=True)
+                started.append(True)
+
+    depends_on = [n.name for n in nodes] if gateways_wait_for_nodes else []
+    gateways = [
+        Component(f"gateway:{port}", lambda port=port: gateway_ready(port), start_compose, depends_on)
+        for port in case_gateway_ports(case_dir)
+    ]
+    return nodes + gateways
@@ -0,0 +1,187 @@
+import json
+import os
+
+from hermes.abi import arguments_encoder, function_selector
+from hermes.artifacts import fragment_signature, select_fragments
+
+# Fabric chaincode method manifests shipped with the oracle cases.
+CHAINCODES_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "oracle", "chaincodes")
+)
+
+# Contract entries of an oracle request and the network entry each one belongs to.
+_CONTRACT_FIELDS = (("sourceContract", "sourceNetworkId"), ("destinationContract", "destinationNetworkId"))
+
+
+class PreflightError(Exception):
+    """
+    Raised when an oracle request is rejected before it is sent.
+
+    Attributes:
+        problems (list): One line per problem found.
+    """
+
+    def __init__(self, problems):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+
+def load_manifest(name_or_path):
+    """
+    Loads a Fabric chaincode manifest: the parameters of each method and the
+    fields of each event, e.g.
+    {"name": "basic", "methods": {"ReadAsset": ["id"]}, "events": {}}.
+
+    Args:
+        name_or_path (str): A manifest file, or the name of one in CHAINCODES_DIR.
+
+    Returns:
+        dict: The manifest.
+    """
+    path = name_or_path
+    if not os.path.exists(path):
+        path = os.path.join(CHAINCODES_DIR, f"{name_or_path}.json")
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class RequestValidator:
+    """
+    Checks oracle execute/register requests on the client, before they take
+    a gateway round trip and a worker.
+
+    EVM contracts are checked against their contractAbi (or the ABI given for
+    their contractName): the method exists, the number of params matches one
+    of its overloads, and every param ABI-encodes to its type. Fabric
+    contracts are checked against the chaincode manifest given for their
+    contractName: the method exists, the number of params matches, and every
+    param is a string. The listened event must exist and have the
+    filterParams fields in both cases. Contracts without an ABI or manifest
+    are not checked.
+
+    The encoder of each function is compiled once and reused across requests.
+
+    Args:
+        abis (dict): {contractName: ABI} for requests that do not carry one.
+        manifests (dict): {contractName: Fabric chaincode manifest}.
+    """
+
+    def __init__(self, abis=None, manifests=None):
+        self.abis = dict(abis or {})
+        self.manifests = dict(manifests or {})
+        self._encoders = {}
+
+    def _encoder(self, signature, types):
+        encoder = self._encoders.get(signature)
+        if encoder is None:
+            encoder = self._encoders[signature] = arguments_encoder(types)
+        return encoder
+
+    def _check_evm(self, contract, abi, event_signature, filter_params, problems):
+        name = contract["contractName"]
+        calldata = None
+        method = contract.get("methodName")
+        if method:
+            fragments = select_fragments(abi, method, "function")
+            if not fragments:
+                problems.append(f"{name} has no function {method}")
+            elif "params" in contract:
+                params = list(contract["params"])
+                candidates = [f for f in fragments if len(f.get("inputs", [])) == len(params)]
+                if not candidates:
+                    expected = " or ".join(sorted({str(len(f.get("inputs", []))) for f in fragments}))
+                    problems.append(f"{name}.{method} takes {expected} params, got {len(params)}")
+                errors = []
+                for fragment in candidates:
+                    signature = fragment_signature(fragment)
+                    try:
+                        encoder = self._encoder(signature, [i["type"] for i in fragment["inputs"]])
+                    except ValueError:
+                        # Types eth_abi cannot encode are left to the gateway
+                        calldata = ""
+                        break
+                    try:
+                        calldata = function_selector(signature) + encoder(params).hex()
+                        break
+                    except (TypeError, ValueError) as e:
+                        errors.append(f"{name}.{signature}: {e}")
+                if candidates and calldata is None:
+                    problems.extend(errors)
+        if event_signature:
+            events = select_fragments(abi, event_signature, "event")
+            if not events:
+                problems.append(f"{name} has no event {event_signature}")
+            elif filter_params:
+                fields = {i.get("name") for e in events for i in e.get("inputs", [])}
+                missing = [p for p in filter_params if p not in fields]
+                if missing:
+                    problems.append(f"event {event_signature} of {name} has no field {', '.join(missing)}")
+        return calldata or None
+
+    def _check_fabric(self, contract, manifest, event_name, filter_params, problems):
+        name = contract["contractName"]
+        method = contract.get("methodName")
+        methods = manifest.get("methods", {})
+        if method:
+            if method not in methods:
+                problems.append(f"chaincode {name} has no method {method}")
+            elif "params" in contract:
+                params = list(contract["params"])
+                if len(params) != len(methods[method]):
+                    problems.append(f"{name}.{method}({', '.join(methods[method])}) takes "
+                                    f"{len(methods[method])} params, got {len(params)}")
+                problems.extend(f"{name}.{method} param {i} is not a string ({type(p).__name__}), "
+                                f"Fabric arguments are strings"
+                                for i, p in enumerate(params) if not isinstance(p, str))
+        if event_name:
+            events = manifest.get("events", {})
+            if event_name not in events:
+                problems.append(f"chaincode {name} emits no event {event_name}")
+            elif filter_params:
+                missing = [p for p in filter_params if p not in events[event_name]]
+                if missing:
+                    problems.append(f"event {event_name} of {name} has no field {', '.join(missing)}")
+
+    def check(self, request):
+        """
+        Returns the problems of a request and the calldata of its EVM calls.
+
+        Returns:
+            tuple: (list of problems, {contract field: 0x-prefixed calldata}).
+        """
+        problems, calldata = [], {}
+        listening = request.get("listeningOptions") or {}
+        for field, network_field in _CONTRACT_FIELDS:
+            contract = request.get(field)
+            if not contract:
+                continue
+            if not contract.get("contractName"):
+                problems.append(f"{field} has no contractName")
+                continue
+            ledger_type = str((request.get(network_field) or {}).get("ledgerType", "")).upper()
+            # Only the source contract emits the listened event
+            event = listening.get("eventSignature") if field == "sourceContract" else None
+            filter_params = listening.get("filterParams") or []
+            if ledger_type.startswith("FABRIC"):
+                manifest = self.manifests.get(contract["contractName"])
+                if manifest is not None:
+                    self._check_fabric(contract, manifest, event, filter_params, problems)
+            else:
+                abi = contract.get("contractAbi") or self.abis.get(contract["contractName"])
+                if abi:
+                    data = self._check_evm(contract, abi, event, filter_params, problems)
+                    if data:
+                        calldata[field] = data
+        return problems, calldata
+
+    def validate(self, request):
+        """
+        Raises PreflightError if the request would fail on the gateway.
+
+        Returns:
+            dict: {contract field: calldata} of the EVM calls, encoded locally.
+        """
+        problems, calldata = self.check(request)
+        if problems:
+            raise PreflightError(problems)
+        return calldata
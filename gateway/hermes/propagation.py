@@ -0,0 +1,194 @@
+import asyncio
+import json
+import re
+import time
+
+from hermes.operations import OperationWatcher
+from hermes.oracle import OPERATION_SUCCESS, operation_timestamp
+from hermes.stats import summarize
+
+# Seconds between two checks of the listener task while events propagate.
+DEFAULT_POLL_INTERVAL = 0.2
+# Seconds to keep watching for propagations once every event was emitted.
+DEFAULT_DRAIN_TIMEOUT = 30
+
+
+class PropagationTracker:
+    """
+    Matches the events emitted on the source ledger with the writes the
+    listener task performs on the destination.
+
+    Every event carries a marker with a sequence number in its data (see
+    marker()), which the listener copies to the destination write. An
+    emitted sequence number that never shows up in a successful write of the
+    task is a dropped propagation; one that shows up more than once is a
+    duplicate.
+
+    The gateway does not report when the source event was emitted, so
+    latencies are measured from the moment the execute request emitting it
+    was sent. The event is emitted between that moment and the execute
+    response, so the latencies are an upper bound that includes the emit
+    itself (reported apart as emitLatency), and they cannot be negative.
+
+    Args:
+        run_id (str): Identifier of the run, so markers of earlier runs are ignored.
+    """
+
+    def __init__(self, run_id):
+        self.run_id = run_id
+        self._pattern = re.compile(re.escape(f"bench-{run_id}-") + r"(\d+)")
+        self.emitted = {}
+        self.acked = {}
+        self.emit_failed = {}
+        self.observed = {}
+        self.written = {}
+        self.failed_writes = 0
+        self.duplicates = 0
+
+    def marker(self, seq):
+        """
+        Returns the data payload carrying the given sequence number.
+        """
+        return f"bench-{self.run_id}-{seq}"
+
+    def record_emit(self, seq, sent_at, acked_at=None, error=None):
+        """
+        Records that the execute request emitting the source event was sent
+        at sent_at and returned at acked_at, or that emitting it failed.
+        """
+        if error is not None:
+            self.emit_failed[seq] = error
+        else:
+            self.emitted[seq] = sent_at
+            self.acked[seq] = acked_at
+
+    def record_operations(self, operations, observed_at):
+        """
+        Records the new operations of the listener task.
+
+        Args:
+            operations (list): Operations not seen before (see OperationWatcher).
+            observed_at (float): time.time() of the status call that returned them.
+        """
+        for operation in operations:
+            # READ_AND_UPDATE tasks may also log the read of the event
+            if str(operation.get("type") or "UPDATE").upper() != "UPDATE":
+                continue
+            if str(operation.get("status") or OPERATION_SUCCESS).upper() != OPERATION_SUCCESS:
+                self.failed_writes += 1
+                continue
+            match = self._pattern.search(json.dumps(operation))
+            if match is None:
+                continue
+            seq = int(match.group(1))
+            if seq in self.observed:
+                self.duplicates += 1
+                continue
+            self.observed[seq] = observed_at
+            timestamp = operation_timestamp(operation)
+            if timestamp is not None:
+                self.written[seq] = timestamp / 1000
+
+    def pending(self):
+        """
+        Returns the emitted sequence numbers not propagated yet.
+        """
+        return set(self.emitted) - set(self.observed)
+
+    def report(self):
+        """
+        Summarizes the run.
+
+        Returns:
+            dict: Events emitted, propagated, dropped and duplicated, the
+            observed end-to-end latency (execute request sent to destination
+            write visible through the status endpoint, precise to the poll
+            interval), the write latency (to the operation timestamp, when the
+            gateway reports one), the emit latency (execute request sent to
+            its response) and the emitted and propagated rates.
+        """
+        emitted = sorted(self.emitted.values())
+        propagated = [self.observed[s] for s in self.observed if s in self.emitted]
+        span = (max(propagated) - emitted[0]) if emitted and propagated else 0
+        emit_span = emitted[-1] - emitted[0] if len(emitted) > 1 else 0
+        return {
+            "emitted": len(self.emitted),
+            "emitFailed": len(self.emit_failed),
+            "propagated": len(propagated),
+            "dropped": len(self.pending()),
+            "duplicates": self.duplicates,
+            "failedWrites": self.failed_writes,
+            "emittedPerSecond": (len(emitted) - 1) / emit_span if emit_span > 0 else None,
+            "propagatedPerSecond": len(propagated) / span if span > 0 else None,
+            "latency": summarize([self.observed[s] - self.emitted[s] for s in self.observed if s in self.emitted]),
+            "writeLatency": summarize([self.written[s] - self.emitted[s] for s in self.written if s in self.emitted]),
+            "emitLatency": summarize([self.acked[s] - self.emitted[s] for s in self.emitted
+                                      if self.acked[s] is not None]),
+        }
+
+
+async def run_propagation_benchmark(client, task_id, emit_request, count, rate,
+                                    poll_interval=DEFAULT_POLL_INTERVAL, drain_timeout=DEFAULT_DRAIN_TIMEOUT,
+                                    run_id=None):
+    """
+    Emits count source events at the given rate through oracle/execute and
+    watches the listener task until every event propagated or drain_timeout
+    expired.
+
+    Events are emitted on a fixed schedule (open loop): a slow execute call
+    does not delay the next event, so the offered rate stays constant.
+
+    Args:
+        client (AsyncGatewayClient): The gateway running the listener task.
+        task_id (str): The EVENT_LISTENING task to watch.
+        emit_request (callable): Returns the execute request emitting one
+            source event, given the data marker to carry.
+        count (int): Number of events to emit.
+        rate (float): Events per second.
+        poll_interval (float): Seconds between two checks of the task.
+        drain_timeout (float): Seconds to wait for late propagations after the last event.
+        run_id (str): Identifier of the run, defaults to the current time.
+
+    Returns:
+        dict: The report of PropagationTracker.
+    """
+    tracker = PropagationTracker(run_id or str(int(time.time() * 1000)))
+    watcher = OperationWatcher(client, task_id, history=1)
+    # Skip the operations the task ran before this benchmark
+    watcher.update(await client.oracle_status(task_id))
+
+    async def emit(seq):
+        sent_at = time.time()
+        try:
+            await client.oracle_execute(emit_request(tracker.marker(seq)))
+            tracker.record_emit(seq, sent_at, time.time())
+        except Exception as e:
+            tracker.record_emit(seq, sent_at, error=str(e) or type(e).__name__)
+
+    async def emit_all():
+        start = time.perf_counter()
+        emits = []
+        for seq in range(count):
+            delay = start + seq / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            emits.append(asyncio.ensure_future(emit(seq)))
+        await asyncio.gather(*emits)
+
+    emitter = asyncio.ensure_future(emit_all())
+    deadline = None
+    while True:
+        try:
+            response = await client.oracle_status(task_id)
+            tracker.record_operations(watcher.update(response), time.time())
+        except Exception:
+            pass
+        if emitter.done():
+            if deadline is None:
+                deadline = time.perf_counter() + drain_timeout
+            if not tracker.pending() or time.perf_counter() >= deadline:
+                break
+        await asyncio.sleep(poll_interval)
+
+    await emitter
+    return tracker.report()
@@ -0,0 +1,161 @@
+import threading
+from concurrent.futures import Future
+
+from hermes.rpc import JsonRpcError
+
+# Seconds between two eth_blockNumber checks of the shared poll loop.
+DEFAULT_BLOCK_POLL_INTERVAL = 0.5
+
+
+class ReceiptTracker:
+    """
+    Resolves transaction receipts from one shared poll loop that follows new
+    blocks, instead of polling eth_getTransactionReceipt once per hash.
+
+    Each iteration reads eth_blockNumber once. Hashes added since the previous
+    iteration are looked up directly (they may already be mined); after that,
+    only the transaction lists of the new blocks are fetched, and receipts are
+    requested just for the watched hashes they contain. The RPC cost is per
+    block, no matter how many transactions are outstanding.
+
+    Args:
+        rpc (JsonRpcClient): The node to follow.
+        poll_interval (float): Seconds between two checks for a new block.
+    """
+
+    def __init__(self, rpc, poll_interval=DEFAULT_BLOCK_POLL_INTERVAL):
+        self.rpc = rpc
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._unchecked = set()
+        self._last_block = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def watch(self, tx_hash):
+        """
+        Starts tracking a transaction.
+
+        Args:
+            tx_hash (str): The transaction hash.
+
+        Returns:
+            Future: Resolved with the receipt once the transaction is mined.
+        """
+        tx_hash = tx_hash.lower()
+        with self._lock:
+            future = self._pending.get(tx_hash)
+            if future is None:
+                future = self._pending[tx_hash] = Future()
+                self._unchecked.add(tx_hash)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return future
+
+    def wait(self, tx_hash, timeout=None):
+        """
+        Blocks until the transaction is mined and returns its receipt.
+
+        Raises:
+            concurrent.futures.TimeoutError: If it is not mined in time.
+        """
+        return self.watch(tx_hash).result(timeout)
+
+    def forget(self, tx_hash):
+        """
+        Stops tracking a transaction (e.g. one that was replaced).
+        """
+        with self._lock:
+            self._pending.pop(tx_hash.lower(), None)
+            self._unchecked.discard(tx_hash.lower())
+
+    def stop(self):
+        """
+        Stops the poll loop.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._stop.clear()
+
+    def _resolve(self, tx_hashes):
+        """
+        Looks up the receipts of tx_hashes and resolves their futures.
+
+        Returns:
+            set: The hashes that still have no receipt.
+        """
+        tx_hashes = list(tx_hashes)
+        if not tx_hashes:
+            return set()
+        receipts = self.rpc.batch(("eth_getTransactionReceipt", [h]) for h in tx_hashes)
+        unresolved = set()
+        with self._lock:
+            for tx_hash, receipt in zip(tx_hashes, receipts):
+                if isinstance(receipt, dict):
+                    future = self._pending.pop(tx_hash, None)
+                    if future is not None:
+                        future.set_result(receipt)
+                else:
+                    unresolved.add(tx_hash)
+        return unresolved
+
+    def _recheck(self, tx_hashes):
+        # Hashes whose lookup failed are looked up directly again next time,
+        # since the block scan may already be past the block that mined them
+        with self._lock:
+            self._unchecked.update(h for h in tx_hashes if h in self._pending)
+
+    def _poll(self):
+        head = int(self.rpc.call("eth_blockNumber"), 16)
+        with self._lock:
+            unchecked, self._unchecked = self._unchecked, set()
+        # Transactions mined at or before head are found by the direct lookup,
+        # later ones by the block scan of the next iterations
+        try:
+            self._resolve(unchecked)
+        except Exception:
+            self._recheck(unchecked)
+            raise
+
+        if self._last_block is None or head < self._last_block:
+            self._last_block = head
+            return
+        numbers = range(self._last_block + 1, head + 1)
+        blocks = self.rpc.batch(("eth_getBlockByNumber", [hex(n), False]) for n in numbers)
+        with self._lock:
+            watched = set(self._pending)
+        mined = set()
+        last_loaded = self._last_block
+        for number, block in zip(numbers, blocks):
+            if not isinstance(block, dict):
+                # Scan again from the first block that failed to load
+                break
+            mined.update(h.lower() for h in block.get("transactions", []) if isinstance(h, str))
+            last_loaded = number
+        mined &= watched
+        try:
+            unresolved = self._resolve(mined)
+        except Exception:
+            self._recheck(mined)
+            raise
+        self._recheck(unresolved)
+        self._last_block = last_loaded
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self._poll()
+            except (JsonRpcError, OSError, ValueError):
+                # The node may be briefly unavailable; try again on the next tick
+                pass
+            self._stop.wait(self.poll_interval)
@@ -0,0 +1,157 @@
+import itertools
+import threading
+
+import requests
+
+# Number of calls sent in one JSON-RPC batch request. Hardhat accepts much
+# larger batches, but public RPC providers commonly cap them around 1000.
+DEFAULT_BATCH_SIZE = 500
+
+# 4-byte selectors of the read-only calls the scripts batch.
+BALANCE_OF_SELECTOR = "0x70a08231"  # balanceOf(address)
+GET_RETIRED_AMOUNT_SELECTOR = "0xd791399e"  # getRetiredAmount(uint256)
+OWNER_OF_SELECTOR = "0x6352211e"  # ownerOf(uint256)
+
+
+class JsonRpcError(Exception):
+    """
+    Error object returned by the node for one JSON-RPC call (e.g. a revert).
+    """
+
+    def __init__(self, code, message, data=None):
+        super().__init__(f"{message} (code {code})")
+        self.code = code
+        self.message = message
+        self.data = data
+
+
+def encode_word(value):
+    """
+    ABI-encodes a static argument (an address or an unsigned integer) as a
+    32-byte word, without the 0x prefix.
+    """
+    if isinstance(value, str):
+        value = int(value, 16)
+    return format(value, "064x")
+
+
+def encode_call(selector, *args):
+    """
+    Builds the calldata of a function that only takes static arguments.
+
+    Args:
+        selector (str): The 0x-prefixed 4-byte selector.
+        *args: Addresses (hex strings) or unsigned integers.
+
+    Returns:
+        str: The 0x-prefixed calldata.
+    """
+    return selector + "".join(encode_word(arg) for arg in args)
+
+
+def decode_uint(result):
+    """
+    Decodes a uint256 return value, e.g. the result of balanceOf.
+    """
+    return int(result, 16) if result not in (None, "0x") else 0
+
+
+class JsonRpcClient:
+    """
+    Minimal JSON-RPC client that sends many calls in a single HTTP round trip
+    (a JSON-RPC batch), over a keep-alive session. It may be shared between
+    threads (e.g. with a ReceiptTracker); requests are sent one at a time.
+
+    Args:
+        url (str): The node URL (e.g. http://localhost:8545).
+        batch_size (int): Maximum number of calls per batch request.
+        timeout (float): Timeout in seconds of each HTTP request.
+    """
+
+    def __init__(self, url, batch_size=DEFAULT_BATCH_SIZE, timeout=30):
+        self.url = url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update({"Content-Type": "application/json"})
+
+    def close(self):
+        """
+        Closes the underlying session.
+        """
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def call(self, method, params=None):
+        """
+        Sends one JSON-RPC call and returns its result.
+
+        Raises:
+            JsonRpcError: If the node returns an error for the call.
+        """
+        result = self.batch([(method, params or [])])[0]
+        if isinstance(result, JsonRpcError):
+            raise result
+        return result
+
+    def batch(self, calls):
+        """
+        Sends the calls in batches of batch_size and returns their results in
+        order. A call the node rejects does not fail the others: its
+        JsonRpcError is returned in place of its result.
+
+        Args:
+            calls (iterable): (method, params) pairs.
+
+        Returns:
+            list: The result, or the JsonRpcError, of each call.
+
+        Raises:
+            requests.HTTPError: If a batch request itself fails.
+        """
+        calls = list(calls)
+        results = []
+        for offset in range(0, len(calls), self.batch_size):
+            chunk = calls[offset:offset + self.batch_size]
+            with self._lock:
+                payload = [
+                    {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+                    for method, params in chunk
+                ]
+                response = self._session.post(self.url, json=payload, timeout=self.timeout)
+            response.raise_for_status()
+            body = response.json()
+            if isinstance(body, dict):
+                # Some nodes answer a whole batch with a single error object
+                error = body.get("error") or {}
+                raise JsonRpcError(error.get("code"), error.get("message", "invalid batch response"), error.get("data"))
+            # Responses may come back in any order
+            by_id = {entry.get("id"): entry for entry in body}
+            for request in payload:
+                entry = by_id.get(request["id"], {"error": {"code": None, "message": "missing response"}})
+                if "error" in entry:
+                    error = entry["error"]
+                    results.append(JsonRpcError(error.get("code"), error.get("message"), error.get("data")))
+                else:
+                    results.append(entry.get("result"))
+        return results
+
+    def eth_call_batch(self, calls, block="latest"):
+        """
+        Runs read-only contract calls in JSON-RPC batches.
+
+        Args:
+            calls (iterable): (contract address, calldata) pairs.
+            block (str): The block to run the calls against.
+
+        Returns:
+            list: The hex-encoded return data, or the JsonRpcError, of each call.
+        """
+        return self.batch(("eth_call", [{"to": to, "data": data}, block]) for to, data in calls)
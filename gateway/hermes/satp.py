@@ -0,0 +1,86 @@
+# Values of the "status" field returned by the SATP status endpoint once a
+# session will no longer change.
+SESSION_DONE = "DONE"
+SESSION_FAILED_STATUSES = {"FAILED", "INVALID"}
+SESSION_TERMINAL_STATUSES = {SESSION_DONE} | SESSION_FAILED_STATUSES
+
+
+def session_state(status_response):
+    """
+    Extracts the normalized session status from a SATP status response.
+
+    Args:
+        status_response (dict): The JSON response from the status endpoint.
+
+    Returns:
+        str: The upper-cased status, or an empty string if missing.
+    """
+    if not isinstance(status_response, dict):
+        return ""
+    return str(status_response.get("status") or "").upper()
+
+
+def is_session_terminal(status_response):
+    """
+    Tells whether a SATP status response describes a finished session.
+
+    Args:
+        status_response (dict): The JSON response from the status endpoint.
+
+    Returns:
+        bool: True if the session is done, failed or invalid.
+    """
+    return session_state(status_response) in SESSION_TERMINAL_STATUSES
+
+
+def build_asset(asset_id, reference_id, owner, contract_name, contract_address,
+                network_id, token_type, amount, ledger_type="ETHEREUM"):
+    """
+    Builds the sourceAsset/receiverAsset entry of a transact request.
+
+    Args:
+        asset_id (str): The asset identifier.
+        reference_id (str): The ontology reference (e.g. SATP-ERC20-ETHEREUM).
+        owner (str): The address owning the asset.
+        contract_name (str): The token contract name.
+        contract_address (str): The token contract address.
+        network_id (str): The network identifier.
+        token_type (str): The token type (e.g. NONSTANDARD_FUNGIBLE).
+        amount (str): The amount (or token id) to transfer.
+        ledger_type (str): The ledger type of the network.
+
+    Returns:
+        dict: The asset description.
+    """
+    return {
+        "id": asset_id,
+        "referenceId": reference_id,
+        "owner": owner,
+        "contractName": contract_name,
+        "contractAddress": contract_address,
+        "networkId": {
+            "id": network_id,
+            "ledgerType": ledger_type,
+        },
+        "tokenType": token_type,
+        "amount": str(amount),
+    }
+
+
+def build_transfer(source_asset, receiver_asset, context_id="mockContext"):
+    """
+    Builds the JSON body of a transact request.
+
+    Args:
+        source_asset (dict): The asset on the source network.
+        receiver_asset (dict): The asset on the destination network.
+        context_id (str): The context identifier of the transfer.
+
+    Returns:
+        dict: The transact request.
+    """
+    return {
+        "contextID": context_id,
+        "sourceAsset": source_asset,
+        "receiverAsset": receiver_asset,
+    }
@@ -0,0 +1,285 @@
+import asyncio
+import csv
+import glob
+import json
+import os
+import time
+
+from hermes.orchestrator import case_gateway_ports
+from hermes.rpc import OWNER_OF_SELECTOR, JsonRpcClient, encode_call
+from hermes.satp import SESSION_DONE, build_asset, build_transfer, is_session_terminal, session_state
+from hermes.stats import summarize
+from hermes.wait import wait_until_async
+
+FUNGIBLE = "fungible"
+NON_FUNGIBLE = "nonfungible"
+ASSET_KINDS = (FUNGIBLE, NON_FUNGIBLE)
+
+# Ontology file that lets a gateway transfer each kind of asset.
+ONTOLOGY_FILES = {
+    FUNGIBLE: "ontology-satp-erc20-interact-ethereum.json",
+    NON_FUNGIBLE: "ontology-satp-erc721-interact-ethereum.json",
+}
+
+# Token contracts deployed by the EVM scripts of satp/case_1 (fungible) and
+# satp/case_2 (non-fungible), per network, with the owner of the tokens.
+DEFAULT_ASSETS = {
+    FUNGIBLE: {
+        "EthereumLedgerTestNetwork1": {
+            "owner": "0x70997970c51812dc3a010c7d01b50e0d17dc79c8",
+            "contractName": "SATPTokenContract",
+            "contractAddress": "0xe7f1725e7734ce288f8367e1bb143e90bb3f0512",
+        },
+        "EthereumLedgerTestNetwork2": {
+            "owner": "0x9965507D1a55bcC2695C58ba16FB37d819B0A4dc",
+            "contractName": "SATPTokenContract",
+            "contractAddress": "0xbded0d2bf404bdcba897a74e6657f1f12e5c6fb6",
+        },
+    },
+    NON_FUNGIBLE: {
+        "EthereumLedgerTestNetwork1": {
+            "owner": "0x70997970c51812dc3a010c7d01b50e0d17dc79c8",
+            "contractName": "SATPNonFungibleTokenContract",
+            "contractAddress": "0xe7f1725e7734ce288f8367e1bb143e90bb3f0512",
+        },
+        "EthereumLedgerTestNetwork2": {
+            "owner": "0x9965507D1a55bcC2695C58ba16FB37d819B0A4dc",
+            "contractName": "SATPNonFungibleTokenContract",
+            "contractAddress": "0xbded0d2bf404bdcba897a74e6657f1f12e5c6fb6",
+        },
+    },
+}
+
+_REFERENCE_IDS = {FUNGIBLE: "SATP-ERC20-ETHEREUM", NON_FUNGIBLE: "SATP-ERC721-ETHEREUM"}
+_TOKEN_TYPES = {FUNGIBLE: "NONSTANDARD_FUNGIBLE", NON_FUNGIBLE: "NONSTANDARD_NONFUNGIBLE"}
+
+# Columns of the CSV curves, in order.
+CURVE_FIELDS = [
+    "environment", "counterparties", "targetNetworks", "assetKind", "concurrency", "sessions", "succeeded", "failed",
+    "elapsedSeconds", "sessionsPerSecond", "latencyMean", "latencyP50", "latencyP95", "latencyP99", "latencyMax",
+]
+
+
+def load_assets(file_path=None):
+    """
+    Returns the token contracts to transfer, per asset kind and network: the
+    defaults of satp/case_1 and case_2, updated with the entries of file_path
+    ({"fungible": {networkId: {owner, contractName, contractAddress}}, ...}).
+    """
+    assets = {kind: dict(networks) for kind, networks in DEFAULT_ASSETS.items()}
+    if file_path:
+        with open(file_path, "r") as f:
+            for kind, networks in json.load(f).items():
+                assets.setdefault(kind, {}).update(networks)
+    return assets
+
+
+def environment_layout(env_dir):
+    """
+    Reads the source gateway of an environment (a SATP case or a generated
+    topology): the first gateway of its docker-compose file.
+
+    Returns:
+        dict: The OAPI port, network and node URL of the source gateway, the
+        number of its counterparty gateways, the networks they connect to,
+        and the asset kinds the environment has an ontology for.
+    """
+    config_files = sorted(glob.glob(os.path.join(env_dir, "config", "gateway-*-config.json")))
+    if not config_files:
+        raise ValueError(f"{env_dir} has no SATP gateway config")
+    with open(config_files[0], "r") as f:
+        config = json.load(f)
+
+    source_networks = [dlt["id"] for dlt in config["gid"]["connectedDLTs"]]
+    target_networks = sorted({
+        dlt["id"] for peer in config.get("counterPartyGateways", []) for dlt in peer.get("connectedDLTs", [])
+    } - set(source_networks[:1]))
+    ontologies = set(os.listdir(os.path.join(env_dir, "ontologies")))
+    # The gateway reaches its node through host.docker.internal, the host through localhost
+    source_rpc = next((
+        bridge["connectorOptions"].get("rpcApiHttpHost", "").replace("host.docker.internal", "localhost") or None
+        for bridge in config.get("ccConfig", {}).get("bridgeConfig", [])
+        if bridge.get("networkIdentification", {}).get("id") == source_networks[0]
+    ), None)
+    return {
+        "oapiPort": case_gateway_ports(env_dir)[0],
+        "sourceNetwork": source_networks[0],
+        "sourceRpc": source_rpc,
+        "counterparties": len(config.get("counterPartyGateways", [])),
+        "targetNetworks": target_networks,
+        "assetKinds": [kind for kind in ASSET_KINDS if ONTOLOGY_FILES[kind] in ontologies],
+    }
+
+
+def missing_tokens(rpc_url, asset, token_ids):
+    """
+    Returns the token ids of a non-fungible asset that its owner does not
+    hold on the source network (not minted, or already transferred).
+
+    Args:
+        rpc_url (str): The node of the source network.
+        asset (dict): The owner and contractAddress of the asset.
+        token_ids (iterable): The token ids the sessions will move.
+    """
+    token_ids = list(token_ids)
+    with JsonRpcClient(rpc_url) as rpc:
+        results = rpc.eth_call_batch((asset["contractAddress"], encode_call(OWNER_OF_SELECTOR, t)) for t in token_ids)
+    owner = asset["owner"].lower()
+    # ownerOf reverts for a token that was never minted
+    return [t for t, result in zip(token_ids, results)
+            if not isinstance(result, str) or "0x" + result[-40:].lower() != owner]
+
+
+class TransferFactory:
+    """
+    Builds the transact request of each session, cycling over the target
+    networks. Fungible sessions move amount tokens; non-fungible sessions each
+    move the next token id, since one token can only be transferred once.
+
+    Every target network needs a token contract, otherwise the sessions would
+    only reach some of the counterparties and the sweep would not measure
+    what its counterparties column says.
+
+    Args:
+        kind (str): fungible or nonfungible.
+        assets (dict): The token contracts of the kind, per network.
+        source_network (str): The network the assets leave.
+        target_networks (list): The networks the assets are sent to.
+        amount (int): Tokens moved by each fungible session.
+        first_token_id (int): Token id of the first non-fungible session.
+    """
+
+    def __init__(self, kind, assets, source_network, target_networks, amount=1, first_token_id=1001):
+        self.kind = kind
+        self.assets = assets
+        self.source_network = source_network
+        self.targets = list(target_networks)
+        missing = [n for n in [source_network, *self.targets] if n not in assets]
+        if missing or not self.targets:
+            raise ValueError(f"no {kind} token contract for {', '.join(missing) or 'any target network'}")
+        self.amount = amount
+        self.next_token_id = first_token_id
+        self._count = 0
+
+    def _asset(self, network, amount):
+        entry = self.assets[network]
+        return build_asset("ExampleAsset", _REFERENCE_IDS[self.kind], entry["owner"], entry["contractName"],
+                           entry["contractAddress"], network, _TOKEN_TYPES[self.kind], amount)
+
+    def preview(self):
+        """
+        Returns one transact request per target network, without using up
+        token ids, e.g. to check the ontologies before the sweep.
+        """
+        return [build_transfer(self._asset(self.source_network, self.amount), self._asset(target, self.amount))
+                for target in self.targets]
+
+    def upcoming_token_ids(self, count):
+        """
+        Returns the token ids the next count non-fungible sessions will move.
+        """
+        return range(self.next_token_id, self.next_token_id + count)
+
+    def next(self):
+        """
+        Returns (target network, transact request) of the next session.
+        """
+        target = self.targets[self._count % len(self.targets)]
+        self._count += 1
+        if self.kind == NON_FUNGIBLE:
+            amount, self.next_token_id = self.next_token_id, self.next_token_id + 1
+        else:
+            amount = self.amount
+        return target, build_transfer(self._asset(self.source_network, amount), self._asset(target, amount))
+
+
+async def run_session(client, target, request, session_timeout, poll_interval, max_poll_interval):
+    """
+    Runs one transfer end to end on the source gateway and returns its measurement.
+    """
+    start = time.perf_counter()
+    result = {"target": target, "sessionID": None, "ok": False, "latency": None, "error": None}
+    try:
+        response = await client.transact(request)
+        session_id = response.get("sessionID") if isinstance(response, dict) else None
+        if not session_id:
+            raise ValueError(f"transact returned no sessionID: {response}")
+        result["sessionID"] = session_id
+        status = (await wait_until_async(
+            lambda: client.session_status(session_id), is_session_terminal, session_timeout,
+            description=f"session {session_id} terminal state",
+            initial_delay=poll_interval, max_delay=max_poll_interval,
+        )).value
+        result["ok"] = session_state(status) == SESSION_DONE
+        if not result["ok"]:
+            result["error"] = f"final status: {session_state(status)}"
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        result["error"] = str(e)
+    result["latency"] = time.perf_counter() - start
+    return result
+
+
+async def run_point(client, factory, concurrency, sessions, session_timeout=300, poll_interval=0.2,
+                    max_poll_interval=2.0):
+    """
+    Runs sessions transfers, keeping concurrency of them in flight.
+
+    Returns:
+        tuple: (the measurement of every session, elapsed seconds).
+    """
+    results = []
+    launched = [0]
+
+    async def worker():
+        while launched[0] < sessions:
+            launched[0] += 1
+            target, request = factory.next()
+            results.append(await run_session(client, target, request, session_timeout, poll_interval,
+                                             max_poll_interval))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, sessions))))
+    return results, time.perf_counter() - start
+
+
+def curve_point(environment, counterparties, target_networks, kind, concurrency, results, elapsed):
+    """
+    Aggregates the sessions of one point of the sweep into a row of the curves.
+    """
+    latency = summarize([r["latency"] for r in results if r["ok"]])
+    succeeded = latency["count"]
+    return {
+        "environment": environment,
+        "counterparties": counterparties,
+        "targetNetworks": target_networks,
+        "assetKind": kind,
+        "concurrency": concurrency,
+        "sessions": len(results),
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "elapsedSeconds": elapsed,
+        "sessionsPerSecond": succeeded / elapsed if elapsed > 0 else None,
+        "latencyMean": latency["mean"],
+        "latencyP50": latency["p50"],
+        "latencyP95": latency["p95"],
+        "latencyP99": latency["p99"],
+        "latencyMax": latency["max"],
+    }
+
+
+def write_curves(points, prefix, errors=None):
+    """
+    Writes the points of the sweep to <prefix>.csv (one row per point) and
+    <prefix>.json (the points, plus the first errors of each point).
+    """
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{prefix}.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CURVE_FIELDS)
+        writer.writeheader()
+        writer.writerows(points)
+    with open(f"{prefix}.json", "w") as f:
+        json.dump({"points": points, "errors": errors or []}, f, indent=2)
@@ -0,0 +1,45 @@
+import math
+
+
+def percentile(sorted_values, pct):
+    """
+    Returns the pct-th percentile of an already sorted list, interpolating
+    linearly between the closest ranks.
+
+    Args:
+        sorted_values (list): The values, sorted in ascending order.
+        pct (float): The percentile to compute, between 0 and 100.
+
+    Returns:
+        float: The percentile, or None if the list is empty.
+    """
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return sorted_values[int(rank)]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize(latencies):
+    """
+    Summarizes a list of latencies (in seconds).
+
+    Args:
+        latencies (list): The observed latencies.
+
+    Returns:
+        dict: count, mean, min, p50, p95, p99 and max of the latencies.
+    """
+    values = sorted(latencies)
+    return {
+        "count": len(values),
+        "mean": sum(values) / len(values) if values else None,
+        "min": values[0] if values else None,
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": values[-1] if values else None,
+    }
@@ -0,0 +1,153 @@
+import collections
+import json
+import os
+
+from hermes.aio import gather_bounded
+from hermes.client import gateway_label
+from hermes.satp import is_session_terminal, session_state
+
+# State reported for a session a gateway could not answer for (e.g. unknown ID).
+STATE_ERROR = "ERROR"
+
+
+def session_id_list(response):
+    """
+    Extracts the session IDs from a get-sessions-ids response, which is a
+    list of IDs (or an object wrapping it).
+    """
+    if isinstance(response, dict):
+        for value in response.values():
+            if isinstance(value, list):
+                return value
+        return []
+    return list(response or [])
+
+
+class SessionStatusCache:
+    """
+    Remembers the status of sessions that reached a terminal state on a
+    gateway, so sweeps never query them again.
+
+    When file_path is given, the cache is loaded from and saved to that JSON
+    file, so it carries over between runs.
+
+    Args:
+        file_path (str): The JSON file backing the cache, None to keep it in memory.
+    """
+
+    def __init__(self, file_path=None):
+        self.file_path = file_path
+        self._statuses = {}
+        if file_path is not None and os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                self._statuses = json.load(f)
+
+    def __len__(self):
+        return sum(len(statuses) for statuses in self._statuses.values())
+
+    def get(self, session_id, gateway):
+        """
+        Returns the cached terminal status of a session on a gateway, or None.
+        """
+        return self._statuses.get(session_id, {}).get(gateway)
+
+    def put(self, session_id, gateway, status):
+        """
+        Caches a status if it is terminal, and ignores it otherwise.
+
+        Returns:
+            bool: Whether the status was cached.
+        """
+        if not is_session_terminal(status):
+            return False
+        self._statuses.setdefault(session_id, {})[gateway] = status
+        return True
+
+    def save(self):
+        """
+        Writes the cache to its file, if it has one.
+        """
+        if self.file_path is None:
+            return
+        tmp_path = f"{self.file_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._statuses, f)
+        os.replace(tmp_path, self.file_path)
+
+
+async def fetch_session_ids(clients):
+    """
+    Returns the union of the session IDs known by the given gateways, in the
+    order they were first seen.
+
+    Args:
+        clients (list): The AsyncGatewayClient of each gateway.
+
+    Returns:
+        list: The session IDs.
+    """
+    responses = await gather_bounded((client.session_ids() for client in clients), fail_fast=True)
+    session_ids = {}
+    for response in responses:
+        for session_id in session_id_list(response):
+            session_ids.setdefault(session_id, None)
+    return list(session_ids)
+
+
+async def sweep_sessions(clients, session_ids, cache=None):
+    """
+    Fetches the status of every session from every gateway concurrently.
+
+    Parallelism is bounded by the max_concurrency of each client. Statuses
+    found in the cache are reused, and terminal statuses that come back are
+    added to it. A failed call is reported as {"status": "ERROR", "error": ...}
+    for that gateway and does not stop the sweep.
+
+    Args:
+        clients (list): The AsyncGatewayClient of each gateway.
+        session_ids (iterable): The session IDs to check.
+        cache (SessionStatusCache): The terminal statuses already known.
+
+    Returns:
+        dict: {session_id: {gateway: status response}} for every session.
+    """
+    if cache is None:
+        cache = SessionStatusCache()
+
+    results = {}
+    pending = []
+    for session_id in session_ids:
+        results[session_id] = {}
+        for client in clients:
+            gateway = gateway_label(client)
+            cached = cache.get(session_id, gateway)
+            if cached is not None:
+                results[session_id][gateway] = cached
+            else:
+                pending.append((session_id, gateway, client))
+
+    responses = await gather_bounded(client.session_status(session_id) for session_id, _, client in pending)
+    for (session_id, gateway, _), response in zip(pending, responses):
+        if isinstance(response, Exception):
+            response = {"status": STATE_ERROR, "error": str(response)}
+        else:
+            cache.put(session_id, gateway, response)
+        results[session_id][gateway] = response
+    return results
+
+
+def count_states(results):
+    """
+    Counts the sessions in each state, per gateway.
+
+    Args:
+        results (dict): The output of sweep_sessions.
+
+    Returns:
+        dict: {gateway: {state: count}}, states sorted by name.
+    """
+    counts = collections.defaultdict(collections.Counter)
+    for statuses in results.values():
+        for gateway, status in statuses.items():
+            counts[gateway][session_state(status) or "UNKNOWN"] += 1
+    return {gateway: dict(sorted(c.items())) for gateway, c in sorted(counts.items())}
@@ -0,0 +1,265 @@
+import hashlib
+import json
+import os
+import secrets
+import shutil
+
+from eth_keys import keys
+from eth_keys.constants import SECPK1_N
+
+MESH = "mesh"
+RING = "ring"
+HUB = "hub"
+TOPOLOGIES = (MESH, RING, HUB)
+
+DEFAULT_IMAGE = "tomassilva2187/satp-gateway:2026-02-02-1458"
+# Ports every gateway listens on inside its container.
+SERVER_PORT = 3010
+CLIENT_PORT = 3011
+OAPI_PORT = 4010
+# Host ports of gateway i (0-based) are the container ports + i * port_step,
+# so the first two gateways get the ports of the hand-written cases.
+DEFAULT_PORT_STEP = 100
+FIRST_NODE_PORT = 8545
+
+# Default Hardhat accounts. The bridge of network i signs with account i, as
+# in the hand-written cases.
+HARDHAT_ACCOUNTS = [
+    ("0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266", "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"),
+    ("0x70997970C51812dc3A010C7d01b50e0d17dc79C8", "0x59c6995e998f97a5a0044966f0945389dc9e86dae88c7a8412f4603b6b78690d"),
+    ("0x3C44CdDdB6a900fa2b585dd299e03d12FA4293BC", "0x5de4111afa1a4b94908f83103eb1f1706367c2e68ca870fc3fb9a804cdab365a"),
+    ("0x90F79bf6EB2c4f870365E785982E1f101E93b906", "0x7c852118294e51e653712a81e05800f419141751be58f605c371e15141b007a6"),
+    ("0x15d34AAf54267DB7D7c367839AAf71A00a2C6A65", "0x47e179ec197488593b187f80a00eb0da91f1b9d0b13f8733639f19c30a34926a"),
+    ("0x9965507D1a55bcC2695C58ba16FB37d819B0A4dc", "0x8b3a350cf5c34c9194ca85829a2df0ec3153be0318b5e2d3348e872092edffba"),
+    ("0x976EA74026E726554dB657fA54763abd0C3a0aa9", "0x92db14e403b83dfe3df233f83dfa3a0d7096f21ca9b0d6d6b8d88b2b4ec1564e"),
+    ("0x14dC79964da2C08b23698B3D3cc7Ca32193d9955", "0x4bbbf85ce3377467afe5d46f804f221813b2bb87f24d81f60f1fcdbf7cbf4356"),
+    ("0x23618e81E3f5cdF7f54C3d65f7FBc0aBf5B21E8f", "0xdbda1821b80551c9d65939329250298aa3472ba22feea921c0cf5d620ea67b97"),
+    ("0xa0Ee7A142d267C1f36714E4a8F75612F20a79720", "0x2a871d0798f97d79848a013d4936a73bf4cc922c825d33c1cf7073dff6d409c6"),
+]
+
+def public_key(private_key):
+    """
+    Returns the compressed secp256k1 public key (hex) of a private key (hex).
+    """
+    return keys.PrivateKey(bytes.fromhex(private_key)).public_key.to_compressed_bytes().hex()
+
+
+def generate_key_pair(seed=None):
+    """
+    Generates the secp256k1 key pair identifying a gateway.
+
+    Args:
+        seed (str): Derive the key from seed instead of a random value, so the
+            same topology can be generated again.
+
+    Returns:
+        dict: {"privateKey": ..., "publicKey": ...} as in the gateway config.
+    """
+    while True:
+        if seed is None:
+            raw = secrets.token_bytes(32)
+        else:
+            raw = hashlib.sha256(seed.encode()).digest()
+            seed += "+"
+        k = int.from_bytes(raw, "big")
+        if 0 < k < SECPK1_N:
+            break
+    private_key = f"{k:064x}"
+    return {"privateKey": private_key, "publicKey": public_key(private_key)}
+
+
+def counterparties(topology, count):
+    """
+    Returns the 0-based indexes of the counterparty gateways of every gateway.
+
+    - mesh: every gateway with every other one.
+    - ring: every gateway with its two neighbours.
+    - hub: the first gateway with every other one, the others only with it.
+    """
+    if topology == MESH:
+        return [[j for j in range(count) if j != i] for i in range(count)]
+    if topology == RING:
+        return [sorted({(i - 1) % count, (i + 1) % count} - {i}) for i in range(count)]
+    if topology == HUB:
+        return [list(range(1, count))] + [[0] for _ in range(1, count)]
+    raise ValueError(f"unknown topology {topology}, expected one of {TOPOLOGIES}")
+
+
+def network_id(index):
+    return f"EthereumLedgerTestNetwork{index + 1}"
+
+
+def gateway_ports(index, port_step=DEFAULT_PORT_STEP):
+    """
+    Returns the host ports (server, client, OAPI) of the gateway at index.
+    """
+    shift = index * port_step
+    return {"server": SERVER_PORT + shift, "client": CLIENT_PORT + shift, "oapi": OAPI_PORT + shift}
+
+
+def _check_ports(gateways, networks):
+    used = {}
+    for gateway in gateways:
+        for kind, port in gateway["ports"].items():
+            used.setdefault(port, []).append(f"{gateway['name']} {kind}")
+    for network in networks:
+        used.setdefault(network["port"], []).append(network["id"])
+    clashes = {port: owners for port, owners in used.items() if len(owners) > 1}
+    if clashes:
+        raise ValueError(f"port collisions, use another port step: {clashes}")
+
+
+def build_topology(topology, gateway_count, network_count, networks_per_gateway=1,
+                   port_step=DEFAULT_PORT_STEP, seed=None):
+    """
+    Describes N gateways and M EVM networks connected in a topology.
+
+    Gateway i connects to networks_per_gateway networks, starting at network
+    i mod M, so consecutive gateways bridge different networks.
+
+    Args:
+        topology (str): mesh, ring or hub.
+        gateway_count (int): Number of gateways (N).
+        network_count (int): Number of EVM networks (M), one Hardhat node each.
+        networks_per_gateway (int): Networks each gateway has a bridge to.
+        port_step (int): Host port gap between two consecutive gateways.
+        seed (str): Derive the gateway keys from seed (reproducible output).
+
+    Returns:
+        dict: {"topology", "gateways": [...], "networks": [...]}, where each
+        gateway has its name, ports, key pair, networks and counterparties.
+    """
+    if gateway_count < 2:
+        raise ValueError("a topology needs at least 2 gateways")
+    if not 1 <= network_count <= len(HARDHAT_ACCOUNTS):
+        raise ValueError(f"between 1 and {len(HARDHAT_ACCOUNTS)} networks are supported")
+    if not 1 <= networks_per_gateway <= network_count:
+        raise ValueError("networks_per_gateway must be between 1 and the number of networks")
+
+    networks = [{"id": network_id(j), "port": FIRST_NODE_PORT + j, "signer": HARDHAT_ACCOUNTS[j][0]}
+                for j in range(network_count)]
+    peers = counterparties(topology, gateway_count)
+    gateways = []
+    for i in range(gateway_count):
+        gateways.append({
+            "index": i,
+            "name": f"satp-hermes-gateway-{i + 1}",
+            "id": f"mockID-{i + 1}",
+            "proofID": f"mockProofID{10 + i}",
+            "ports": gateway_ports(i, port_step),
+            "keyPair": generate_key_pair(None if seed is None else f"{seed}:{i}"),
+            "networks": sorted((i + k) % network_count for k in range(networks_per_gateway)),
+            "counterparties": peers[i],
+        })
+    _check_ports(gateways, networks)
+    return {"topology": topology, "gateways": gateways, "networks": networks}
+
+
+def _gid(gateway):
+    return {
+        "id": gateway["id"],
+        "name": "CustomGateway",
+        "version": [{"Core": "v02", "Architecture": "v02", "Crash": "v02"}],
+        "connectedDLTs": [{"id": network_id(j), "ledgerType": "ETHEREUM"} for j in gateway["networks"]],
+        "proofID": gateway["proofID"],
+        "address": f"http://{gateway['name']}",
+        "gatewayClientPort": CLIENT_PORT,
+        "gatewayServerPort": SERVER_PORT,
+        "gatewayOapiPort": OAPI_PORT,
+        "identificationCredential": {"signingAlgorithm": "SECP256K1", "pubKey": gateway["keyPair"]["publicKey"]},
+    }
+
+
+def gateway_config(spec, gateway, log_level="TRACE"):
+    """
+    Returns the config.json of one gateway of a topology built by build_topology().
+    """
+    gateways = spec["gateways"]
+    bridges = []
+    for j in gateway["networks"]:
+        signer, secret = HARDHAT_ACCOUNTS[j]
+        bridge = {
+            "networkIdentification": {"id": network_id(j), "ledgerType": "ETHEREUM"},
+            "signingCredential": {"transactionSignerEthAccount": signer, "secret": secret, "type": "PRIVATE_KEY_HEX"},
+            "gasConfig": {"gas": "6721975", "gasPrice": "20000000000"},
+            "connectorOptions": {"rpcApiHttpHost": f"http://host.docker.internal:{spec['networks'][j]['port']}"},
+            "claimFormats": [1],
+        }
+        if len(gateway["networks"]) > 1:
+            # Name the leaves of a gateway bridging several networks, as in satp/case_3
+            bridge["leafId"] = f"leaf{j + 1}"
+        bridges.append(bridge)
+    return {
+        "gid": _gid(gateway),
+        "logLevel": log_level,
+        "counterPartyGateways": [_gid(gateways[j]) for j in gateway["counterparties"]],
+        "environment": "development",
+        "ccConfig": {"bridgeConfig": bridges},
+        "keyPair": gateway["keyPair"],
+        "enableCrashRecovery": False,
+        "ontologyPath": "/opt/cacti/satp-hermes/ontologies",
+    }
+
+
+def compose_file(spec, image=DEFAULT_IMAGE):
+    """
+    Returns the docker-compose.yaml starting every gateway of a topology.
+    """
+    services = []
+    for gateway in spec["gateways"]:
+        name, n, ports = gateway["name"], gateway["index"] + 1, gateway["ports"]
+        services.append(
+            f"  {name}:\n"
+            f"    image: {image}\n"
+            f"    platform: linux/amd64\n"
+            f"    volumes:\n"
+            f"      - ./config/gateway-{n}-config.json:/opt/cacti/satp-hermes/config/config.json\n"
+            f"      - ./satp-hermes-gateway/gateway-{n}/logs:/opt/cacti/satp-hermes/logs\n"
+            f"      - ./ontologies/:/opt/cacti/satp-hermes/ontologies/\n"
+            f"    ports:\n"
+            f"      - {ports['server']}:{SERVER_PORT}/tcp # SERVER_PORT\n"
+            f"      - {ports['client']}:{CLIENT_PORT}/tcp # CLIENT_PORT\n"
+            f"      - {ports['oapi']}:{OAPI_PORT}/tcp # OAPI_PORT\n"
+            f"    extra_hosts:\n"
+            f"      - \"host.docker.internal:host-gateway\"\n"
+        )
+    return "services:\n" + "\n".join(services)
+
+
+def write_topology(spec, out_dir, ontologies_dirs, image=DEFAULT_IMAGE, log_level="TRACE"):
+    """
+    Writes a topology as a case folder: config/gateway-<n>-config.json,
+    docker-compose.yaml, the ontologies of every folder in ontologies_dirs and
+    topology.json, a summary of the gateways (OAPI ports, networks,
+    counterparties) for the benchmarks.
+
+    The folder can be started with start-environment.py like any case.
+    """
+    config_dir = os.path.join(out_dir, "config")
+    os.makedirs(config_dir, exist_ok=True)
+    for gateway in spec["gateways"]:
+        with open(os.path.join(config_dir, f"gateway-{gateway['index'] + 1}-config.json"), "w") as f:
+            json.dump(gateway_config(spec, gateway, log_level), f, indent=2)
+
+    with open(os.path.join(out_dir, "docker-compose.yaml"), "w") as f:
+        f.write(compose_file(spec, image))
+
+    ontologies_out = os.path.join(out_dir, "ontologies")
+    if os.path.exists(ontologies_out):
+        shutil.rmtree(ontologies_out)
+    os.makedirs(ontologies_out)
+    for ontologies_dir in ontologies_dirs:
+        for name in os.listdir(ontologies_dir):
+            shutil.copy(os.path.join(ontologies_dir, name), ontologies_out)
+
+    summary = {
+        "topology": spec["topology"],
+        "networks": spec["networks"],
+        "gateways": [
+            {"name": g["name"], "oapiPort": g["ports"]["oapi"], "networks": [network_id(j) for j in g["networks"]],
+             "counterparties": [spec["gateways"][j]["name"] for j in g["counterparties"]]}
+            for g in spec["gateways"]
+        ],
+    }
+    with open(os.path.join(out_dir, "topology.json"), "w") as f:
+        json.dump(summary, f, indent=2)
@@ -0,0 +1,217 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from hermes.receipts import ReceiptTracker
+from hermes.rpc import JsonRpcError, encode_call
+
+# Default gas limit of the transactions sent by the pipeline (an ERC-20 transfer).
+DEFAULT_GAS = 200000
+# Seconds without a receipt before a transaction is replaced with a higher gas price.
+DEFAULT_REPLACE_AFTER = 30
+# Gas price multiplier of a replacement. Nodes require at least +10%.
+REPLACEMENT_BUMP = 1.125
+# Seconds between two checks for a new block.
+DEFAULT_RECEIPT_POLL_INTERVAL = 0.5
+
+# Outcome of each transaction sent by the pipeline.
+TX_SUCCESS = "SUCCESS"
+TX_REVERTED = "REVERTED"
+TX_TIMEOUT = "TIMEOUT"
+TX_ERROR = "ERROR"
+
+TRANSFER_SELECTOR = "0xa9059cbb"  # transfer(address,uint256)
+
+
+def erc20_transfer(token, recipient, amount):
+    """
+    Builds the transaction transferring amount of an ERC-20 token to recipient.
+    """
+    return {"to": token, "data": encode_call(TRANSFER_SELECTOR, recipient, amount)}
+
+
+def _is_nonce_error(error):
+    message = str(error).lower()
+    return "nonce" in message or "already known" in message
+
+
+class TransactionPipeline:
+    """
+    Sends many transactions from one (unlocked or impersonated) account
+    without waiting for each receipt, then collects the receipts together.
+
+    Nonces are assigned locally, starting from the account's pending
+    transaction count, so every transaction of a batch is sent in the same
+    JSON-RPC round trip. A transaction rejected because of its nonce is sent
+    again once with a freshly read nonce; a transaction still unmined after
+    replace_after seconds is replaced (same nonce, higher gas price). The
+    nonce of a transaction the node rejects for another reason is spent on
+    an empty self-transfer, so it does not block the transactions after it.
+
+    Args:
+        rpc (JsonRpcClient): The node to send the transactions to.
+        sender (str): The account sending the transactions (eth_sendTransaction).
+        gas (int): Gas limit of each transaction.
+        gas_price (int): Gas price in wei, the node's eth_gasPrice by default.
+    """
+
+    def __init__(self, rpc, sender, gas=DEFAULT_GAS, gas_price=None):
+        self.rpc = rpc
+        self.sender = sender
+        self.gas = gas
+        self.gas_price = gas_price
+        self._nonce = None
+        # One entry per transaction, in the order they were sent
+        self.transactions = []
+
+    def sync_nonce(self):
+        """
+        Reads the next nonce of the sender from the node.
+        """
+        self._nonce = int(self.rpc.call("eth_getTransactionCount", [self.sender, "pending"]), 16)
+        return self._nonce
+
+    def _next_nonce(self):
+        if self._nonce is None:
+            self.sync_nonce()
+        nonce = self._nonce
+        self._nonce += 1
+        return nonce
+
+    def _fill(self, tx, nonce, gas_price):
+        return dict(tx, **{"from": self.sender, "nonce": hex(nonce), "gas": hex(tx.get("gas", self.gas)),
+                           "gasPrice": hex(gas_price)})
+
+    def send_all(self, txs):
+        """
+        Sends the transactions back to back, in one JSON-RPC batch.
+
+        Args:
+            txs (iterable): Transactions as {"to": ..., "data": ..., "value": ...}.
+
+        Returns:
+            list: The entries of the sent transactions (see self.transactions).
+        """
+        if self.gas_price is None:
+            self.gas_price = int(self.rpc.call("eth_gasPrice"), 16)
+
+        entries = []
+        for tx in txs:
+            nonce = self._next_nonce()
+            entries.append({
+                "tx": tx, "nonce": nonce, "gasPrice": self.gas_price, "hashes": [], "sentAt": None,
+                "status": None, "receipt": None, "error": None, "replacements": 0,
+            })
+
+        results = self.rpc.batch(("eth_sendTransaction", [self._fill(e["tx"], e["nonce"], e["gasPrice"])]) for e in entries)
+        retry = []
+        for entry, result in zip(entries, results):
+            if isinstance(result, JsonRpcError):
+                if _is_nonce_error(result):
+                    retry.append(entry)
+                else:
+                    entry["status"], entry["error"] = TX_ERROR, str(result)
+            else:
+                entry["hashes"].append(result)
+                entry["sentAt"] = time.time()
+
+        for entry in entries:
+            if entry["status"] == TX_ERROR:
+                self._fill_gap(entry["nonce"])
+
+        if retry:
+            # Another sender used the account in between: take fresh nonces
+            self.sync_nonce()
+            for entry in retry:
+                entry["nonce"] = self._next_nonce()
+                try:
+                    entry["hashes"].append(self.rpc.call("eth_sendTransaction", [self._fill(entry["tx"], entry["nonce"], entry["gasPrice"])]))
+                    entry["sentAt"] = time.time()
+                except JsonRpcError as e:
+                    entry["status"], entry["error"] = TX_ERROR, str(e)
+
+        self.transactions.extend(entries)
+        return entries
+
+    def _fill_gap(self, nonce):
+        # The later transactions of the batch cannot be mined while this nonce
+        # is unused, so spend it on an empty transfer to the sender itself
+        try:
+            self.rpc.call("eth_sendTransaction", [self._fill({"to": self.sender, "value": "0x0"}, nonce, self.gas_price)])
+        except JsonRpcError:
+            pass
+
+    def _replace(self, entry):
+        entry["gasPrice"] = int(entry["gasPrice"] * REPLACEMENT_BUMP) + 1
+        try:
+            entry["hashes"].append(self.rpc.call("eth_sendTransaction", [self._fill(entry["tx"], entry["nonce"], entry["gasPrice"])]))
+            entry["replacements"] += 1
+        except JsonRpcError:
+            # Typically "nonce too low": one of the previous hashes was just mined
+            pass
+        entry["sentAt"] = time.time()
+
+    def wait_all(self, timeout=120, replace_after=DEFAULT_REPLACE_AFTER, poll_interval=DEFAULT_RECEIPT_POLL_INTERVAL,
+                 tracker=None):
+        """
+        Collects the receipts of every pending transaction. All of their
+        hashes (replacements included) are resolved by a ReceiptTracker,
+        which follows new blocks instead of polling each hash.
+
+        Args:
+            timeout (float): Seconds to wait for all receipts.
+            replace_after (float): Seconds without a receipt before a replacement is sent.
+            poll_interval (float): Seconds between two checks for a new block.
+            tracker (ReceiptTracker): A tracker shared with other waiters. By
+                default one is started for this call and stopped afterwards.
+
+        Returns:
+            list: Every transaction entry, with its status (SUCCESS, REVERTED,
+            TIMEOUT or ERROR) and receipt.
+        """
+        own_tracker = tracker is None
+        if own_tracker:
+            tracker = ReceiptTracker(self.rpc, poll_interval)
+        futures = {}
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                pending = [e for e in self.transactions if e["status"] is None]
+                waiting = []
+                for entry in pending:
+                    for tx_hash in entry["hashes"]:
+                        if tx_hash not in futures:
+                            futures[tx_hash] = tracker.watch(tx_hash)
+                        future = futures[tx_hash]
+                        if future.done() and entry["status"] is None:
+                            receipt = entry["receipt"] = future.result()
+                            entry["status"] = TX_SUCCESS if int(receipt.get("status", "0x1"), 16) == 1 else TX_REVERTED
+                        waiting.append(future)
+                    if entry["status"] is not None:
+                        # The other hashes of this nonce will never be mined
+                        for tx_hash in entry["hashes"]:
+                            tracker.forget(tx_hash)
+
+                pending = [e for e in pending if e["status"] is None]
+                if not pending:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    for entry in pending:
+                        entry["status"] = TX_TIMEOUT
+                        for tx_hash in entry["hashes"]:
+                            tracker.forget(tx_hash)
+                    break
+
+                wait([f for f in waiting if not f.done()], timeout=min(remaining, replace_after or remaining),
+                     return_when=FIRST_COMPLETED)
+
+                now = time.time()
+                for entry in pending:
+                    if not any(futures[h].done() for h in entry["hashes"]) and replace_after \
+                            and now - entry["sentAt"] >= replace_after:
+                        self._replace(entry)
+        finally:
+            if own_tracker:
+                tracker.stop()
+
+        return self.transactions
@@ -0,0 +1,188 @@
+import asyncio
+import random
+import time
+from collections import namedtuple
+
+from hermes.oracle import is_task_terminal
+from hermes.satp import is_session_terminal
+
+DEFAULT_TIMEOUT = 60.0
+DEFAULT_INITIAL_DELAY = 0.1
+DEFAULT_MAX_DELAY = 5.0
+DEFAULT_FACTOR = 2.0
+DEFAULT_JITTER = 0.2
+
+# value: the last probe result, elapsed: seconds until it was observed,
+# attempts: number of probes sent.
+WaitResult = namedtuple("WaitResult", ["value", "elapsed", "attempts"])
+
+
+class WaitTimeout(Exception):
+    """
+    Raised when the awaited condition is not reached before the deadline.
+
+    Attributes:
+        last_value: The last successful probe result, if any.
+        last_error: The last exception raised by the probe, if any.
+        elapsed (float): Seconds spent waiting.
+        attempts (int): Number of probes sent.
+    """
+
+    def __init__(self, message, last_value=None, last_error=None, elapsed=0.0, attempts=0):
+        super().__init__(message)
+        self.last_value = last_value
+        self.last_error = last_error
+        self.elapsed = elapsed
+        self.attempts = attempts
+
+
+def backoff_delays(initial_delay=DEFAULT_INITIAL_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                   factor=DEFAULT_FACTOR, jitter=DEFAULT_JITTER):
+    """
+    Yields exponentially growing delays, capped at max_delay, each one
+    randomly stretched or shrunk by up to jitter (a fraction of the delay)
+    so that many concurrent waiters do not poll in lockstep.
+    """
+    delay = initial_delay
+    while True:
+        yield max(0.0, delay * (1 + random.uniform(-jitter, jitter)))
+        delay = min(max_delay, delay * factor)
+
+
+def _timeout_error(description, timeout, last_value, last_error, elapsed, attempts):
+    message = f"{description} not reached after {timeout}s ({attempts} attempts)"
+    if last_error is not None:
+        message += f", last error: {last_error}"
+    return WaitTimeout(message, last_value, last_error, elapsed, attempts)
+
+
+def wait_until(probe, is_done, timeout=DEFAULT_TIMEOUT, retry_errors=True,
+               description="condition", **backoff):
+    """
+    Calls probe() until is_done(result) is true, sleeping with exponential
+    backoff and jitter between calls, and returns as soon as it is.
+
+    Args:
+        probe (callable): Function returning the current state (e.g. a status call).
+        is_done (callable): Predicate telling whether the state is final.
+        timeout (float): Seconds to wait before giving up.
+        retry_errors (bool): Whether exceptions raised by probe are retried.
+        description (str): What is being waited for, used in the timeout message.
+        **backoff: initial_delay, max_delay, factor and jitter of backoff_delays().
+
+    Returns:
+        WaitResult: The final state, the observed completion time and the number of probes.
+
+    Raises:
+        WaitTimeout: If the deadline passes first.
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delays = backoff_delays(**backoff)
+    last_value = last_error = None
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            last_value = probe()
+            last_error = None
+            if is_done(last_value):
+                return WaitResult(last_value, time.monotonic() - start, attempts)
+        except Exception as e:
+            if not retry_errors:
+                raise
+            last_error = e
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise _timeout_error(description, timeout, last_value, last_error,
+                                 time.monotonic() - start, attempts)
+        time.sleep(min(next(delays), remaining))
+
+
+async def wait_until_async(probe, is_done, timeout=DEFAULT_TIMEOUT, retry_errors=True,
+                           description="condition", **backoff):
+    """
+    asyncio version of wait_until(), where probe is a coroutine function.
+
+    Returns:
+        WaitResult: The final state, the observed completion time and the number of probes.
+
+    Raises:
+        WaitTimeout: If the deadline passes first.
+    """
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    delays = backoff_delays(**backoff)
+    last_value = last_error = None
+    attempts = 0
+
+    while True:
+        attempts += 1
+        try:
+            last_value = await probe()
+            last_error = None
+            if is_done(last_value):
+                return WaitResult(last_value, loop.time() - start, attempts)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if not retry_errors:
+                raise
+            last_error = e
+
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            raise _timeout_error(description, timeout, last_value, last_error,
+                                 loop.time() - start, attempts)
+        await asyncio.sleep(min(next(delays), remaining))
+
+
+def wait_for_task(client, task_id, timeout=DEFAULT_TIMEOUT, **backoff):
+    """
+    Waits until an oracle task becomes INACTIVE.
+
+    Args:
+        client (GatewayClient): The gateway running the task.
+        task_id (str): The task ID to check.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        WaitResult: The final task status and the observed completion time.
+    """
+    return wait_until(lambda: client.oracle_status(task_id), is_task_terminal, timeout,
+                      description=f"task {task_id} INACTIVE", **backoff)
+
+
+def wait_for_session(client, session_id, timeout=DEFAULT_TIMEOUT, **backoff):
+    """
+    Waits until a SATP session is DONE, FAILED or INVALID.
+
+    Args:
+        client (GatewayClient): The gateway to ask for the session status.
+        session_id (str): The session ID to check.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        WaitResult: The final session status and the observed completion time.
+    """
+    return wait_until(lambda: client.session_status(session_id), is_session_terminal, timeout,
+                      description=f"session {session_id} terminal state", **backoff)
+
+
+async def wait_for_task_async(client, task_id, timeout=DEFAULT_TIMEOUT, **backoff):
+    """
+    asyncio version of wait_for_task(), for an AsyncGatewayClient.
+    """
+    return await wait_until_async(lambda: client.oracle_status(task_id), is_task_terminal, timeout,
+                                  description=f"task {task_id} INACTIVE", **backoff)
+
+
+async def wait_for_session_async(client, session_id, timeout=DEFAULT_TIMEOUT, **backoff):
+    """
+    asyncio version of wait_for_session(), for an AsyncGatewayClient.
+    """
+    return await wait_until_async(lambda: client.session_status(session_id), is_session_terminal, timeout,
+                                  description=f"session {session_id} terminal state", **backoff)
@@ -1,7 +1,16 @@
 
-import requests
-import json
-from time import sleep
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.artifacts import load_artifact
+from hermes.oracle import minimize_request
+from hermes.wait import wait_for_task
+
+# Send only the contract address and the ABI entries in use, not the bytecode and full ABI
+MINIMAL_PAYLOAD = True
 
 TEST_DATA = "DATA WRITTEN TO THE BLOCKCHAIN"
 DATA_HASH = "0xd2a21947eed980d6266fd60e26f24379032c4fa65ed8c63b323e040ea2b57536"
@@ -17,11 +26,10 @@ def execute_oracle(params):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    if MINIMAL_PAYLOAD:
+        params, saved = minimize_request(params)
+        print(f"Minimal payload: {saved} bytes saved")
+    return get_client(4010).oracle_execute(params)
 
 
 def execute_update(file_path):
@@ -35,8 +43,7 @@ def execute_update(file_path):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    with open(file_path, 'r') as file:
-        params = json.load(file)
+    params = load_artifact(file_path)
 
     req_params = {
         'destinationNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
@@ -64,8 +71,7 @@ def execute_read(file_path):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    with open(file_path, 'r') as file:
-        params = json.load(file)
+    params = load_artifact(file_path)
 
     req_params = {
         'sourceNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
@@ -85,13 +91,13 @@ def execute_read(file_path):
 
 if __name__ == "__main__":
     print(f"First request will write '{TEST_DATA}' to the blockchain...")
-    sleep(5)
 
     update_response = execute_update("../../../EVM/artifacts/contracts/OracleTestContract.sol/OracleTestContract.json")
     print("Response:", update_response)
 
-    print("Waiting for 5 seconds before reading the data...")
-    sleep(5)
+    print("Waiting for the update task to complete before reading the data...")
+    completion = wait_for_task(get_client(4010), update_response["taskID"])
+    print(f"Update task completed after {completion.elapsed:.2f}s")
 
     read_response = execute_read("../../../EVM/artifacts/contracts/OracleTestContract.sol/OracleTestContract.json")
     print("Read Response:", read_response)
\ No newline at end of file
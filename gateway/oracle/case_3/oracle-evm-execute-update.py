@@ -1,7 +1,17 @@
 
-import requests
-import json
 from time import sleep
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.artifacts import load_artifact
+from hermes.oracle import minimize_request
+from hermes.preflight import RequestValidator
+
+# Send only the contract address and the ABI entries in use, not the bytecode and full ABI
+MINIMAL_PAYLOAD = True
 
 TEST_DATA = "DATA WRITTEN TO THE BLOCKCHAIN"
 DATA_HASH = "0xd2a21947eed980d6266fd60e26f24379032c4fa65ed8c63b323e040ea2b57536"
@@ -11,17 +21,21 @@ def execute_oracle(params):
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute endpoint
     with the given params as JSON body.
 
+    Raises PreflightError instead of sending a request whose method or
+    params do not match the contract ABI.
+
     Args:
         params (dict): The JSON payload to send.
 
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    # Check methodName and params against the full ABI, before it is trimmed
+    RequestValidator().validate(params)
+    if MINIMAL_PAYLOAD:
+        params, saved = minimize_request(params)
+        print(f"Minimal payload: {saved} bytes saved")
+    return get_client(4010).oracle_execute(params)
 
 
 def execute_update(file_path):
@@ -35,8 +49,7 @@ def execute_update(file_path):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    with open(file_path, 'r') as file:
-        params = json.load(file)
+    params = load_artifact(file_path)
 
     req_params = {
         'destinationNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
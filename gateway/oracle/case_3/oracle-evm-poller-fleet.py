@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.artifacts import load_artifact
+from hermes.fleet import PollingFleet
+from hermes.oracle import minimize_request
+
+DATA_HASH = "0xd2a21947eed980d6266fd60e26f24379032c4fa65ed8c63b323e040ea2b57536"
+
+
+def poller_request(interval):
+    """
+    Builds the register request of one polling getData task, the same task
+    oracle-evm-register-poller.py registers.
+
+    Args:
+        interval (int): The polling interval in milliseconds.
+
+    Returns:
+        dict: The minimal JSON payload to send to the register endpoint.
+    """
+    params = load_artifact()
+
+    req_params = {
+        'sourceNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
+        'sourceContract': {
+            "contractAbi": params["abi"],
+            "contractName": params["contractName"],
+            "contractBytecode": params["bytecode"],
+            "contractAddress": "0x5FbDB2315678afecb367f032d93F642f64180aa3",
+            "methodName": "getData",
+            "params": [DATA_HASH]
+        },
+        'taskMode': 'POLLING',
+        'pollingInterval': interval,
+        'taskType': 'READ'
+    }
+
+    return minimize_request(req_params)[0]
+
+
+async def run(args):
+    async with AsyncGatewayClient(4010, max_concurrency=args.concurrency) as client:
+        fleet = PollingFleet(client, args.state)
+
+        if args.command == "up":
+            request = poller_request(args.interval)
+            desired = {f"poller-{i}": request for i in range(args.count)}
+            outcome = await fleet.reconcile(desired)
+        elif args.command == "down":
+            outcome = await fleet.reconcile({})
+        elif args.command == "status":
+            active = await fleet.active_keys()
+            return {"tracked": len(fleet.tasks), "active": len(active)}
+        else:
+            return await fleet.drift()
+
+    return {name: len(keys) for name, keys in outcome.items()}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Registers and tracks a fleet of polling tasks on the gateway.")
+    parser.add_argument("--state", default="poller-fleet.json", help="file keeping the task IDs of the fleet")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="gateway calls in flight")
+    commands = parser.add_subparsers(dest="command", required=True)
+    up = commands.add_parser("up", help="register tasks until COUNT are active (unregisters the extra ones)")
+    up.add_argument("count", type=int)
+    up.add_argument("--interval", type=int, default=5000, help="polling interval in milliseconds")
+    commands.add_parser("down", help="unregister every task of the fleet")
+    commands.add_parser("status", help="count the tasks of the fleet that are still active")
+    commands.add_parser("drift", help="measure the actual interval between operations against the configured one")
+    args = parser.parse_args()
+
+    print("Response:", json.dumps(asyncio.run(run(args)), indent=2))
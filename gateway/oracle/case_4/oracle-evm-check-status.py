@@ -1,9 +1,13 @@
 
-import requests
 import json
 from time import sleep
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+
 def get_status_oracle(params):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute endpoint
@@ -15,11 +19,7 @@ def get_status_oracle(params):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/status"
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_status(params['taskID'])
 
 
 def get_status(task_id):
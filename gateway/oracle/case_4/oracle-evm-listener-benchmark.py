@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.artifacts import load_artifact
+from hermes.oracle import minimize_request
+from hermes.propagation import DEFAULT_DRAIN_TIMEOUT, DEFAULT_POLL_INTERVAL, run_propagation_benchmark
+
+SOURCE_CONTRACT_ADDRESS = "0x5FbDB2315678afecb367f032d93F642f64180aa3"
+DESTINATION_CONTRACT_ADDRESS = "0xbded0d2bf404bdcba897a74e6657f1f12e5c6fb6"
+
+
+def listener_request():
+    """
+    Builds the register request of the UpdatedData listener, the same task
+    oracle-evm-register-listener.py registers.
+
+    Returns:
+        dict: The minimal JSON payload to send to the register endpoint.
+    """
+    params = load_artifact()
+
+    req_params = {
+        'sourceNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
+        'sourceContract': {
+            "contractName": params["contractName"],
+            "contractAbi": params["abi"],
+            "contractAddress": SOURCE_CONTRACT_ADDRESS,
+        },
+        'destinationNetworkId': { 'id': 'HardhatTestNetwork2', 'ledgerType': 'ETHEREUM' },
+        'destinationContract': {
+            "contractAbi": params["abi"],
+            "contractName": params["contractName"],
+            "contractAddress": DESTINATION_CONTRACT_ADDRESS,
+            "methodName": "setData",
+        },
+        'listeningOptions': {
+            "eventSignature": "UpdatedData(bytes32,string,uint256)",
+            "filterParams": ["data"],
+        },
+        'taskMode': 'EVENT_LISTENING',
+        'taskType': 'READ_AND_UPDATE'
+    }
+
+    return minimize_request(req_params)[0]
+
+
+def emit_request(data):
+    """
+    Builds the execute request calling setData(data) on the source contract,
+    which emits UpdatedData with the next nonce.
+
+    Args:
+        data (str): The data to write, carrying the benchmark marker.
+
+    Returns:
+        dict: The minimal JSON payload to send to the execute endpoint.
+    """
+    params = load_artifact()
+
+    req_params = {
+        'destinationNetworkId': { 'id': 'HardhatTestNetwork1', 'ledgerType': 'ETHEREUM' },
+        'destinationContract': {
+            "contractAbi": params["abi"],
+            "contractName": params["contractName"],
+            "contractAddress": SOURCE_CONTRACT_ADDRESS,
+            "methodName": "setData",
+            "params": [data]
+        },
+        'taskType': 'UPDATE'
+    }
+
+    return minimize_request(req_params)[0]
+
+
+async def run(args):
+    async with AsyncGatewayClient(4010, max_concurrency=args.concurrency, timeout=args.request_timeout) as client:
+        task_id = args.task_id
+        if task_id is None:
+            task_id = (await client.oracle_register(listener_request()))["taskID"]
+            print(f"Listener registered with Task ID: {task_id}")
+
+        reports = []
+        try:
+            for rate in args.rate:
+                print(f"Emitting {args.count} UpdatedData events at {rate}/s...")
+                report = await run_propagation_benchmark(
+                    client, task_id, emit_request, args.count, rate,
+                    poll_interval=args.poll_interval, drain_timeout=args.drain_timeout,
+                )
+                reports.append(dict(report, rate=rate))
+        finally:
+            if args.task_id is None:
+                await client.oracle_unregister(task_id)
+                print(f"Listener {task_id} unregistered")
+
+    return {"taskID": task_id, "runs": reports}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the time from an UpdatedData event on Blockchain 1 to the setData write on Blockchain 2."
+    )
+    parser.add_argument("--rate", type=float, nargs="+", default=[1.0],
+                        help="events per second; several values run one after the other")
+    parser.add_argument("-n", "--count", type=int, default=50, help="events emitted per rate")
+    parser.add_argument("--task-id", help="use this listener task instead of registering (and unregistering) one")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between two checks of the listener task")
+    parser.add_argument("--drain-timeout", type=float, default=DEFAULT_DRAIN_TIMEOUT,
+                        help="seconds to wait for late propagations after the last event")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="gateway calls in flight")
+    parser.add_argument("--request-timeout", type=float, default=120, help="timeout of each gateway call in seconds")
+    parser.add_argument("-o", "--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    print(json.dumps(result, indent=2))
@@ -1,28 +1,39 @@
 #!/usr/bin/env python3
-import requests
 import json
-from time import sleep
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.preflight import PreflightError, RequestValidator, load_manifest
+from hermes.wait import WaitTimeout, wait_until
 
 # Configuration
 FABRIC_NETWORK_ID = {"id": "FabricLedgerTestNetwork", "ledgerType": "FABRIC_2"}
 CONTRACT_NAME = "basic"
 
-def execute_oracle(params):
+# Rejects requests that do not match the chaincode methods before they reach the gateway
+VALIDATOR = RequestValidator(manifests={CONTRACT_NAME: load_manifest(CONTRACT_NAME)})
+
+def execute_oracle(params, preflight=True):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute endpoint
     with the given params as JSON body.
 
+    The request is first checked against the chaincode manifest, and a
+    PreflightError is raised instead of sending an invalid request.
+
     Args:
         params (dict): The JSON payload to send.
+        preflight (bool): Whether to check the request before sending it.
 
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    if preflight:
+        VALIDATOR.validate(params)
+    return get_client(4010).oracle_execute(params)
 
 
 def get_task_status(task_id):
@@ -36,18 +47,14 @@ def get_task_status(task_id):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/status"
-    params = {"taskID": task_id}
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_status(task_id)
 
 
-def invalid_function():
+def invalid_function(preflight=True):
     """
     Calling a function that does not exist.
-    Should fail gracefully.
+    Should be rejected before sending, or fail gracefully on the gateway
+    when preflight is False.
     """
     req_params = {
         'destinationNetworkId': FABRIC_NETWORK_ID,
@@ -59,7 +66,7 @@ def invalid_function():
         'taskType': 'UPDATE'
     }
     
-    return execute_oracle(req_params)
+    return execute_oracle(req_params, preflight)
 
 
 def create_asset(asset_id, color, size, owner, value):
@@ -206,18 +213,44 @@ def delete_asset(asset_id):
     return execute_oracle(req_params)
 
 
+def read_asset_until(asset_id, predicate, timeout=30):
+    """
+    Reads an asset from Fabric until its data satisfies the given predicate.
+
+    Args:
+        asset_id (str): The asset ID to read.
+        predicate (callable): Receives the decoded asset data, returns True when done.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        WaitResult: The last read response and the observed completion time.
+    """
+    def is_done(response):
+        operation = response['operations'][0]
+        return operation['status'] == 'SUCCESS' and predicate(json.loads(operation['output']['output']))
+
+    return wait_until(lambda: read_asset(asset_id), is_done, timeout, description=f"asset {asset_id} update")
+
+
 if __name__ == "__main__":
-    print("\nCalling invalid function (should fail)")
+    print("\nCalling invalid function (should be rejected before sending)")
     try:
-        invalid_response = invalid_function()
+        invalid_function()
+        print("ERROR: the request was sent")
+    except PreflightError as e:
+        print(f"Request rejected as expected: {e}")
+    except Exception as e:
+        print(f"ERROR: {e}")
+
+    print("\nCalling invalid function on the gateway (should fail)")
+    try:
+        invalid_response = invalid_function(preflight=False)
         print("Response:", json.dumps(invalid_response, indent=2))
         assert invalid_response['operations'][0]['status'] == 'FAILED', "Should have failed"
         print("Function call failed as expected")
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     print("\nCreating asset 'asset999'")
     try:
         create_response = create_asset('asset999', 'purple', '25', 'TestUser', '1000')
@@ -233,8 +266,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     print("\nReading asset 'asset999'")
     try:
         read_response = read_asset('asset999')
@@ -250,8 +281,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     #Get all assets
     print("\nReading all assets")
     try:
@@ -267,8 +296,6 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     #Update the asset
     print("\nUpdating asset 'asset999'")
     try:
@@ -278,17 +305,11 @@ if __name__ == "__main__":
         print("Asset updated")
         
         # Verify the update
-        sleep(1)
-        verify_response = read_asset('asset999')
-        verify_data = json.loads(verify_response['operations'][0]['output']['output'])
-        assert verify_data['Color'] == 'gold', "Color should be updated"
-        assert verify_data['Owner'] == 'NewOwner', "Owner should be updated"
-        print("Update verified")
+        verified = read_asset_until('asset999', lambda data: data['Color'] == 'gold' and data['Owner'] == 'NewOwner')
+        print(f"Update verified after {verified.elapsed:.2f}s")
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     #Transfer the asset
     print("\nTransferring asset 'asset999' to 'FinalOwner'")
     try:
@@ -298,16 +319,11 @@ if __name__ == "__main__":
         print("Asset transferred")
         
         # Verify the transfer
-        sleep(1)
-        verify_response = read_asset('asset999')
-        verify_data = json.loads(verify_response['operations'][0]['output']['output'])
-        assert verify_data['Owner'] == 'FinalOwner', "Owner should be transferred"
-        print("Transfer verified")
+        verified = read_asset_until('asset999', lambda data: data['Owner'] == 'FinalOwner')
+        print(f"Transfer verified after {verified.elapsed:.2f}s")
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     #Delete the asset
     print("\nDeleting asset 'asset999'")
     try:
@@ -317,16 +333,16 @@ if __name__ == "__main__":
         print("Asset deleted")
         
         # Verify deletion
-        sleep(1)
         try:
-            verify_response = read_asset('asset999')
-            if verify_response['operations'][0]['status'] == 'FAILED':
-                print("Deletion verified: Asset not found")
+            wait_until(lambda: read_asset('asset999'),
+                       lambda response: response['operations'][0]['status'] == 'FAILED',
+                       timeout=30, retry_errors=False, description="asset asset999 deletion")
+            print("Deletion verified: Asset not found")
+        except WaitTimeout as e:
+            print(f"ERROR: {e}")
         except Exception as e:
             print(f"Deletion verified: Asset not found - {e}")
     except Exception as e:
         print(f"ERROR: {e}")
     
-    sleep(2)
-    
     print("\nCOMPLETED")
\ No newline at end of file
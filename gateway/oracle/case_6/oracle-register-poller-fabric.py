@@ -1,9 +1,14 @@
 #!/usr/bin/env python3
-import requests
 import json
-from time import sleep
-import sys
 import time
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.operations import OperationWatcher
+from hermes.wait import wait_until
 
 # Configuration
 FABRIC_NETWORK_ID = {"id": "FabricLedgerTestNetwork", "ledgerType": "FABRIC_2"}
@@ -20,11 +25,7 @@ def execute_oracle(params):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_execute(params)
 
 
 def register_oracle(params):
@@ -38,11 +39,7 @@ def register_oracle(params):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/register"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_register(params)
 
 
 def unregister_oracle(task_id):
@@ -56,12 +53,7 @@ def unregister_oracle(task_id):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/unregister"
-    params = {"taskID": task_id}
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_unregister(task_id)
 
 
 def get_task_status(task_id):
@@ -75,12 +67,37 @@ def get_task_status(task_id):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/status"
-    params = {"taskID": task_id}
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).oracle_status(task_id)
+
+
+def wait_for_operations(task_id, count, timeout):
+    """
+    Polls the task status until the polling task ran at least the given
+    number of operations, printing each operation once as it shows up.
+
+    Args:
+        task_id (str): The task ID to check.
+        count (int): The number of operations to wait for.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        OperationWatcher: The watcher, with the operations seen in watcher.recent.
+    """
+    watcher = OperationWatcher(get_client(4010), task_id)
+
+    def poll():
+        new = watcher.poll()
+        for idx, operation in enumerate(new, start=watcher.seen - len(new) + 1):
+            print(f"  Operation {idx}: {operation.get('status')} ({operation.get('type')})")
+
+    result = wait_until(
+        poll,
+        lambda _: watcher.seen >= count,
+        timeout,
+        description=f"{count} operations of task {task_id}",
+    )
+    print(f"{count} operations observed after {result.elapsed:.2f}s")
+    return watcher
 
 
 def polling_update_fabric():
@@ -106,7 +123,6 @@ def polling_update_fabric():
     create_response = execute_oracle(create_params)
     assert create_response['operations'][0]['status'] == 'SUCCESS', "Initial asset creation should succeed"
     print("Initial asset created")
-    sleep(2)
     
     # Register a polling task that UPDATES the asset periodically
     
@@ -129,8 +145,8 @@ def polling_update_fabric():
     task_id = register_response['taskID']
     print(f"\nTask registered with ID: {task_id}")
     
-    print("\nWaiting 23 seconds for multiple polling cycles")
-    sleep(23)
+    print("\nWaiting for multiple polling cycles")
+    wait_for_operations(task_id, 3, timeout=30)
     
     print("\nUnregistering polling task")
     unregister_response = unregister_oracle(task_id)
@@ -185,8 +201,8 @@ def polling_read_fabric():
     task_id = register_response['taskID']
     print(f"\nPolling READ task registered with ID: {task_id}")
     
-    print("\nWaiting 18 seconds for multiple polling cycles")
-    sleep(18)
+    print("\nWaiting for multiple polling cycles")
+    wait_for_operations(task_id, 2, timeout=25)
     
     print("\nUnregistering polling task")
     unregister_response = unregister_oracle(task_id)
@@ -245,7 +261,6 @@ def polling_specific_read_fabric():
     create_response = execute_oracle(create_params)
     assert create_response['operations'][0]['status'] == 'SUCCESS', "Asset creation should succeed"
     print("Asset created successfully")
-    sleep(2)
     
     # Register polling task to read this specific asset
     print(f"\nRegistering polling task to read '{asset_id}' every 5 seconds")
@@ -268,8 +283,8 @@ def polling_specific_read_fabric():
     task_id = register_response['taskID']
     print(f"\nTask registered with ID: {task_id}")
     
-    print("\nWaiting 13 seconds for polling cycles")
-    sleep(13)
+    print("\nWaiting for polling cycles")
+    wait_for_operations(task_id, 2, timeout=20)
     
     print("\nUnregistering polling task")
     unregister_oracle(task_id)
@@ -305,11 +320,9 @@ if __name__ == "__main__":
     try:
         #Polling UPDATE
         polling_update_fabric()
-        sleep(2)
         
         #Polling READ (all assets)
         polling_read_fabric()
-        sleep(2)
 
         #Polling READ (specific asset)
         polling_specific_read_fabric()
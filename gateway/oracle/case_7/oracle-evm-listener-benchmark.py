@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.oracle import build_update
+from hermes.preflight import PreflightError, RequestValidator, load_manifest
+from hermes.propagation import DEFAULT_DRAIN_TIMEOUT, DEFAULT_POLL_INTERVAL, run_propagation_benchmark
+
+# Configuration
+FABRIC_NETWORK_ID = {"id": "FabricLedgerTestNetwork", "ledgerType": "FABRIC_2"}
+CONTRACT_NAME = "counter"
+
+# Rejects requests that do not match the chaincode methods before they reach the gateway
+VALIDATOR = RequestValidator(manifests={CONTRACT_NAME: load_manifest(CONTRACT_NAME)})
+
+
+def listener_request():
+    """
+    Builds the register request of the WriteData listener, the same task
+    oracle-evm-register-listener.py registers.
+
+    Returns:
+        dict: The JSON payload to send to the register endpoint.
+    """
+    return {
+        'sourceNetworkId': FABRIC_NETWORK_ID,
+        'sourceContract': {
+            'contractName': CONTRACT_NAME,
+        },
+        'destinationNetworkId': FABRIC_NETWORK_ID,
+        'destinationContract': {
+            'contractName': CONTRACT_NAME,
+            'methodName': 'WriteDataNoEvent',
+        },
+        'listeningOptions': {
+            "eventSignature": "WriteData",
+            "filterParams": ["data"],
+        },
+        'taskType': 'READ_AND_UPDATE',
+        'taskMode': 'EVENT_LISTENING',
+    }
+
+
+def emit_request(data):
+    """
+    Builds the execute request calling WriteData(data, data), which emits a
+    WriteData event.
+
+    Args:
+        data (str): The data to write, carrying the benchmark marker (also used as key).
+
+    Returns:
+        dict: The JSON payload to send to the execute endpoint.
+    """
+    return build_update(FABRIC_NETWORK_ID, CONTRACT_NAME, 'WriteData', [data, data])
+
+
+async def run(args):
+    # Every emitted event uses the same method, so checking one request covers the run
+    VALIDATOR.validate(emit_request("preflight"))
+    if args.task_id is None:
+        VALIDATOR.validate(listener_request())
+
+    async with AsyncGatewayClient(4010, max_concurrency=args.concurrency, timeout=args.request_timeout) as client:
+        task_id = args.task_id
+        if task_id is None:
+            task_id = (await client.oracle_register(listener_request()))["taskID"]
+            print(f"Listener registered with Task ID: {task_id}")
+
+        reports = []
+        try:
+            for rate in args.rate:
+                print(f"Emitting {args.count} WriteData events at {rate}/s...")
+                report = await run_propagation_benchmark(
+                    client, task_id, emit_request, args.count, rate,
+                    poll_interval=args.poll_interval, drain_timeout=args.drain_timeout,
+                )
+                reports.append(dict(report, rate=rate))
+        finally:
+            if args.task_id is None:
+                await client.oracle_unregister(task_id)
+                print(f"Listener {task_id} unregistered")
+
+    return {"taskID": task_id, "runs": reports}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measures the time from a WriteData event to the WriteDataNoEvent write on Fabric."
+    )
+    parser.add_argument("--rate", type=float, nargs="+", default=[1.0],
+                        help="events per second; several values run one after the other")
+    parser.add_argument("-n", "--count", type=int, default=50, help="events emitted per rate")
+    parser.add_argument("--task-id", help="use this listener task instead of registering (and unregistering) one")
+    parser.add_argument("--poll-interval", type=float, default=DEFAULT_POLL_INTERVAL,
+                        help="seconds between two checks of the listener task")
+    parser.add_argument("--drain-timeout", type=float, default=DEFAULT_DRAIN_TIMEOUT,
+                        help="seconds to wait for late propagations after the last event")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="gateway calls in flight")
+    parser.add_argument("--request-timeout", type=float, default=120, help="timeout of each gateway call in seconds")
+    parser.add_argument("-o", "--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args))
+    except PreflightError as e:
+        print(f"Request rejected before sending: {e}")
+        sys.exit(1)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    print(json.dumps(result, indent=2))
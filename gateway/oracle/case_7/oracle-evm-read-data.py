@@ -1,26 +1,36 @@
 import requests
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.preflight import PreflightError, RequestValidator, load_manifest
 
 # Configuration
 FABRIC_NETWORK_ID = {"id": "FabricLedgerTestNetwork", "ledgerType": "FABRIC_2"}
 CONTRACT_NAME = "counter"
 
+# Rejects requests that do not match the chaincode methods before they reach the gateway
+VALIDATOR = RequestValidator(manifests={CONTRACT_NAME: load_manifest(CONTRACT_NAME)})
+
 def execute_oracle(params):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute endpoint
     with the given params as JSON body.
 
+    The request is first checked against the chaincode manifest, and a
+    PreflightError is raised instead of sending an invalid request.
+
     Args:
         params (dict): The JSON payload to send.
 
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/oracle/execute"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    VALIDATOR.validate(params)
+    return get_client(4010).oracle_execute(params)
 
 
 def read_data(key):
@@ -63,4 +73,7 @@ if __name__ == "__main__":
     except requests.exceptions.HTTPError as e:
         print(f"Error reading data: {e}")
         print(f"Response: {e.response.text}")
+        sys.exit(1)
+    except PreflightError as e:
+        print(f"Error reading data: the request was rejected before sending: {e}")
         sys.exit(1)
\ No newline at end of file
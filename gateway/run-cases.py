@@ -0,0 +1,102 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hermes.isolation import (
+    DEFAULT_OFFSET_STEP, case_endpoints, case_suffix, check_offset, render_case, rendered_cases, stop_case,
+)
+
+GATEWAY_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.join(GATEWAY_DIR, "..")
+
+TARGET_PATTERN = re.compile(r"^run-(oracle|satp)-case-(\d+)$")
+
+
+def case_of(target):
+    """
+    Returns the case folder (relative to gateway/) run by a Makefile target.
+
+    Args:
+        target (str): The Makefile target, e.g. run-satp-case-1.
+
+    Returns:
+        str: The case folder, e.g. satp/case_1.
+    """
+    match = TARGET_PATTERN.match(target)
+    if match is None:
+        raise ValueError(f"not a case target: {target}")
+    return f"{match.group(1)}/case_{match.group(2)}"
+
+
+def start_run(target, offset):
+    """
+    Renders an isolated copy of the case of target on ports shifted by offset
+    and starts its Makefile target against it, logging to run.log in the copy.
+
+    Returns:
+        dict: The target, offset, copy folder, endpoints, process and start time.
+    """
+    run_dir = render_case(os.path.join(GATEWAY_DIR, case_of(target)), offset)
+    log = open(os.path.join(run_dir, "run.log"), "w")
+    process = subprocess.Popen(
+        ["make", target, f"PORT_OFFSET={offset}", f"CASE_SUFFIX={case_suffix(offset)}"],
+        cwd=REPO_DIR, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return {"target": target, "offset": offset, "runDir": run_dir, "endpoints": case_endpoints(run_dir),
+            "process": process, "log": log, "startedAt": time.monotonic()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run several cases side by side, each one on its own ports, from an "
+                    "isolated copy of its folder (gateway/<case>-offset<N>).")
+    parser.add_argument("targets", nargs="*", help="Makefile case targets, e.g. run-oracle-case-1 run-satp-case-1")
+    parser.add_argument("--offset-step", type=int, default=DEFAULT_OFFSET_STEP,
+                        help="port offset between two runs (the first run uses one step)")
+    parser.add_argument("--keep", action="store_true",
+                        help="leave the gateways and nodes of the runs running afterwards")
+    parser.add_argument("--clean", action="store_true",
+                        help="stop the gateways and nodes of every isolated copy left by earlier runs, and exit")
+    args = parser.parse_args()
+
+    if args.clean:
+        for run_dir in rendered_cases(GATEWAY_DIR):
+            print(f"Stopping {os.path.relpath(run_dir, GATEWAY_DIR)}")
+            stop_case(run_dir)
+        sys.exit(0)
+    if not args.targets:
+        parser.error("no case targets given")
+
+    # Check every run before starting any, so a bad target or offset does not leave half a suite running
+    for i, target in enumerate(args.targets, start=1):
+        try:
+            check_offset(os.path.join(GATEWAY_DIR, case_of(target)), i * args.offset_step)
+        except ValueError as e:
+            parser.error(f"{target}: {e}")
+
+    runs = []
+    for i, target in enumerate(args.targets, start=1):
+        run = start_run(target, i * args.offset_step)
+        runs.append(run)
+        print(f"{target}: ports +{run['offset']}, gateways {', '.join(run['endpoints']['gateways'])}, "
+              f"nodes {', '.join(run['endpoints']['nodes'])}, log {os.path.join(run['runDir'], 'run.log')}")
+
+    failed = 0
+    for run in runs:
+        code = run["process"].wait()
+        run["log"].close()
+        elapsed = time.monotonic() - run["startedAt"]
+        print(f"{run['target']}: {'OK' if code == 0 else f'FAILED (exit {code})'} after {elapsed:.1f}s")
+        failed += code != 0
+
+    if not args.keep:
+        for run in runs:
+            stop_case(run["runDir"])
+        print("Stopped the gateways and nodes of every run; the copied folders keep their outputs and logs.")
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,148 @@
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.isolation import stop_case
+from hermes.ontology import OntologyError, check_transfer
+from hermes.orchestrator import bring_up, case_components
+from hermes.rpc import JsonRpcError
+from hermes.scaling import (
+    ASSET_KINDS,
+    NON_FUNGIBLE,
+    TransferFactory,
+    curve_point,
+    environment_layout,
+    load_assets,
+    missing_tokens,
+    run_point,
+    write_curves,
+)
+from hermes.wait import WaitTimeout
+
+GATEWAY_DIR = os.path.dirname(os.path.abspath(__file__))
+EVM_DIR = os.path.join(GATEWAY_DIR, "..", "EVM")
+
+
+async def sweep_environment(name, env_dir, assets, args, points, errors):
+    """
+    Runs every (asset kind, concurrency) point of the sweep on one environment.
+    """
+    layout = environment_layout(env_dir)
+    kinds = [kind for kind in args.assets if kind in layout["assetKinds"]]
+    if not kinds:
+        print(f"{name}: no ontology for {', '.join(args.assets)}, skipped")
+        return
+    if layout["counterparties"] > len(layout["targetNetworks"]):
+        print(f"{name}: warning: {layout['counterparties']} counterparties share "
+              f"{len(layout['targetNetworks'])} target networks, the gateway picks which one serves each session")
+
+    # The ports in the case folder are already the host ports
+    async with AsyncGatewayClient(layout["oapiPort"], max_concurrency=max(args.concurrency) * 2,
+                                  timeout=args.request_timeout, port_offset=0) as client:
+        for kind in kinds:
+            try:
+                factory = TransferFactory(kind, assets[kind], layout["sourceNetwork"], layout["targetNetworks"],
+                                          args.amount, args.first_token_id)
+            except ValueError as e:
+                print(f"{name}: {e}, skipped")
+                continue
+            try:
+                warnings = [w for request in factory.preview()
+                            for w in check_transfer(request, os.path.join(env_dir, "ontologies"))]
+            except OntologyError as e:
+                print(f"{name}: {kind} ontology does not match its contract ({e}), skipped")
+                continue
+            for warning in dict.fromkeys(warnings):
+                print(f"{name}: warning: {warning}")
+            for concurrency in args.concurrency:
+                if kind == NON_FUNGIBLE:
+                    token_ids = factory.upcoming_token_ids(args.sessions)
+                    if layout["sourceRpc"] is None:
+                        print(f"{name}: no node URL for {layout['sourceNetwork']} to check the tokens, "
+                              f"{kind} skipped")
+                        break
+                    try:
+                        missing = missing_tokens(layout["sourceRpc"], assets[kind][layout["sourceNetwork"]],
+                                                 token_ids)
+                    except (JsonRpcError, OSError) as e:
+                        print(f"{name}: cannot check the tokens on {layout['sourceRpc']} ({e}), {kind} skipped")
+                        break
+                    if missing:
+                        print(f"{name} {kind} c={concurrency}: the owner does not hold {len(missing)} of token ids "
+                              f"{token_ids.start}-{token_ids.stop - 1} (first: {missing[0]}), mint them first; "
+                              f"skipped")
+                        continue
+                results, elapsed = await run_point(client, factory, concurrency, args.sessions,
+                                                   args.session_timeout, args.poll_interval, args.max_poll_interval)
+                point = curve_point(name, layout["counterparties"], len(layout["targetNetworks"]), kind,
+                                    concurrency, results, elapsed)
+                points.append(point)
+                errors.extend([dict(r, environment=name, assetKind=kind, concurrency=concurrency)
+                               for r in results if not r["ok"]][:5])
+                rate = point["sessionsPerSecond"] or 0
+                p50 = point["latencyP50"]
+                print(f"{name} counterparties={layout['counterparties']} {kind} c={concurrency}: "
+                      f"{point['succeeded']}/{point['sessions']} ok, {rate:.2f} sessions/s, "
+                      f"p50 {'-' if p50 is None else f'{p50:.2f}s'}")
+            if kind == NON_FUNGIBLE:
+                # Tokens already moved cannot be transferred again by the next environment
+                args.first_token_id = factory.next_token_id
+
+
+async def main(args):
+    assets = load_assets(args.assets_file)
+    points, errors = [], []
+    for environment in args.environments:
+        env_dir = os.path.join(GATEWAY_DIR, environment)
+        if args.start:
+            bring_up(case_components(env_dir, EVM_DIR))
+        try:
+            await sweep_environment(environment, env_dir, assets, args, points, errors)
+        finally:
+            if args.start:
+                stop_case(env_dir)
+    return points, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sweep SATP throughput and latency over the number of counterparty gateways "
+                    "(one environment per count), the number of concurrent sessions and the asset "
+                    "kind, and write the curves as CSV and JSON.")
+    parser.add_argument("environments", nargs="+",
+                        help="case or topology folders relative to gateway/, e.g. satp/case_1 "
+                             "satp/generated/hub-3gw-3net")
+    parser.add_argument("--assets", nargs="+", choices=ASSET_KINDS, default=list(ASSET_KINDS),
+                        help="asset kinds to transfer (only those the environment has an ontology for)")
+    parser.add_argument("-c", "--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16],
+                        help="numbers of sessions kept in flight")
+    parser.add_argument("-n", "--sessions", type=int, default=20, help="sessions per point of the sweep")
+    parser.add_argument("--amount", type=int, default=1, help="tokens moved by each fungible session")
+    parser.add_argument("--first-token-id", type=int, default=1001,
+                        help="token id of the first non-fungible session; each session uses the next id")
+    parser.add_argument("--assets-file",
+                        help="JSON with the token contracts of other networks: "
+                             "{\"fungible\": {networkId: {owner, contractName, contractAddress}}, ...}")
+    parser.add_argument("--start", action="store_true",
+                        help="start each environment before its sweep and stop it afterwards")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="seconds before the first status poll")
+    parser.add_argument("--max-poll-interval", type=float, default=2.0, help="upper bound of the backoff between status polls")
+    parser.add_argument("--session-timeout", type=float, default=300, help="seconds before a session is counted as failed")
+    parser.add_argument("--request-timeout", type=float, default=120, help="timeout of each gateway call in seconds")
+    parser.add_argument("-o", "--output", default="satp-scaling",
+                        help="path prefix of the curves (<output>.csv and <output>.json)")
+    args = parser.parse_args()
+
+    try:
+        points, errors = asyncio.run(main(args))
+    except (WaitTimeout, subprocess.CalledProcessError) as e:
+        print("Error:", e)
+        sys.exit(1)
+
+    write_curves(points, args.output, errors)
+    print(f"Wrote {len(points)} points to {args.output}.csv and {args.output}.json")
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.sweep import SessionStatusCache, count_states, fetch_session_ids, sweep_sessions
+
+GATEWAY_PORTS = [4010, 4110]
+
+
+async def sweep(args):
+    """
+    Fetches the status of every SATP session (or of the given ones) from both
+    gateways, skipping the sessions already cached in a terminal state.
+
+    Args:
+        args (argparse.Namespace): The sweep options.
+
+    Returns:
+        dict: {session_id: {gateway: status response}} for every session.
+    """
+    cache = SessionStatusCache(None if args.no_cache else args.cache)
+    clients = [AsyncGatewayClient(port, max_concurrency=args.concurrency) for port in GATEWAY_PORTS]
+    try:
+        session_ids = args.session_ids or await fetch_session_ids(clients)
+        print(f"Checking {len(session_ids)} sessions ({len(cache)} terminal statuses cached)...")
+        results = await sweep_sessions(clients, session_ids, cache)
+    finally:
+        for client in clients:
+            await client.close()
+    cache.save()
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Checks the status of many SATP sessions on both gateways.")
+    parser.add_argument("session_ids", nargs="*", help="sessions to check (default: every session known by the gateways)")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="status calls in flight per gateway")
+    parser.add_argument("--cache", default="session-status-cache.json", help="file caching the terminal statuses")
+    parser.add_argument("--no-cache", action="store_true", help="query every session, without reading or writing the cache")
+    parser.add_argument("-o", "--output", help="also write every status to this JSON file")
+    args = parser.parse_args()
+
+    results = asyncio.run(sweep(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print("Sessions per state:", json.dumps(count_states(results), indent=2))
@@ -1,7 +1,12 @@
 
-import requests
 import json
 from time import sleep
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
 
 def get_all_session_ids():
     """
@@ -14,11 +19,7 @@ def get_all_session_ids():
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/get-sessions-ids"
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4010).session_ids()
 
 if __name__ == "__main__":
     response = get_all_session_ids()
@@ -1,28 +1,38 @@
-
-import requests
+import argparse
+import asyncio
 import json
-from time import sleep, time
+from time import time
 import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.aio import AsyncGatewayClient
+from hermes.audit import (
+    DEFAULT_AUDIT_CONCURRENCY, DEFAULT_CHECKPOINT_OVERLAP_MS, load_checkpoint, save_checkpoint, session_digest,
+    session_key, stream_audit,
+)
+from hermes.client import gateway_label
 
-def call_audit_endpoint(params):
+CHECKPOINTS_FILE = "audits/checkpoints.json"
+
+def call_audit_endpoint(params, port=4010):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/audit endpoint
     with the given params as JSON body.
 
     Args:
         params (dict): The JSON payload to send with the task ID.
+        port (int): The OAPI port of the gateway.
 
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/audit"
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(port).audit(params['startTimestamp'], params['endTimestamp'])
 
 
-def perform_audit(current_time):
+def perform_audit(current_time, port=4010):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/audit endpoint
     with the given file as JSON body.
@@ -39,20 +49,91 @@ def perform_audit(current_time):
         'endTimestamp': current_time,
     }
 
-    return call_audit_endpoint(req_params)
+    return call_audit_endpoint(req_params, port)
+
+
+async def export_audit(current_time, file_path, args):
+    """
+    Streams the audit of the sessions up to current_time into file_path, one
+    session per line, fetching the range in time windows.
+
+    Unless args.full is set, only the range since the last checkpoint of the
+    gateway (minus args.overlap_minutes) is fetched, and the sessions the
+    previous run already exported are skipped unless they changed since. The
+    checkpoint is only moved forward once the whole range is exported.
+
+    Args:
+        current_time (int): End of the audited range, in milliseconds.
+        file_path (str): The newline-delimited JSON file to write.
+        args (argparse.Namespace): The audit options.
+
+    Returns:
+        dict: The range start and the number of windows, sessions and duplicates.
+    """
+    overlap_ms = int(args.overlap_minutes * 60 * 1000)
+    # Sessions near current_time may show up again in the overlap of the next run.
+    # Windows are handed over newest first, so the first copy of a session is the one exported.
+    recent = {}
+
+    def on_window(window_start, window_end, sessions):
+        if window_end >= current_time - overlap_ms:
+            for s in sessions:
+                recent.setdefault(session_key(s), session_digest(s))
+
+    async with AsyncGatewayClient(args.port) as client:
+        # Keyed on the port the client really uses, PORT_OFFSET included
+        gateway = gateway_label(client)
+        checkpoint = None if args.full else load_checkpoint(CHECKPOINTS_FILE, gateway)
+        start = 0
+        previous = {}
+        if checkpoint is not None:
+            start = max(0, checkpoint["endTimestamp"] - overlap_ms)
+            previous = checkpoint["recentSessions"]
+
+        with open(file_path, "w") as f:
+            stats = await stream_audit(
+                client, f, start, current_time,
+                window_ms=int(args.window_minutes * 60 * 1000), concurrency=args.concurrency,
+                on_window=on_window, previous=previous,
+            )
+
+    save_checkpoint(CHECKPOINTS_FILE, gateway, current_time, recent)
+    stats["start"] = start
+    return stats
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exports the audit of every SATP session of the gateway.")
+    parser.add_argument("--window-minutes", type=float, default=60,
+                        help="size of the most recent audit window, older windows grow geometrically")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_AUDIT_CONCURRENCY,
+                        help="number of windows fetched at the same time")
+    parser.add_argument("--port", type=int, default=4010, help="OAPI port of the gateway to audit")
+    parser.add_argument("--full", action="store_true",
+                        help="ignore the checkpoint and export the whole history")
+    parser.add_argument("--overlap-minutes", type=float, default=DEFAULT_CHECKPOINT_OVERLAP_MS / 60000,
+                        help="how far before the checkpoint an incremental audit starts")
+    parser.add_argument("--single-shot", action="store_true",
+                        help="fetch the whole range in one call and write a single indented JSON file")
+    args = parser.parse_args()
+
     current_time = int(time() * 1000)  # Current time in milliseconds
     print(f"Performing audit at {current_time}...")
-    sleep(5)
-
-    response = perform_audit(current_time)
 
     if not os.path.exists("audits"):
         os.makedirs("audits")
 
-    with open(f"audits/audit-{current_time}.json", "w") as f:
-        response["sessions"] = [json.loads(s) if isinstance(s, str) else s for s in response["sessions"]]
-        json.dump(response, f, indent=2)
+    if args.single_shot:
+        response = perform_audit(current_time, args.port)
+
+        with open(f"audits/audit-{current_time}.json", "w") as f:
+            response["sessions"] = [json.loads(s) if isinstance(s, str) else s for s in response["sessions"]]
+            json.dump(response, f, indent=2)
 
-    print(f"Audit response saved to audits/audit-{current_time}.json")
\ No newline at end of file
+        print(f"Audit response saved to audits/audit-{current_time}.json")
+    else:
+        file_path = f"audits/audit-{current_time}.ndjson"
+        stats = asyncio.run(export_audit(current_time, file_path, args))
+        print(
+            f"Exported {stats['sessions']} sessions since {stats['start']} from {stats['windows']} windows "
+            f"to {file_path} ({stats['duplicates']} duplicates or unchanged sessions skipped)"
+        )
@@ -1,7 +1,12 @@
 
-import requests
 import json
 from time import sleep
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
 
 def execute_get_approve_address(params, port):
     """
@@ -14,11 +19,7 @@ def execute_get_approve_address(params, port):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = f"http://localhost:{port}/api/v1/@hyperledger/cactus-plugin-satp-hermes/approve-address"
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(port).approve_address(params['networkId.id'], params['networkId.ledgerType'], params['tokenType'])
 
 
 def get_approve_address_source_chain():
@@ -1,22 +1,31 @@
-import requests
 import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.ontology import check_transfer
+
+ONTOLOGIES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ontologies")
 
 def execute_transact(params):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/transact endpoint
     with the given params as JSON body.
 
+    The ontologies of both assets are first checked against the ABI of
+    their contracts, so a mismatch fails here instead of mid-session.
+
     Args:
         params (dict): The JSON payload to send.
 
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = f"http://localhost:4010/api/v1/@hyperledger/cactus-plugin-satp-hermes/transact"
-    headers = {"Content-Type": "application/json"}
-    response = requests.post(url, json=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    for warning in check_transfer(params, ONTOLOGIES_DIR):
+        print(f"Warning: {warning}", file=sys.stderr)
+    return get_client(4010).transact(params)
 
 
 def transact():
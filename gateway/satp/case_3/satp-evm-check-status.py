@@ -1,9 +1,14 @@
 
-import requests
 import json
 from time import sleep
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes import get_client
+from hermes.wait import WaitTimeout, wait_for_session
+
 def get_satp_session_status(params):
     """
     Calls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/status endpoint
@@ -15,11 +20,7 @@ def get_satp_session_status(params):
     Returns:
         dict: The JSON response from the endpoint.
     """
-    url = "http://localhost:4110/api/v1/@hyperledger/cactus-plugin-satp-hermes/status"
-    headers = {"Content-Type": "application/json"}
-    response = requests.get(url, params=params, headers=headers)
-    response.raise_for_status()
-    return response.json()
+    return get_client(4110).session_status(params['SessionID'])
 
 
 def get_status(session_id):
@@ -40,12 +41,36 @@ def get_status(session_id):
 
     return get_satp_session_status(req_params)
 
+def wait_status(session_id, timeout):
+    """
+    Polls the /api/v1/@hyperledger/cactus-plugin-satp-hermes/status endpoint
+    with exponential backoff until the session is DONE, FAILED or INVALID.
+
+    Args:
+        session_id (str): The session ID to check.
+        timeout (float): Seconds to wait before giving up.
+
+    Returns:
+        WaitResult: The final status and the observed completion time.
+    """
+    return wait_for_session(get_client(4110), session_id, timeout=timeout)
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python satp-evm-check-status.py <SessionID>")
+    if len(sys.argv) not in (2, 4) or (len(sys.argv) == 4 and sys.argv[2] != "--wait"):
+        print("Usage: python satp-evm-check-status.py <SessionID> [--wait <Seconds>]")
         sys.exit(1)
 
     session_id = sys.argv[1]
 
-    response = get_status(session_id)
-    print("Response:", response)
\ No newline at end of file
+    if len(sys.argv) == 4:
+        try:
+            result = wait_status(session_id, float(sys.argv[3]))
+        except WaitTimeout as e:
+            print(f"ERROR: {e}")
+            print("Response:", e.last_value)
+            sys.exit(1)
+        print(f"Session reached a terminal state after {result.elapsed:.2f}s ({result.attempts} checks)")
+        print("Response:", result.value)
+    else:
+        response = get_status(session_id)
+        print("Response:", response)
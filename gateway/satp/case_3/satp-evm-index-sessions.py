@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.audit import DEFAULT_AUDIT_CONCURRENCY
+from hermes.index import SessionIndex
+
+GATEWAY_PORTS = [4010, 4110]
+
+
+async def sync(index, args):
+    """
+    Brings the session index up to date with both gateways: the status of
+    every session not yet indexed in a terminal state and, unless
+    args.no_audit is set, the audit since the last indexed one.
+
+    Args:
+        index (SessionIndex): The index to update.
+        args (argparse.Namespace): The sync options.
+    """
+    clients = [AsyncGatewayClient(port, max_concurrency=args.concurrency) for port in GATEWAY_PORTS]
+    try:
+        calls = await index.sync_statuses(clients)
+        print(f"Indexed {calls} session statuses ({len(index)} rows)")
+        if not args.no_audit:
+            for client in clients:
+                stats = await index.sync_audit(client, window_ms=int(args.window_minutes * 60 * 1000),
+                                               concurrency=args.audit_concurrency, full=args.full)
+                print(f"Indexed {stats['sessions']} audit sessions of {client.host}:{client.port} "
+                      f"since {stats['start']} from {stats['windows']} windows")
+    finally:
+        for client in clients:
+            await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keeps a local SQLite index of the SATP sessions of both gateways and queries it.")
+    parser.add_argument("--db", default="sessions.db", help="SQLite file of the index")
+    parser.add_argument("--no-sync", action="store_true", help="only query the index, without calling the gateways")
+    parser.add_argument("--no-audit", action="store_true", help="index the statuses only, without the audit")
+    parser.add_argument("--full", action="store_true", help="index the whole audit history again")
+    parser.add_argument("-c", "--concurrency", type=int, default=50, help="status calls in flight per gateway")
+    parser.add_argument("--window-minutes", type=float, default=60, help="size of the most recent audit window")
+    parser.add_argument("--audit-concurrency", type=int, default=DEFAULT_AUDIT_CONCURRENCY,
+                        help="number of audit windows fetched at the same time")
+    parser.add_argument("--status", nargs="+", help="only sessions in these states, e.g. FAILED INVALID")
+    parser.add_argument("--source", help="only sessions from this network, e.g. EthereumLedgerTestNetwork1")
+    parser.add_argument("--destination", help="only sessions to this network")
+    parser.add_argument("--owner", help="only sessions of this asset owner")
+    parser.add_argument("--since-minutes", type=float, help="only sessions started in the last N minutes")
+    parser.add_argument("--limit", type=int, help="maximum number of sessions listed")
+    parser.add_argument("-o", "--output", help="write the matching sessions to this JSON file")
+    args = parser.parse_args()
+
+    with SessionIndex(args.db) as index:
+        if not args.no_sync:
+            asyncio.run(sync(index, args))
+
+        filters = (args.status, args.source, args.destination, args.owner, args.since_minutes)
+        if all(f is None for f in filters):
+            print("Sessions per state:", json.dumps(index.count_states(), indent=2))
+            sys.exit(0)
+
+        since = None
+        if args.since_minutes is not None:
+            since = int((time.time() - args.since_minutes * 60) * 1000)
+        start = time.perf_counter()
+        sessions = index.query(status=args.status, source_network=args.source, destination_network=args.destination,
+                               owner=args.owner, since=since, limit=args.limit)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for session in sessions:
+        print(f"{session['session_id']} {session['gateway']} {session['status']} "
+              f"{session['source_network']} -> {session['destination_network']} "
+              f"{session['amount'] or '-'} {session['started_at'] or '-'}")
+    print(f"{len(sessions)} sessions in {elapsed_ms:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(sessions, f, indent=2)
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from hermes.aio import AsyncGatewayClient
+from hermes.satp import SESSION_DONE, build_asset, build_transfer, is_session_terminal, session_state
+from hermes.stats import summarize
+from hermes.wait import wait_until_async
+
+# Owner and SATPTokenContract address on each network, as used by satp-transact.py
+NETWORKS = {
+    1: {
+        "id": "EthereumLedgerTestNetwork1",
+        "owner": "0x70997970C51812dc3A010C7d01b50e0d17dc79C8",
+        "contractAddress": "0xe7f1725e7734ce288f8367e1bb143e90bb3f0512",
+    },
+    2: {
+        "id": "EthereumLedgerTestNetwork2",
+        "owner": "0x9965507D1a55bcC2695C58ba16FB37d819B0A4dc",
+        "contractAddress": "0xbded0d2bf404bdcba897a74e6657f1f12e5c6fb6",
+    },
+    3: {
+        "id": "EthereumLedgerTestNetwork3",
+        "owner": "0xa0Ee7A142d267C1f36714E4a8F75612F20a79720",
+        "contractAddress": "0x95bd8d42f30351685e96c62eddc0d0613bf9a87a",
+    },
+}
+
+# Chain pairs of the triangle, keyed by the step number used by satp-transact.py
+PAIRS = {
+    1: (1, 2),
+    2: (2, 3),
+    3: (3, 1),
+}
+
+GATEWAY_PORTS = [4010, 4110]
+
+
+def pair_label(step):
+    source, target = PAIRS[step]
+    return f"{NETWORKS[source]['id']}->{NETWORKS[target]['id']}"
+
+
+def transfer_request(step, amount):
+    """
+    Builds the transact request for one step of the triangle.
+
+    Args:
+        step (int): The step (1, 2 or 3) selecting the chain pair.
+        amount (int): The amount of tokens to transfer.
+
+    Returns:
+        dict: The JSON payload to send to the transact endpoint.
+    """
+    source, target = PAIRS[step]
+
+    def asset(network):
+        return build_asset(
+            "ExampleAsset", "SATP-ERC20-ETHEREUM", NETWORKS[network]["owner"], "SATPTokenContract",
+            NETWORKS[network]["contractAddress"], NETWORKS[network]["id"], "NONSTANDARD_FUNGIBLE", amount,
+        )
+
+    return build_transfer(asset(source), asset(target))
+
+
+async def wait_for_session(gateways, session_id, args):
+    """
+    Polls the status endpoint of every gateway, with exponential backoff,
+    until all of them report the session as terminal or any of them reports
+    it as failed.
+
+    Args:
+        gateways (list): The AsyncGatewayClient of each gateway.
+        session_id (str): The session ID to check.
+        args (argparse.Namespace): The polling options.
+
+    Returns:
+        list: The last status response of each gateway.
+    """
+    async def probe():
+        responses = await asyncio.gather(
+            *(gateway.session_status(session_id) for gateway in gateways),
+            return_exceptions=True,
+        )
+        # A gateway may not know the session yet, so errors only mean "not done"
+        return [r if isinstance(r, dict) else None for r in responses]
+
+    def is_done(statuses):
+        if all(is_session_terminal(s) for s in statuses):
+            return True
+        return any(is_session_terminal(s) and session_state(s) != SESSION_DONE for s in statuses)
+
+    result = await wait_until_async(
+        probe, is_done, args.session_timeout, description=f"session {session_id} terminal state",
+        initial_delay=args.poll_interval, max_delay=args.max_poll_interval,
+    )
+    return result.value
+
+
+async def run_session(gateways, step, args):
+    """
+    Runs one transfer end to end and returns its measurement.
+    """
+    start = time.perf_counter()
+    result = {"pair": pair_label(step), "sessionID": None, "ok": False, "latency": None, "error": None}
+    try:
+        response = await gateways[0].transact(transfer_request(step, args.amount))
+        session_id = response.get("sessionID") if isinstance(response, dict) else None
+        if not session_id:
+            raise ValueError(f"transact returned no sessionID: {response}")
+        result["sessionID"] = session_id
+
+        statuses = await wait_for_session(gateways, session_id, args)
+        result["ok"] = all(session_state(s) == SESSION_DONE for s in statuses)
+        if not result["ok"]:
+            result["error"] = f"final statuses: {[session_state(s) for s in statuses]}"
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        result["error"] = str(e)
+    result["latency"] = time.perf_counter() - start
+    return result
+
+
+async def worker(gateways, steps, results, args, stop_at, launched):
+    while True:
+        if args.sessions and launched[0] >= args.sessions:
+            return
+        if stop_at is not None and time.perf_counter() >= stop_at:
+            return
+        launched[0] += 1
+        results.append(await run_session(gateways, next(steps), args))
+
+
+def build_report(results, elapsed):
+    """
+    Aggregates the session measurements per chain pair.
+
+    Args:
+        results (list): The measurement of every session.
+        elapsed (float): Wall-clock duration of the run in seconds.
+
+    Returns:
+        dict: Throughput and latency percentiles, per pair and overall.
+    """
+    def aggregate(rows):
+        succeeded = [r["latency"] for r in rows if r["ok"]]
+        return {
+            "sessions": len(rows),
+            "succeeded": len(succeeded),
+            "failed": len(rows) - len(succeeded),
+            "sessionsPerSecond": len(succeeded) / elapsed if elapsed > 0 else None,
+            "latency": summarize(succeeded),
+        }
+
+    pairs = {}
+    for label in sorted({r["pair"] for r in results}):
+        pairs[label] = aggregate([r for r in results if r["pair"] == label])
+
+    return {
+        "elapsedSeconds": elapsed,
+        "overall": aggregate(results),
+        "pairs": pairs,
+        "errors": [r for r in results if not r["ok"]][:20],
+    }
+
+
+async def main(args):
+    gateways = [
+        AsyncGatewayClient(port, max_concurrency=args.concurrency * 2, timeout=args.request_timeout)
+        for port in GATEWAY_PORTS
+    ]
+    steps = itertools.cycle(args.steps)
+    results = []
+    launched = [0]
+    start = time.perf_counter()
+    stop_at = start + args.duration if args.duration else None
+
+    try:
+        workers = [
+            asyncio.ensure_future(worker(gateways, steps, results, args, stop_at, launched))
+            for _ in range(args.concurrency)
+        ]
+        await asyncio.gather(*workers)
+    finally:
+        for gateway in gateways:
+            await gateway.close()
+
+    return build_report(results, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Keeps N concurrent SATP sessions running across the three chain pairs of case 3."
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=10, help="number of sessions kept in flight")
+    parser.add_argument("-n", "--sessions", type=int, default=0, help="total number of sessions to run (0 = unlimited)")
+    parser.add_argument("-d", "--duration", type=float, default=0, help="seconds to keep generating load (0 = unlimited)")
+    parser.add_argument("--steps", type=int, nargs="+", choices=sorted(PAIRS), default=sorted(PAIRS),
+                        help="chain pairs to use, as the step numbers of satp-transact.py")
+    parser.add_argument("--amount", type=int, default=1, help="tokens moved by each session")
+    parser.add_argument("--poll-interval", type=float, default=0.2, help="seconds before the first status poll")
+    parser.add_argument("--max-poll-interval", type=float, default=2.0, help="upper bound of the backoff between status polls")
+    parser.add_argument("--session-timeout", type=float, default=300, help="seconds before a session is counted as failed")
+    parser.add_argument("--request-timeout", type=float, default=120, help="timeout of each gateway call in seconds")
+    parser.add_argument("-o", "--output", help="also write the report to this JSON file")
+    args = parser.parse_args()
+
+    if not args.sessions and not args.duration:
+        parser.error("one of --sessions or --duration is required")
+
+    report = asyncio.run(main(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,34 @@
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from hermes.orchestrator import DEFAULT_READY_TIMEOUT, bring_up, case_components
+from hermes.wait import WaitTimeout
+
+GATEWAY_DIR = os.path.dirname(os.path.abspath(__file__))
+EVM_DIR = os.path.join(GATEWAY_DIR, "..", "EVM")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Start the Hardhat nodes and gateways of a case in parallel and "
+                    "return as soon as all of them answer (eth_chainId, /integrations).")
+    parser.add_argument("case", help="case folder relative to gateway/, e.g. satp/case_1")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_READY_TIMEOUT,
+                        help="seconds to wait for each component")
+    parser.add_argument("--parallel", action="store_true",
+                        help="start the gateways together with the nodes instead of after them")
+    args = parser.parse_args()
+
+    components = case_components(os.path.join(GATEWAY_DIR, args.case), EVM_DIR,
+                                 gateways_wait_for_nodes=not args.parallel)
+    for component in components:
+        component.timeout = args.timeout
+
+    try:
+        bring_up(components, on_ready=lambda name, elapsed: print(f"{name} ready after {elapsed:.1f}s"))
+    except (WaitTimeout, subprocess.CalledProcessError) as e:
+        print("Error:", e)
+        sys.exit(1)